@@ -1,9 +1,16 @@
 from ...core.database import get_db
+from ...core.config import settings
+from ...core.etag import etag_matches, not_modified
+from ...core.json_response import json_response
+from ...core.response_cache import response_cache
 from ...services import auteur_service
+from ...core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ...schemas.pagination_schema import Page
 from ...schemas.auteur_schema import AuteurCreateSchema, AuteurSchema
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
+from typing import Optional
 
 
 # Création du routeur. Le prefixe est défini dans main.py
@@ -11,25 +18,49 @@ router = APIRouter()
 
 # Route GET : Lecture d'un Auteur par ID
 @router.get("/{auteur_id}", response_model=AuteurSchema)
-def read_auteur(auteur_id: int, db: Session = Depends(get_db)):
+def read_auteur(auteur_id: int, request: Request, db: Session = Depends(get_db)):
     """ Récupère les détails d'un auteur. """
     
+    # Requête conditionnelle : 304 si le client a déjà cette version
+    etag = auteur_service.get_auteur_etag(db, auteur_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     # Appel du Service
     auteur = auteur_service.get_auteur(db, auteur_id)
     
     if not auteur:
         # Gère l'absence de ressource (404)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Auteur non trouvé")
-        
-    return auteur
 
-# Route GET: Lecture de tous les auteurs
-@router.get("/", response_model=list[AuteurSchema])
-def read_auteurs(db:Session = Depends(get_db)):
-    """Récupère tous les auteurs"""
+    return json_response(auteur, etag)
+
+# Route GET: Lecture paginée des auteurs
+@router.get("/", response_model=Page[AuteurSchema])
+def read_auteurs(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Taille de la page"),
+    after: Optional[str] = Query(None, description="Curseur `next_cursor` renvoyé par la page précédente"),
+    db: Session = Depends(get_db),
+):
+    """Récupère une page d'auteurs"""
+    try:
+        # Réponse en cache (invalidée au COMMIT d'une écriture sur la table)
+        key = response_cache.key("auteurs", request)
+        cached = response_cache.lookup("auteurs", key, request)
+        if cached is not None:
+            return cached
 
-    # Retourne la liste des auteurs (vide si aucun auteur)
-    return auteur_service.get_auteurs(db)
+        # Requête conditionnelle : 304 si la page n'a pas changé
+        etag = auteur_service.get_auteurs_etag(db, limit=limit, after=after)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        # Retourne la page d'auteurs (vide si aucun auteur)
+        page = auteur_service.get_auteurs(db, limit=limit, after=after)
+        return response_cache.store(key, page, etag, settings.RESPONSE_CACHE_TTL_REFERENCE_SECONDS)
+    except ValueError as e:
+        # Curseur invalide
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 # Route DELETE: Suppression d'un auteur
@@ -0,0 +1,38 @@
+from typing import Any, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from starlette.concurrency import run_in_threadpool
+
+from ...core.database import SessionLocal
+from ...core.json_response import json_response
+from ...core.security import get_current_active_user
+from ...schemas.autocomplete_schema import SuggestionRead
+from ...services import autocomplete_service
+
+
+# Création du routeur. Le prefixe est défini dans main.py
+router = APIRouter()
+
+
+def _suggest_from_database(q: str, limit: int, types: Optional[set[str]]):
+    with SessionLocal() as db:
+        return autocomplete_service.suggest_from_database(db, q, limit, types)
+
+
+# Route GET : Suggestions pendant la saisie
+# Route async : lorsque l'index est chaud, la réponse est calculée en mémoire
+# sans session DB ni passage par le threadpool.
+@router.get("/", response_model=list[SuggestionRead])
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100, description="Début de saisie"),
+    limit: int = Query(10, ge=1, le=20),
+    type: Optional[list[Literal["document", "auteur", "editeur"]]] = Query(None, description="Filtrer par type de suggestion"),
+    current_user: Any = Depends(get_current_active_user),
+):
+    """ Suggestions de titres, d'auteurs et d'éditeurs commençant par la saisie. """
+    types = set(type) if type else None
+    suggestions = autocomplete_service.suggest_from_memory(q, limit, types)
+    if suggestions is None:
+        # Index pas encore construit : recherche en base (index pg_trgm)
+        suggestions = await run_in_threadpool(_suggest_from_database, q, limit, types)
+    return json_response([SuggestionRead(type=s.type, id=s.id, libelle=s.libelle) for s in suggestions])
@@ -1,37 +1,86 @@
 from ...core.database import get_db
+from ...core.config import settings
+from ...core.etag import etag_matches, not_modified
+from ...core.json_response import json_response
+from ...core.response_cache import response_cache
 from ...services import categorie_service
-from ...schemas.categorie_schema import CategorieCreateSchema, CategorieSchema
+from ...core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ...schemas.pagination_schema import Page
+from ...schemas.categorie_schema import CategorieCreateSchema, CategorieNoeud, CategorieSchema
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
+from typing import Optional
 
 
 # Création du routeur. Le prefixe est défini dans main.py
 router = APIRouter()
 
 
+# Route GET : Arbre des catégories
+# Déclarée avant GET /{categorie_id} pour que "arbre" ne soit pas interprété comme un ID.
+@router.get("/arbre", response_model=list[CategorieNoeud])
+def read_categorie_tree(db: Session = Depends(get_db)):
+    """ Arbre complet des catégories avec le nombre de documents de chaque nœud. """
+    return json_response(categorie_service.get_categorie_tree(db))
+
+
+# Route GET : Sous-arbre d'une Catégorie
+@router.get("/{categorie_id}/arbre", response_model=CategorieNoeud)
+def read_categorie_subtree(categorie_id: int, db: Session = Depends(get_db)):
+    """ Sous-arbre d'une catégorie et chemin de ses ancêtres. """
+    noeud = categorie_service.get_categorie_subtree(db, categorie_id)
+    if noeud is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Catégorie non trouvée")
+    return json_response(noeud)
+
+
 # Route GET : Lecture d'une Catégorie par ID
 @router.get("/{categorie_id}", response_model=CategorieSchema)
-def read_categorie(categorie_id: int, db: Session = Depends(get_db)):
+def read_categorie(categorie_id: int, request: Request, db: Session = Depends(get_db)):
     """ Récupère les détails d'une catégorie. """
     
+    # Requête conditionnelle : 304 si le client a déjà cette version
+    etag = categorie_service.get_categorie_etag(db, categorie_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     # Appel du Service
     categorie = categorie_service.get_categorie(db, categorie_id)
     
     if not categorie:
         # Gère l'absence de ressource (404)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Catégorie non trouvée")
-        
-    return categorie
+
+    return json_response(categorie, etag)
 
 
-# Route GET: Lecture de toutes les catégories
-@router.get("/", response_model=list[CategorieSchema])
-def read_categories(db:Session = Depends(get_db)):
-    """Récupère toutes les catégories"""
+# Route GET: Lecture paginée des catégories
+@router.get("/", response_model=Page[CategorieSchema])
+def read_categories(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Taille de la page"),
+    after: Optional[str] = Query(None, description="Curseur `next_cursor` renvoyé par la page précédente"),
+    db: Session = Depends(get_db),
+):
+    """Récupère une page de catégories"""
+    try:
+        # Réponse en cache (invalidée au COMMIT d'une écriture sur la table)
+        key = response_cache.key("categories", request)
+        cached = response_cache.lookup("categories", key, request)
+        if cached is not None:
+            return cached
 
-    # Retourne la liste des catégories (vide si aucune catégorie)
-    return categorie_service.get_categories(db)
+        # Requête conditionnelle : 304 si la page n'a pas changé
+        etag = categorie_service.get_categories_etag(db, limit=limit, after=after)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        # Retourne la page de catégories (vide si aucune catégorie)
+        page = categorie_service.get_categories(db, limit=limit, after=after)
+        return response_cache.store(key, page, etag, settings.RESPONSE_CACHE_TTL_REFERENCE_SECONDS)
+    except ValueError as e:
+        # Curseur invalide
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 # Route DELETE: Suppression d'une catégorie
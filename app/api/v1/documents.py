@@ -1,43 +1,114 @@
 # Afficher tous les documents
 
-from app.core.database import get_db
-from app.services import document_service
+from app.core.config import settings
+from app.core.database import get_db, get_read_db, run_read
+from app.core.etag import etag_matches, not_modified
+from app.core.json_response import json_response
+from app.core.response_cache import response_cache
+from app.services import document_service, import_service, search_service
 from app.core.security import get_current_active_user
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.schemas.document_schema import DocumentCreate, DocumentRead, DocumentUpdate
-from typing import List, Any
+from app.schemas.document_schema import DocumentCreate, DocumentFilters, DocumentRead, DocumentSearchResult, DocumentSort, DocumentUpdate
+from app.schemas.import_schema import ImportReport
+from app.schemas.pagination_schema import Page
+from typing import List, Any, Literal, Optional
+import io
+import tempfile
 
 
 router = APIRouter()
 
-# --- 1. GET / : Récupère tous les documents (PROTÉGÉ) ---
-@router.get("/", response_model=List[DocumentRead], summary="Récupère tous les documents (Protégé)")
-def read_documents(
+
+def document_filters(
+    categorie_id: Optional[int] = Query(None, description="Catégorie (sous-catégories incluses)"),
+    editeur_id: Optional[int] = Query(None, description="Éditeur"),
+    auteur_id: Optional[int] = Query(None, description="Auteur"),
+    annee_min: Optional[int] = Query(None, description="Année de publication minimale (incluse)"),
+    annee_max: Optional[int] = Query(None, description="Année de publication maximale (incluse)"),
+    tri: DocumentSort = Query("id", description="Tri : id, titre ou annee_publication, préfixé de - pour un ordre décroissant"),
+) -> DocumentFilters:
+    """ Filtres et tri de la liste des documents (paramètres de requête). """
+    return DocumentFilters(
+        categorie_id=categorie_id, editeur_id=editeur_id, auteur_id=auteur_id,
+        annee_min=annee_min, annee_max=annee_max, tri=tri,
+    )
+
+# --- 0. GET /search : Recherche plein texte (PROTÉGÉ) ---
+# Déclarée avant GET /{document_id} pour que "search" ne soit pas interprété comme un ID.
+@router.get("/search", response_model=List[DocumentSearchResult], summary="Recherche plein texte dans le catalogue (Protégé)")
+def search_documents(
+    q: str = Query(..., min_length=1, max_length=200, description="Mots-clés (titre, résumé, auteurs, catégorie, éditeur)"),
+    limit: int = Query(20, ge=1, le=100, description="Nombre maximal de résultats"),
     db: Session = Depends(get_db),
-    current_user: Any = Depends(get_current_active_user),  # ⬅️ Correction: Syntaxe standard
+    current_user: Any = Depends(get_current_active_user),
 ):
-    """Récupère tous les documents (accessible uniquement aux utilisateurs connectés)"""
+    """ Recherche par mots-clés, résultats classés par pertinence. """
+    return json_response(search_service.search_documents(db, q, limit))
 
-    return document_service.get_documents(db)
+# Lectures : AsyncSession si DB_ASYNC_MODE (aucun thread du threadpool de Starlette
+# occupé), sinon Session synchrone dont les appels passent par le threadpool (voir run_read).
+
+# --- 1. GET / : Récupère une page de documents (PROTÉGÉ) ---
+@router.get("/", response_model=Page[DocumentRead], summary="Récupère une page de documents (Protégé)")
+async def read_documents(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Taille de la page"),
+    after: Optional[str] = Query(None, description="Curseur `next_cursor` renvoyé par la page précédente"),
+    filters: DocumentFilters = Depends(document_filters),
+    db: Session | AsyncSession = Depends(get_read_db),
+    current_user: Any = Depends(get_current_active_user),
+):
+    """Récupère une page de documents (accessible uniquement aux utilisateurs connectés)"""
+    try:
+        # Requête conditionnelle : 304 si la page n'a pas changé (la disponibilité
+        # calculée pour l'ETag sert aussi à la réponse complète)
+        etag, availability = await run_read(
+            db, document_service.get_documents_etag, document_service.get_documents_etag_async,
+            limit=limit, after=after, filters=filters,
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        page = await run_read(
+            db, document_service.get_documents, document_service.get_documents_async,
+            limit=limit, after=after, filters=filters, availability=availability,
+        )
+        return json_response(page, etag)
+    except ValueError as e:
+        # Curseur invalide ou filtres incohérents
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 # --- 2. GET /{document_id} : Récupère les détails d'un document (PROTÉGÉ) ---
 @router.get("/{document_id}", response_model=DocumentRead, summary="Récupère les détails d'un document (Protégé)")
-def read_document(
-    document_id: int, 
-    db: Session = Depends(get_db),
-    current_user: Any = Depends(get_current_active_user),  # ⬅️ Correction: Syntaxe standard
+async def read_document(
+    document_id: int,
+    request: Request,
+    db: Session | AsyncSession = Depends(get_read_db),
+    current_user: Any = Depends(get_current_active_user),
 ):
     """ Récupère les détails d'un document. """
-    
-    document = document_service.get_document(db, document_id)
-    
+    # Réponse en cache (invalidée au COMMIT d'une écriture sur le document ou sa disponibilité)
+    key = await response_cache.key_async("documents", request, document_id)
+    cached = await response_cache.lookup_async("documents", key, request)
+    if cached is not None:
+        return cached
+
+    etag = await run_read(db, document_service.get_document_etag, document_service.get_document_etag_async, document_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    document = await run_read(db, document_service.get_document, document_service.get_document_async, document_id)
+
     if document is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document non trouvé")
-        
-    return document
+
+    return await response_cache.store_async(key, document, etag, settings.RESPONSE_CACHE_TTL_DOCUMENT_SECONDS)
 
 
 # --- 3. POST / : Crée un nouveau document (CORRIGÉ) ---
@@ -98,4 +169,32 @@ def patch_document(
         
         return updated_document
     except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# --- 6. POST /import : Import en masse du catalogue (PROTÉGÉ) ---
+@router.post("/import", response_model=ImportReport, summary="Importe des documents en masse (CSV ou JSON-lines) (Protégé)")
+async def import_documents(
+    request: Request,
+    format: Literal["csv", "ndjson"] = Query("csv", description="Format du corps de la requête"),
+    chunk_size: int = Query(import_service.DEFAULT_CHUNK_SIZE, ge=1, le=10000, description="Lignes par transaction"),
+    db: Session = Depends(get_db),
+    current_user: Any = Depends(get_current_active_user),
+):
+    """
+    Importe le corps de la requête (fichier CSV avec en-tête ou JSON-lines) par blocs
+    transactionnels et renvoie le rapport d'import (erreurs par ligne).
+    Le corps est reçu en flux et mis en tampon sur disque au-delà de 8 Mo.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        stream = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+        try:
+            # Le parsing et les écritures SQL s'exécutent hors de la boucle d'événements
+            return await run_in_threadpool(
+                import_service.import_documents, db, stream, format, current_user.id, chunk_size
+            )
+        finally:
+            stream.detach()
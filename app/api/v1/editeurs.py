@@ -1,9 +1,16 @@
 from ...core.database import get_db
+from ...core.config import settings
+from ...core.etag import etag_matches, not_modified
+from ...core.json_response import json_response
+from ...core.response_cache import response_cache
 from ...services import editeur_service
+from ...core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ...schemas.pagination_schema import Page
 from ...schemas.editeur_schema import EditeurCreateSchema, EditeurSchema
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
+from typing import Optional
 
 
 # Création du routeur. Le prefixe est défini dans main.py
@@ -12,25 +19,49 @@ router = APIRouter()
 
 # Route GET : Lecture d'un Auteur par ID
 @router.get("/{editeur_id}", response_model=EditeurSchema)
-def read_editeur(editeur_id: int, db: Session = Depends(get_db)):
+def read_editeur(editeur_id: int, request: Request, db: Session = Depends(get_db)):
     """ Récupère les détails d'un éditeur. """
     
+    # Requête conditionnelle : 304 si le client a déjà cette version
+    etag = editeur_service.get_editeur_etag(db, editeur_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     # Appel du Service
     editeur = editeur_service.get_editeur(db, editeur_id)
     
     if not editeur:
         # Gère l'absence de ressource (404)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Éditeur non trouvé")
-        
-    return editeur
 
-# Route GET: Lecture de tous les éditeurs
-@router.get("/", response_model=list[EditeurSchema])
-def read_editeurs(db:Session = Depends(get_db)):
-    """Récupère tous les éditeurs"""
+    return json_response(editeur, etag)
+
+# Route GET: Lecture paginée des éditeurs
+@router.get("/", response_model=Page[EditeurSchema])
+def read_editeurs(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Taille de la page"),
+    after: Optional[str] = Query(None, description="Curseur `next_cursor` renvoyé par la page précédente"),
+    db: Session = Depends(get_db),
+):
+    """Récupère une page d'éditeurs"""
+    try:
+        # Réponse en cache (invalidée au COMMIT d'une écriture sur la table)
+        key = response_cache.key("editeurs", request)
+        cached = response_cache.lookup("editeurs", key, request)
+        if cached is not None:
+            return cached
 
-    # Retourne la liste des éditeurs (vide si aucun éditeur)
-    return editeur_service.get_editeurs(db)
+        # Requête conditionnelle : 304 si la page n'a pas changé
+        etag = editeur_service.get_editeurs_etag(db, limit=limit, after=after)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        # Retourne la page d'éditeurs (vide si aucun éditeur)
+        page = editeur_service.get_editeurs(db, limit=limit, after=after)
+        return response_cache.store(key, page, etag, settings.RESPONSE_CACHE_TTL_REFERENCE_SECONDS)
+    except ValueError as e:
+        # Curseur invalide
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 # Route DELETE: Suppression d'un éditeur
 @router.delete("/{editeur_id}", response_model=EditeurSchema)
@@ -0,0 +1,51 @@
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from ...core.security import get_current_active_user
+from ...schemas.user_schema import CurrentUser
+from ...services import export_service
+
+# Création du routeur. Le prefixe est défini dans main.py
+router = APIRouter()
+
+
+def _export(name: str, fmt: str) -> StreamingResponse:
+    filename = f"{name}_{date.today().isoformat()}.{fmt}"
+    return StreamingResponse(
+        export_service.stream_export(name, fmt),
+        media_type=export_service.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# Route GET : Export du catalogue
+@router.get("/documents")
+def export_documents(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Format de l'export"),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    """ Exporte tout le catalogue en flux. """
+    return _export("documents", format)
+
+
+# Route GET : Export des adhérents
+@router.get("/membres")
+def export_membres(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Format de l'export"),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    """ Exporte tous les adhérents en flux. """
+    return _export("membres", format)
+
+
+# Route GET : Export de l'historique des emprunts
+@router.get("/emprunts")
+def export_emprunts(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Format de l'export"),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    """ Exporte tout l'historique des emprunts en flux. """
+    return _export("emprunts", format)
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import Optional
 
-from ...models.utilisateur import UtilisateurSys # Le type Session est utilisé pour la dépendance
-from ...schemas.membre_schema import MembreCreate, MembreRead, MembreUpdate
+from ...schemas.user_schema import CurrentUser
+from ...core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ...schemas.membre_schema import CompteMembre, MembreCreate, MembreRead, MembreUpdate
+from ...schemas.pagination_schema import Page
 from ...services import membre_service
-from ...core.database import get_db # Importe la dépendance de session DB
+from ...core.database import get_db, get_read_db, run_read # Importe la dépendance de session DB
+from ...core.etag import etag_matches, not_modified
+from ...core.json_response import json_response
 from ...core.security import get_current_active_user 
 
 # Création du routeur. Le prefixe est défini dans main.py
@@ -13,38 +19,65 @@ router = APIRouter()
 
 # Route POST : Création d'un Membre
 @router.post("/", response_model=MembreRead, status_code=status.HTTP_201_CREATED)
-def create_member(membre: MembreCreate, db: Session = Depends(get_db), current_user: UtilisateurSys = Depends(get_current_active_user)):
+def create_member(membre: MembreCreate, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_active_user)):
     """ Crée un nouvel adhérent. """
     try:
         # Appel du Service
-        new_member = membre_service.create_new_membre(db, membre, current_user.id)
+        new_member = membre_service.create_new_member(db, membre, current_user.id)
         return new_member
     except ValueError as e:
         # Gère l'erreur métier (email déjà utilisé) comme une requête mal formée (400)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+# Lectures : AsyncSession si DB_ASYNC_MODE (aucun thread du threadpool de Starlette
+# occupé), sinon Session synchrone dont les appels passent par le threadpool (voir run_read).
+
+# Route GET : Compte d'un Membre (emprunts, réservations, pénalités)
+@router.get("/{membre_id}/compte", response_model=CompteMembre)
+async def read_member_account(membre_id: int, db: Session | AsyncSession = Depends(get_read_db), current_user: CurrentUser = Depends(get_current_active_user)):
+    """ Récupère le compte d'un adhérent en trois requêtes. """
+    account = await run_read(db, membre_service.get_member_account, membre_service.get_member_account_async, membre_id)
+    if account is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Membre non trouvé")
+    return json_response(account)
+
 # Route GET : Lecture d'un Membre par ID
 @router.get("/{membre_id}", response_model=MembreRead)
-def read_member(membre_id: int, db: Session = Depends(get_db)):
+async def read_member(membre_id: int, request: Request, db: Session | AsyncSession = Depends(get_read_db)):
     """ Récupère les détails d'un adhérent. """
-    
+    etag = await run_read(db, membre_service.get_member_etag, membre_service.get_member_etag_async, membre_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     # Appel du Service
-    member = membre_service.get_membre(db, membre_id)
-    
+    member = await run_read(db, membre_service.get_member, membre_service.get_member_async, membre_id)
+
     if not member:
         # Gère l'absence de ressource (404)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Membre non trouvé")
-        
-    return member
-
-# Route GET: Lecture de tous les membres
 
-@router.get("/", response_model=list[MembreRead])
-def read_members(db:Session = Depends(get_db)):
-    """Récupère tous les adhérents"""
+    return json_response(member, etag)
 
-    # Retourne la liste des membres (vide si aucun membre)
-    return membre_service.get_members(db)
+# Route GET: Lecture paginée des membres
+@router.get("/", response_model=Page[MembreRead])
+async def read_members(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Taille de la page"),
+    after: Optional[str] = Query(None, description="Curseur `next_cursor` renvoyé par la page précédente"),
+    db: Session | AsyncSession = Depends(get_read_db),
+):
+    """Récupère une page d'adhérents"""
+    try:
+        # Requête conditionnelle : 304 si la page n'a pas changé
+        etag = await run_read(db, membre_service.get_members_etag, membre_service.get_members_etag_async, limit=limit, after=after)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        # Retourne la page de membres (vide si aucun membre)
+        page = await run_read(db, membre_service.get_members, membre_service.get_members_async, limit=limit, after=after)
+        return json_response(page, etag)
+    except ValueError as e:
+        # Curseur invalide
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 # Route DELETE: Suppression d'un membre
@@ -52,17 +85,8 @@ def read_members(db:Session = Depends(get_db)):
 @router.delete("/{member_id}", response_model=MembreRead)
 def delete_member(member_id: int, db: Session = Depends(get_db)):
     """Supprime un adhérent par son ID"""
-    # Appel du Service pour récupérer le membre
-    member = membre_service.get_membre(db, member_id)
-    
-    if not member:
-        # Gère l'absence de ressource (404)
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Membre non trouvé")
-    
-    # Appel du Repository pour supprimer le membre
-    deleted_member = membre_service.delete_member(db, member_id)
-    
-    return deleted_member
+    # Appel du Service pour supprimer le membre (lève une 404 si le membre n'existe pas)
+    return membre_service.delete_member(db, member_id)
 
 
 # Route PATCH: Mise à jour partielle d'un membre
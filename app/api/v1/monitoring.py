@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends
+
+from ...core import reference_cache
+from ...core.database import async_engine, engine
+from ...core.pool_metrics import pool_snapshot
+from ...core.response_cache import response_cache
+from ...core.scheduler import scheduler
+from ...core.security import auth_cache_stats, get_current_active_user, password_hashing_stats
+
+
+# Création du routeur. Le prefixe est défini dans main.py
+# Toutes les mesures sont réservées aux utilisateurs connectés
+router = APIRouter(dependencies=[Depends(get_current_active_user)])
+
+
+# Route GET : Mesures de l'authentification
+@router.get("/auth")
+def read_auth_metrics():
+    """ Latence du hachage des mots de passe et efficacité des caches d'authentification. """
+    return {
+        "password_hashing": password_hashing_stats(),
+        "cache": auth_cache_stats(),
+    }
+
+
+# Route GET : Mesures du cache des données de référence
+@router.get("/reference-cache")
+def read_reference_cache_metrics():
+    """ Succès / échecs du cache des tables de référence. """
+    return reference_cache.stats()
+
+
+
+# Route GET : Mesures du cache des réponses
+@router.get("/response-cache")
+def read_response_cache_metrics():
+    """ Backend, taille et taux de succès du cache des réponses, par espace de noms. """
+    return response_cache.stats()
+
+
+# Route GET : État des pools de connexions
+@router.get("/pool")
+def read_pool_metrics():
+    """ Connexions prises / en débordement et temps d'attente au checkout, par moteur. """
+    pools = {"sync": pool_snapshot(engine.pool)}
+    if async_engine is not None:
+        pools["async"] = pool_snapshot(async_engine.pool)
+    return pools
+
+
+# Route GET : Tâches planifiées
+@router.get("/scheduler")
+def read_scheduler_metrics():
+    """ Exécutions, exécutions ignorées (verrou pris par un autre worker), échecs et durées par tâche. """
+    return scheduler.stats()
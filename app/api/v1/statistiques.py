@@ -0,0 +1,71 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...core.json_response import json_response
+from ...core.security import get_current_active_user
+from ...schemas.statistique_schema import CirculationJour, DocumentPlusEmprunte, EmpruntsParCategorie, EmpruntsParEditeur
+from ...schemas.user_schema import CurrentUser
+from ...services import statistique_service
+
+# Création du routeur. Le prefixe est défini dans main.py
+router = APIRouter()
+
+
+# Route GET : Documents les plus empruntés
+@router.get("/documents", response_model=list[DocumentPlusEmprunte])
+def read_top_documents(
+    limit: int = Query(10, ge=1, le=100, description="Nombre de documents"),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    """ Classement des documents par nombre d'emprunts. """
+    return json_response(statistique_service.get_top_documents(db, limit))
+
+
+# Route GET : Emprunts par catégorie
+@router.get("/categories", response_model=list[EmpruntsParCategorie])
+def read_loans_by_category(
+    du: Optional[date] = Query(None, description="Premier jour inclus (30 derniers jours par défaut)"),
+    au: Optional[date] = Query(None, description="Dernier jour inclus (aujourd'hui par défaut)"),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    """ Nombre d'emprunts par catégorie sur la période. """
+    try:
+        return json_response(statistique_service.get_loans_by_category(db, du, au))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# Route GET : Emprunts par éditeur
+@router.get("/editeurs", response_model=list[EmpruntsParEditeur])
+def read_loans_by_publisher(
+    du: Optional[date] = Query(None, description="Premier jour inclus (30 derniers jours par défaut)"),
+    au: Optional[date] = Query(None, description="Dernier jour inclus (aujourd'hui par défaut)"),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    """ Nombre d'emprunts par éditeur sur la période. """
+    try:
+        return json_response(statistique_service.get_loans_by_publisher(db, du, au))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# Route GET : Circulation journalière par type de membre
+@router.get("/circulation", response_model=list[CirculationJour])
+def read_daily_circulation(
+    du: Optional[date] = Query(None, description="Premier jour inclus (30 derniers jours par défaut)"),
+    au: Optional[date] = Query(None, description="Dernier jour inclus (aujourd'hui par défaut)"),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    """ Emprunts et retours par jour et type de membre. """
+    try:
+        return json_response(statistique_service.get_daily_circulation(db, du, au))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...core.security import get_current_active_user
+from ...schemas.emprunt_schema import EmpruntCreate, EmpruntRead, RetourCreate
+from ...schemas.reservation_schema import ReservationCreate, ReservationRead
+from ...schemas.user_schema import CurrentUser
+from ...services import emprunt_service, reservation_service
+
+# Création du routeur. Le prefixe est défini dans main.py
+router = APIRouter()
+
+
+# Route POST : Emprunt d'un exemplaire
+@router.post("/emprunts", response_model=EmpruntRead, status_code=status.HTTP_201_CREATED)
+def create_emprunt(emprunt: EmpruntCreate, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_active_user)):
+    """ Prête un exemplaire à un adhérent. """
+    try:
+        return emprunt_service.checkout(db, emprunt, current_user.id)
+    except ValueError as e:
+        # Exemplaire indisponible, limite d'emprunts atteinte, membre inconnu...
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# Route POST : Retour d'un exemplaire
+@router.post("/retours", response_model=EmpruntRead)
+def create_retour(retour: RetourCreate, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_active_user)):
+    """ Enregistre le retour d'un exemplaire. """
+    try:
+        return emprunt_service.checkin(db, retour, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# Route POST : Réservation d'un document (entrée en file d'attente)
+@router.post("/reservations", response_model=ReservationRead, status_code=status.HTTP_201_CREATED)
+def create_reservation(reservation: ReservationCreate, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_active_user)):
+    """ Place un adhérent dans la file d'attente d'un document. """
+    try:
+        return reservation_service.create_reservation(db, reservation)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# Route GET : Lecture d'une réservation (et rang dans la file)
+@router.get("/reservations/{reservation_id}", response_model=ReservationRead)
+def read_reservation(reservation_id: int, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_active_user)):
+    """ Récupère une réservation et sa position dans la file d'attente. """
+    reservation = reservation_service.get_reservation(db, reservation_id)
+    if reservation is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Réservation non trouvée")
+    return reservation
+
+
+# Route DELETE : Annulation d'une réservation
+@router.delete("/reservations/{reservation_id}", response_model=ReservationRead)
+def cancel_reservation(reservation_id: int, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_active_user)):
+    """ Annule une réservation ; l'exemplaire éventuellement mis de côté passe au suivant. """
+    try:
+        reservation = reservation_service.cancel_reservation(db, reservation_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if reservation is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Réservation non trouvée")
+    return reservation
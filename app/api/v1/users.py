@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, status, HTTPException
 from app.schemas.token_schema import Token
 from app.core.security import get_current_active_user
-from app.schemas.user_schema import UserCreate, UserRead
+from app.schemas.user_schema import CurrentUser, UserCreate, UserRead
 from app.services import user_service
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import oauth2_scheme # Dépendance pour la récupération des données de connexion
-from app.services.user_service import authenticate_user
+from app.services.user_service import authenticate_user_async
 from datetime import timedelta
 from app.core import config
 from app.core.security import create_access_token
@@ -17,7 +17,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 router = APIRouter()
 
 # API pour récupérer les informations de l'utilisateur actuellement authentifié
-@router.get("/me")
+@router.get("/me", response_model=CurrentUser)
 def read_current_user(current_user = Depends(get_current_active_user)):
     """Récupère les informations de l'utilisateur actuellement authentifié."""
     return current_user
@@ -45,7 +45,8 @@ async def login_for_access_token(
     db: Session = Depends(get_db)
 ):
     # 1. AUTHENTIFICATION : Vérification de l'utilisateur et du mot de passe
-    user = authenticate_user(db, form_data.username, form_data.password)
+    # (requête et bcrypt exécutés hors de la boucle d'événements)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     
     # 💥 Échec de l'authentification
     if not user:
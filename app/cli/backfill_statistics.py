@@ -0,0 +1,42 @@
+"""
+Reconstruction des agrégats de statistiques de circulation depuis l'historique.
+
+Vide les tables d'agrégats puis rejoue tout l'historique des emprunts par lots
+de jours (une transaction par lot). La tâche planifiée « statistiques » reprend
+ensuite à partir de la borne atteinte.
+
+Usage :
+    python -m app.cli.backfill_statistics
+    python -m app.cli.backfill_statistics --chunk-days 7
+    python -m app.cli.backfill_statistics --resume   # sans vider : reprend depuis la borne
+"""
+import argparse
+import sys
+
+from app.models import document, emprunt, membre, statistique, utilisateur  # noqa: F401  (enregistre toutes les classes mapped)
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services import statistique_service
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Reconstruit les agrégats des statistiques de circulation.")
+    parser.add_argument("--chunk-days", type=int, default=settings.STATS_ROLLUP_CHUNK_DAYS, help="Nombre de jours d'historique par transaction")
+    parser.add_argument("--resume", action="store_true", help="Ne vide pas les agrégats : reprend depuis la dernière borne")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        if args.resume:
+            report = statistique_service.refresh_rollups(db, chunk_days=args.chunk_days)
+        else:
+            report = statistique_service.rebuild_rollups(db, chunk_days=args.chunk_days)
+
+    if not report.lots:
+        print("Agrégats déjà à jour.")
+    else:
+        print(f"Historique agrégé du {report.debut} au {report.fin} en {report.lots} lot(s), {report.duree_s}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""
+Calcul des pénalités de retard depuis la ligne de commande (tâche nocturne).
+
+Usage :
+    python -m app.cli.compute_penalties
+    python -m app.cli.compute_penalties --date 2025-11-30 --utilisateur-id 1 --batch-size 100000
+"""
+import argparse
+import sys
+from datetime import date
+
+from app.models import document, emprunt, membre, utilisateur  # noqa: F401  (enregistre toutes les classes mapped)
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services import penalite_service
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Crée ou met à jour les pénalités des emprunts en retard.")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="Date de calcul AAAA-MM-JJ (aujourd'hui par défaut)")
+    parser.add_argument("--utilisateur-id", type=int, default=settings.PENALTY_JOB_USER_ID, help="ID de l'utilisateur créateur des pénalités")
+    parser.add_argument("--batch-size", type=int, default=settings.PENALTY_JOB_BATCH_SIZE, help="Nombre d'IDs d'emprunt par transaction")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        report = penalite_service.compute_overdue_penalties(db, args.date, args.utilisateur_id, args.batch_size)
+
+    print(
+        f"Pénalités au {report.date_calcul} : {report.emprunts_en_retard} emprunt(s) en retard, "
+        f"{report.penalites_creees} créée(s), {report.penalites_mises_a_jour} mise(s) à jour "
+        f"en {report.duree_s}s ({report.lignes_par_seconde} lignes/s)."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
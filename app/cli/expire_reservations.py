@@ -0,0 +1,26 @@
+"""
+Balayage des réservations mises de côté et non retirées à temps.
+
+Usage :
+    python -m app.cli.expire_reservations
+"""
+import sys
+
+from app.models import document, emprunt, membre, utilisateur  # noqa: F401  (enregistre toutes les classes mapped)
+from app.core.database import SessionLocal
+from app.services import reservation_service
+
+
+def main(argv: list[str] | None = None) -> int:
+    with SessionLocal() as db:
+        report = reservation_service.sweep_expired_holds(db)
+
+    print(
+        f"{report.reservations_expirees} mise(s) de côté expirée(s), "
+        f"{report.exemplaires_reattribues} exemplaire(s) réattribué(s) en {report.duree_s}s."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
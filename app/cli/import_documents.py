@@ -0,0 +1,38 @@
+"""
+Import en masse du catalogue depuis la ligne de commande.
+
+Usage :
+    python -m app.cli.import_documents catalogue.csv --utilisateur-id 1
+    python -m app.cli.import_documents catalogue.jsonl --format ndjson --utilisateur-id 1 --chunk-size 5000
+"""
+import argparse
+import sys
+
+from app.models import document, emprunt, membre, utilisateur  # noqa: F401  (enregistre toutes les classes mapped)
+from app.core.database import SessionLocal
+from app.services import import_service
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Importe des documents depuis un fichier CSV ou JSON-lines.")
+    parser.add_argument("fichier", help="Chemin du fichier à importer")
+    parser.add_argument("--format", choices=import_service.SUPPORTED_FORMATS, help="Format (déduit de l'extension par défaut)")
+    parser.add_argument("--utilisateur-id", type=int, required=True, help="ID de l'utilisateur créateur des documents")
+    parser.add_argument("--chunk-size", type=int, default=import_service.DEFAULT_CHUNK_SIZE, help="Nombre de lignes par transaction")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.fichier.lower().endswith(".csv") else "ndjson")
+    with open(args.fichier, encoding="utf-8", newline="") as stream, SessionLocal() as db:
+        report = import_service.import_documents(db, stream, fmt, args.utilisateur_id, args.chunk_size)
+
+    for erreur in report.erreurs:
+        print(f"ligne {erreur.ligne} : {erreur.erreur}", file=sys.stderr)
+    print(
+        f"{report.documents_crees} document(s) créé(s) sur {report.lignes_traitees} ligne(s) "
+        f"en {report.duree_s}s ({len(report.erreurs)} erreur(s))."
+    )
+    return 1 if report.erreurs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Index de préfixes en mémoire pour l'autocomplétion.
+
+Structure : chaque libellé est découpé en termes normalisés ; les couples
+(terme, libellé) sont conservés dans un tableau trié (trie compacté), parcouru
+par recherche dichotomique. Pour les préfixes très courts (1 à
+`SHORT_PREFIX_LEN` caractères), dont les plages sont immenses, les meilleures
+suggestions sont précalculées à la construction. Une recherche coûte donc
+O(log n + k) quelle que soit la taille du catalogue.
+
+L'index est immuable une fois construit : il est reconstruit en arrière-plan
+puis remplacé atomiquement (voir `autocomplete_service`).
+"""
+import bisect
+import heapq
+from typing import Iterable, NamedTuple
+
+from .search_index import normalize, tokenize
+
+SHORT_PREFIX_LEN = 2
+# Nombre maximal de candidats examinés pour un préfixe (borne la latence)
+MAX_SCAN = 5000
+
+
+class Suggestion(NamedTuple):
+    type: str
+    id: int
+    libelle: str
+
+
+def _rank(query: str, entry_norm: str, libelle: str) -> tuple:
+    # Libellé commençant par la saisie d'abord, puis libellés courts, puis ordre alphabétique
+    return (0 if entry_norm.startswith(query) else 1, len(libelle), entry_norm)
+
+
+class PrefixIndex:
+    """ Index de préfixes immuable, construit à partir de (type, id, libellé). """
+
+    def __init__(self, entries: Iterable[tuple[str, int, str]], top_k: int = 20):
+        self.top_k = top_k
+        self._entries: list[Suggestion] = []
+        self._normalized: list[str] = []
+        pairs: list[tuple[str, int]] = []
+        for kind, entry_id, libelle in entries:
+            if not libelle:
+                continue
+            position = len(self._entries)
+            self._entries.append(Suggestion(kind, entry_id, libelle))
+            self._normalized.append(normalize(libelle))
+            pairs.extend((term, position) for term in set(tokenize(libelle)))
+        pairs.sort()
+        self._terms = [term for term, _ in pairs]
+        self._positions = [position for _, position in pairs]
+        self._short = self._build_short_prefixes()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _build_short_prefixes(self) -> dict[str, list[int]]:
+        buckets: dict[str, set[int]] = {}
+        for term, position in zip(self._terms, self._positions):
+            for length in range(1, min(SHORT_PREFIX_LEN, len(term)) + 1):
+                buckets.setdefault(term[:length], set()).add(position)
+        return {
+            prefix: heapq.nsmallest(
+                self.top_k, positions,
+                key=lambda p: _rank(prefix, self._normalized[p], self._entries[p].libelle),
+            )
+            for prefix, positions in buckets.items()
+        }
+
+    def _candidates(self, prefix: str) -> Iterable[int]:
+        if len(prefix) <= SHORT_PREFIX_LEN:
+            return self._short.get(prefix, [])
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\uffff", lo=start)
+        return set(self._positions[start:min(end, start + MAX_SCAN)])
+
+    def search(self, query: str, limit: int = 10, types: set[str] | None = None) -> list[Suggestion]:
+        """ Suggestions dont les termes commencent par ceux de `query` (le plus sélectif sert de clé). """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        key = max(terms, key=len)
+        others = [term for term in terms if term is not key]
+        normalized_query = " ".join(terms)
+
+        candidates = []
+        for position in self._candidates(key):
+            suggestion = self._entries[position]
+            if types and suggestion.type not in types:
+                continue
+            entry_norm = self._normalized[position]
+            if others:
+                entry_terms = tokenize(entry_norm)
+                if not all(any(t.startswith(other) for t in entry_terms) for other in others):
+                    continue
+            candidates.append(position)
+
+        best = heapq.nsmallest(
+            limit, candidates,
+            key=lambda p: _rank(normalized_query, self._normalized[p], self._entries[p].libelle),
+        )
+        return [self._entries[position] for position in best]
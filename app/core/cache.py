@@ -0,0 +1,79 @@
+"""
+Cache mémoire (par processus) avec expiration (TTL) et éviction LRU bornée.
+
+Utilisé pour les données de référence, les utilisateurs authentifiés, etc.
+Thread-safe : les routes synchrones FastAPI s'exécutent dans un pool de threads.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """ Dictionnaire borné (LRU) dont chaque entrée expire après `ttl` secondes. """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """ Renvoie la valeur associée à `key` si elle existe et n'a pas expiré. """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] <= time.monotonic():
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """ Enregistre une valeur ; l'entrée la moins récemment utilisée est évincée si le cache est plein. """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """ Renvoie la valeur en cache ou la calcule avec `loader` puis la met en cache. """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value, ttl)
+        return value
+
+    def pop(self, key: Hashable) -> None:
+        """ Invalide une entrée. """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """ Invalide toutes les entrées. """
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """ Statistiques d'utilisation (taille, succès, échecs). """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,100 @@
+"""
+Arbre des catégories en mémoire (`categorie.parent_categorie_id`).
+
+Construit en une passe à partir de toutes les catégories et du nombre de
+documents par catégorie : chaque nœud connaît son chemin depuis la racine,
+l'ensemble de ses descendants (lui compris) et le nombre de documents de son
+sous-arbre. Filtrer « tous les documents sous Sciences » revient alors à un
+seul `categorie_id IN (...)`, sans requête récursive.
+
+L'arbre est immuable une fois construit : il est reconstruit en arrière-plan
+puis remplacé atomiquement (voir `categorie_tree_service`).
+"""
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+
+@dataclass(frozen=True)
+class CategoryNode:
+    """ Nœud de l'arbre : chemin depuis la racine et sous-arbre précalculés. """
+    id: int
+    libelle: str
+    parent_id: Optional[int]
+    children: tuple[int, ...]
+    # IDs des ancêtres, de la racine au parent
+    path: tuple[int, ...]
+    # IDs du sous-arbre, nœud compris
+    descendants: frozenset[int]
+    document_count: int
+    subtree_document_count: int
+
+
+class CategoryTree:
+    """ Arbre immuable des catégories, construit à partir de (id, libellé, parent_id). """
+
+    def __init__(self, rows: Iterable[tuple[int, str, Optional[int]]], document_counts: dict[int, int]):
+        libelles: dict[int, str] = {}
+        parents: dict[int, Optional[int]] = {}
+        for categorie_id, libelle, parent_id in rows:
+            libelles[categorie_id] = libelle
+            parents[categorie_id] = parent_id
+
+        children: dict[Optional[int], list[int]] = {}
+        for categorie_id, parent_id in parents.items():
+            # Un parent inexistant fait du nœud une racine
+            children.setdefault(parent_id if parent_id in parents else None, []).append(categorie_id)
+        for ids in children.values():
+            ids.sort(key=lambda i: (libelles[i], i))
+
+        # Parcours en profondeur itératif depuis les racines : les nœuds d'un cycle
+        # (données incohérentes) ne sont jamais atteints et sont ignorés
+        paths: dict[int, tuple[int, ...]] = {}
+        order: list[int] = []
+        stack = [(root, ()) for root in reversed(children.get(None, []))]
+        while stack:
+            categorie_id, path = stack.pop()
+            if categorie_id in paths:
+                continue
+            paths[categorie_id] = path
+            order.append(categorie_id)
+            stack.extend((child, path + (categorie_id,)) for child in reversed(children.get(categorie_id, [])))
+
+        # Sous-arbres et totaux calculés des feuilles vers la racine
+        descendants: dict[int, frozenset[int]] = {}
+        totals: dict[int, int] = {}
+        for categorie_id in reversed(order):
+            kids = [k for k in children.get(categorie_id, []) if k in paths]
+            descendants[categorie_id] = frozenset({categorie_id}).union(*(descendants[k] for k in kids))
+            totals[categorie_id] = document_counts.get(categorie_id, 0) + sum(totals[k] for k in kids)
+
+        self._nodes: dict[int, CategoryNode] = {
+            categorie_id: CategoryNode(
+                id=categorie_id,
+                libelle=libelles[categorie_id],
+                parent_id=parents[categorie_id] if parents[categorie_id] in parents else None,
+                children=tuple(k for k in children.get(categorie_id, []) if k in paths),
+                path=paths[categorie_id],
+                descendants=descendants[categorie_id],
+                document_count=document_counts.get(categorie_id, 0),
+                subtree_document_count=totals[categorie_id],
+            )
+            for categorie_id in order
+        }
+        self.roots: tuple[int, ...] = tuple(k for k in children.get(None, []) if k in paths)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def get(self, categorie_id: int) -> Optional[CategoryNode]:
+        """ Nœud d'une catégorie, ou None si elle n'existe pas. """
+        return self._nodes.get(categorie_id)
+
+    def subtree_ids(self, categorie_id: int) -> frozenset[int]:
+        """ IDs de la catégorie et de toutes ses sous-catégories (vide si elle n'existe pas). """
+        node = self._nodes.get(categorie_id)
+        return node.descendants if node else frozenset()
+
+    def ancestors(self, categorie_id: int) -> list[CategoryNode]:
+        """ Ancêtres d'une catégorie, de la racine au parent. """
+        node = self._nodes.get(categorie_id)
+        return [self._nodes[i] for i in node.path] if node else []
@@ -22,6 +22,36 @@ class Settings(BaseSettings):
             f"{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    # URL de connexion pour le moteur asynchrone (driver asyncpg)
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@"
+            f"{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+
+    # Active la pile asynchrone (create_async_engine + AsyncSession) pour les routes
+    # de lecture des documents, membres et de l'authentification. Les écritures
+    # restent sur le moteur synchrone.
+    DB_ASYNC_MODE: bool = False
+
+    # Pool de connexions (par processus / worker uvicorn, et par moteur sync/async)
+    DB_POOL_SIZE: int = 5 # Connexions gardées ouvertes
+    DB_MAX_OVERFLOW: int = 10 # Connexions supplémentaires temporaires au-delà de DB_POOL_SIZE
+    DB_POOL_TIMEOUT: int = 30 # Attente maximale (s) d'une connexion libre avant erreur
+    DB_POOL_RECYCLE: int = 1800 # Durée de vie maximale (s) d'une connexion (-1 : jamais)
+    # Ping (SELECT 1) à chaque checkout : détecte les connexions coupées au prix d'un
+    # aller-retour par requête. Peut être désactivé si DB_POOL_RECYCLE suffit.
+    DB_POOL_PRE_PING: bool = True
+
+    # Affiche toutes les instructions SQL (create_engine(echo=...)) : débogage uniquement
+    SQL_ECHO: bool = False
+    # Mesures SQL par requête HTTP (en-tête Server-Timing) et journal des requêtes lentes
+    SQL_METRICS_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: int = 200 # Instruction SQL journalisée au-delà de cette durée
+    SLOW_REQUEST_SQL_THRESHOLD_MS: int = 500 # Requête HTTP journalisée au-delà de ce temps SQL cumulé
+    SLOW_REQUEST_QUERY_COUNT: int = 50 # ... ou au-delà de ce nombre d'instructions (N+1)
+
     # Configuration pour charger les variables depuis un fichier .env (si existant)
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
 
@@ -29,6 +59,53 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256" # Algorithme standard
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30 # Durée de validité du token
 
+    # Durée de vie (secondes) du cache mémoire des tables de référence
+    # (type_membre, categorie, editeur, emplacement)
+    REFERENCE_CACHE_TTL_SECONDS: int = 300
+
+    # Cache des tokens décodés et des utilisateurs authentifiés
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAXSIZE: int = 10000
+
+    # Configuration PostgreSQL de la recherche plein texte (doit correspondre à la migration 0001)
+    SEARCH_TEXT_CONFIG: str = "french"
+
+    # Index d'autocomplétion en mémoire : intervalle minimal entre deux reconstructions
+    # (les écritures d'un import en masse sont regroupées) et âge maximal avant
+    # reconstruction (écritures validées par les autres workers)
+    AUTOCOMPLETE_REBUILD_MIN_INTERVAL_SECONDS: int = 30
+    AUTOCOMPLETE_MAX_AGE_SECONDS: int = 600
+
+    # Nombre de threads dédiés au hachage bcrypt (connexion / inscription)
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Calcul des pénalités de retard : utilisateur système enregistré comme créateur
+    # des pénalités, et nombre d'emprunts traités par transaction
+    PENALTY_JOB_USER_ID: int = 1
+    PENALTY_JOB_BATCH_SIZE: int = 50000
+
+    # Nombre de jours pendant lesquels un exemplaire reste mis de côté pour une réservation
+    RESERVATION_HOLD_DAYS: int = 3
+
+    # Cache des réponses des routes de lecture du catalogue (voir app.core.response_cache)
+    RESPONSE_CACHE_BACKEND: str = "memory" # "memory" (par worker : les autres workers servent l'ancienne réponse jusqu'au TTL), "sqlite" (partagé entre workers) ou "none"
+    RESPONSE_CACHE_PATH: str = "/tmp/bibliotheque_response_cache.sqlite3"
+    RESPONSE_CACHE_MAXSIZE: int = 10000
+    RESPONSE_CACHE_TTL_REFERENCE_SECONDS: int = 300 # Listes des auteurs, catégories, éditeurs
+    RESPONSE_CACHE_TTL_DOCUMENT_SECONDS: int = 60 # Détail d'un document (disponibilité incluse)
+
+    # Planificateur des tâches périodiques (pénalités, réservations expirées, statistiques, caches)
+    SCHEDULER_ENABLED: bool = False
+    SCHEDULER_JITTER_SECONDS: int = 30 # Gigue aléatoire ajoutée à chaque intervalle
+    PENALTY_JOB_INTERVAL_SECONDS: int = 3600 # Calcul idempotent : relancer dans la journée ne change rien
+    HOLD_SWEEP_INTERVAL_SECONDS: int = 300
+    CACHE_REFRESH_INTERVAL_SECONDS: int = 240 # Inférieur à REFERENCE_CACHE_TTL_SECONDS
+    STATS_ROLLUP_INTERVAL_SECONDS: int = 600
+
+    # Agrégats des statistiques de circulation (voir statistique_service)
+    STATS_ROLLUP_LAG_SECONDS: int = 300 # Délai de garde : seuls les emprunts/retours plus anciens sont agrégés
+    STATS_ROLLUP_CHUNK_DAYS: int = 31 # Jours d'historique agrégés par transaction
+
 
 
 settings = Settings()
\ No newline at end of file
@@ -1,14 +1,33 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
+from app.core import sql_metrics
 from app.core.config import settings
-from typing import Generator
+from app.core.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from typing import AsyncGenerator, Awaitable, Callable, Generator, TypeVar
+
+T = TypeVar("T")
+
+# Paramètres du pool communs aux moteurs sync et async (voir Settings.DB_POOL_*)
+_pool_options = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
 
 # 1. Création du moteur de connexion (Engine)
-# 'echo=True' est utile pour le débug car il affiche les requêtes SQL générées
+# SQL_ECHO=true est utile pour le débug car il affiche les requêtes SQL générées
 engine = create_engine(
     settings.DATABASE_URL, 
-    pool_pre_ping=True
+    poolclass=InstrumentedQueuePool,
+    echo=settings.SQL_ECHO,
+    **_pool_options
 )
+if settings.SQL_METRICS_ENABLED:
+    sql_metrics.instrument(engine)
 
 # 2. Création de la Session Locale
 # C'est l'objet que chaque requête utilisera pour interagir avec la DB
@@ -18,6 +37,29 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# 2 bis. Pile asynchrone optionnelle (DB_ASYNC_MODE=true, nécessite le driver asyncpg)
+# Les routes async n'occupent pas de thread du threadpool de Starlette (40 threads) :
+# la concurrence est alors bornée par le pool de connexions.
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC_MODE:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        poolclass=InstrumentedAsyncQueuePool,
+        echo=settings.SQL_ECHO,
+        **_pool_options
+    )
+    if settings.SQL_METRICS_ENABLED:
+        # Les événements d'exécution sont émis par le moteur synchrone sous-jacent
+        sql_metrics.instrument(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        # Évite un rechargement implicite (impossible en async) après un commit
+        expire_on_commit=False
+    )
+
 # 3. Base déclarative (utilisée par les modèles ORM pour la structure de la DB)
 Base = declarative_base()
 
@@ -32,4 +74,30 @@ def get_db() -> Generator:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Équivalent asynchrone de `get_db` (disponible uniquement si DB_ASYNC_MODE est activé).
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("La pile asynchrone est désactivée (DB_ASYNC_MODE=false).")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# 5. Routes de lecture disponibles dans les deux modes : un seul handler async par route
+# reçoit une AsyncSession (DB_ASYNC_MODE) ou une Session synchrone, et appelle la
+# variante correspondante du service avec `run_read`.
+get_read_db = get_async_db if settings.DB_ASYNC_MODE else get_db
+
+
+async def run_read(db: Session | AsyncSession, sync_call: Callable[..., T], async_call: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+    """
+    Appelle `async_call(db, ...)` sur une AsyncSession, sinon `sync_call(db, ...)` dans le
+    threadpool de Starlette (la boucle d'événements n'est jamais bloquée par le driver).
+    """
+    if isinstance(db, AsyncSession):
+        return await async_call(db, *args, **kwargs)
+    return await run_in_threadpool(sync_call, db, *args, **kwargs)
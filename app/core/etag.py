@@ -0,0 +1,46 @@
+"""
+ETags et requêtes conditionnelles (If-None-Match -> 304 Not Modified).
+
+L'ETag d'une ressource est calculé à partir d'une « version » lue en base par une
+requête légère (IDs + `date_modification`, sans charger les objets ni construire
+les schémas Pydantic) : si le client présente un ETag identique, la route répond
+304 sans corps ; sinon la réponse complète porte le nouvel ETag.
+Les ETags sont faibles (W/) : ils identifient le contenu, pas les octets exacts.
+"""
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    """ ETag faible dérivé d'une représentation stable des `parts` (IDs, dates, compteurs...). """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str | None) -> bool:
+    """ Indique si l'en-tête If-None-Match de la requête correspond à `etag` (comparaison faible). """
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """ Ajoute l'ETag à la réponse ; `no-cache` impose au client de revalider à chaque requête. """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    """ Réponse 304 sans corps. """
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,75 @@
+"""
+Notification des écritures validées (COMMIT), par table.
+
+Les caches (données de référence, utilisateurs, réponses...) s'abonnent aux
+tables dont ils dépendent avec `on_commit`. Les tables modifiées pendant une
+transaction sont collectées à chaque flush (ORM) ou instruction INSERT/UPDATE/
+DELETE exécutée via la Session, puis les abonnés sont notifiés uniquement
+après le COMMIT : un rollback n'invalide rien et aucune requête concurrente ne
+peut recharger l'ancien état entre l'écriture et le commit.
+"""
+import logging
+from itertools import chain
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = "tables_modifiees"
+
+# Liste de (tables observées, callback(tables modifiées))
+_listeners: list[tuple[frozenset[str], Callable[[set[str]], None]]] = []
+
+
+def on_commit(tables: Iterable[str], callback: Callable[[set[str]], None]) -> None:
+    """ Abonne `callback` aux COMMIT qui modifient au moins une des `tables`. """
+    _listeners.append((frozenset(tables), callback))
+
+
+def mark_modified(session: Session, *tables: str) -> None:
+    """ Signale explicitement des tables modifiées (ex: SQL brut via `text()`). """
+    session.info.setdefault(_SESSION_KEY, set()).update(tables)
+
+
+def modified_tables(session: Session) -> set[str]:
+    """ Tables modifiées par la transaction en cours, pas encore validée. """
+    return session.info.get(_SESSION_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    # Après le flush, new/dirty/deleted reflètent encore l'état d'avant le flush
+    mark_modified(
+        session,
+        *{obj.__table__.name for obj in chain(session.new, session.dirty, session.deleted)},
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_dml_tables(orm_execute_state):
+    # INSERT/UPDATE/DELETE en masse (insert(Document).values(...), query.update(), ...)
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            mark_modified(orm_execute_state.session, table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_listeners(session):
+    modified = session.info.pop(_SESSION_KEY, None)
+    if not modified:
+        return
+    for tables, callback in _listeners:
+        if tables & modified:
+            try:
+                callback(modified)
+            except Exception:
+                # Une invalidation de cache ne doit jamais faire échouer la requête
+                logger.exception("Échec de l'invalidation après commit (%s)", callback)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,50 @@
+"""
+Réponses JSON sérialisées directement par Pydantic (pydantic-core, en Rust).
+
+Les services valident déjà les objets ORM en schémas de sortie (`model_validate`).
+Renvoyer ces schémas tels quels laisse FastAPI, via `response_model`, les
+re-sérialiser en dict, les re-valider puis les encoder avec `json.dumps` : deux
+validations et trois passes par ligne. `PydanticJSONResponse` écrit directement
+les octets JSON (`model_dump_json` / `TypeAdapter.dump_json`) ; FastAPI ne
+retraite pas une `Response` renvoyée par la route, et `response_model` reste
+déclaré pour la documentation OpenAPI.
+"""
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.etag import set_etag
+
+
+@lru_cache(maxsize=None)
+def list_adapter(item_type: type) -> TypeAdapter:
+    """ TypeAdapter (mis en cache) d'une liste de `item_type`. """
+    return TypeAdapter(list[item_type])
+
+
+def validate_list(item_type: type[BaseModel], objects: list) -> list:
+    """ Valide une liste d'objets ORM en schémas de sortie en un seul appel (from_attributes). """
+    return list_adapter(item_type).validate_python(objects, from_attributes=True)
+
+
+class PydanticJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        if isinstance(content, list):
+            if not content:
+                return b"[]"
+            return list_adapter(type(content[0])).dump_json(content)
+        raise TypeError(f"Contenu non pris en charge par PydanticJSONResponse : {type(content).__name__}")
+
+
+def json_response(content: BaseModel | list, etag: Optional[str] = None, status_code: int = 200) -> PydanticJSONResponse:
+    """ Réponse JSON sans re-validation, avec ETag éventuel. """
+    response = PydanticJSONResponse(content, status_code=status_code)
+    if etag:
+        set_etag(response, etag)
+    return response
@@ -0,0 +1,105 @@
+"""
+Pagination par curseur (keyset) partagée par les repositories et les services.
+
+Le curseur est opaque pour le client : il encode (base64 url-safe) les valeurs
+de la clé de tri du dernier élément renvoyé. La page suivante est obtenue avec
+un simple `WHERE id > :dernier_id ORDER BY id LIMIT :limit`, qui reste un
+parcours d'index quel que soit le nombre de pages déjà lues (contrairement à OFFSET).
+Pour un autre tri, le curseur encode la clé de tri suivie de l'id (voir
+`composite_keyset_query`).
+"""
+import base64
+import json
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+T = TypeVar("T")
+
+
+def encode_cursor(*values: Any) -> str:
+    """ Encode les valeurs de la clé de tri en un curseur opaque. """
+    raw = json.dumps(list(values), separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[list[Any]]:
+    """
+    Décode un curseur produit par `encode_cursor`.
+    Renvoie None si aucun curseur n'est fourni, lève ValueError s'il est invalide.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Curseur de pagination invalide.")
+    if not isinstance(values, list) or not values:
+        raise ValueError("Curseur de pagination invalide.")
+    return values
+
+
+def decode_id_cursor(cursor: Optional[str]) -> Optional[int]:
+    """ Décode un curseur basé uniquement sur la clé primaire. """
+    values = decode_cursor(cursor)
+    if values is None:
+        return None
+    if len(values) != 1 or not isinstance(values[0], int):
+        raise ValueError("Curseur de pagination invalide.")
+    return values[0]
+
+
+def keyset_query(query: Query | Select, id_column, limit: int, after_id: Optional[int]) -> Query | Select:
+    """
+    Applique le filtre keyset, l'ordre stable et la limite à une requête
+    (`db.query(...)` ou `select(...)`, ce dernier étant partagé avec les repositories async).
+    On lit `limit + 1` lignes pour savoir s'il existe une page suivante
+    sans exécuter de COUNT(*).
+    """
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    return query.order_by(id_column).limit(limit + 1)
+
+
+def composite_keyset_query(
+    query: Query | Select,
+    columns: Sequence,
+    limit: int,
+    after: Optional[Sequence[Any]],
+    descending: bool = False,
+) -> Query | Select:
+    """
+    Variante de `keyset_query` pour un tri sur plusieurs colonnes (ex: titre puis id) :
+    `WHERE (titre, id) > (:titre, :id) ORDER BY titre, id LIMIT :limit + 1`.
+    La comparaison de lignes est servie par un index composite sur les mêmes colonnes,
+    parcouru à l'envers pour un tri décroissant. La dernière colonne doit être unique.
+    """
+    if after is not None:
+        if len(columns) == 1:
+            key, values = columns[0], literal(after[0], columns[0].type)
+        else:
+            key = tuple_(*columns)
+            values = tuple_(*(literal(value, column.type) for column, value in zip(columns, after)))
+        query = query.filter(key < values if descending else key > values)
+    order = [column.desc() for column in columns] if descending else list(columns)
+    return query.order_by(*order).limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence[T],
+    limit: int,
+    cursor_key: Callable[[T], Any] = lambda row: (row.id,),
+) -> tuple[list[T], Optional[str]]:
+    """
+    Sépare les `limit` premières lignes et calcule le curseur suivant
+    (None s'il n'y a plus de page).
+    """
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+    return items, encode_cursor(*cursor_key(items[-1]))
@@ -0,0 +1,92 @@
+"""
+Mesures des pools de connexions SQLAlchemy.
+
+Les pools instrumentés mesurent le temps d'attente au moment du checkout : une
+attente non nulle signifie que toutes les connexions (pool_size + max_overflow)
+sont occupées et que les requêtes font la queue. Les compteurs instantanés
+(connexions prises, en débordement...) sont lus directement sur le pool.
+"""
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class CheckoutStats:
+    """ Statistiques cumulées des checkouts d'un pool (thread-safe). """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            # En dessous d'une milliseconde, la connexion était disponible immédiatement
+            if wait >= 0.001:
+                self.waited += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = (self.checkouts + self.timeouts) or 1
+            return {
+                "checkouts": self.checkouts,
+                "checkouts_with_wait": self.waited,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / total * 1000, 3),
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+def _timed_do_get(pool_cls, self):
+    started = time.perf_counter()
+    try:
+        connection = super(pool_cls, self)._do_get()
+    except exc.TimeoutError:
+        self.checkout_stats.record(time.perf_counter() - started, timed_out=True)
+        raise
+    self.checkout_stats.record(time.perf_counter() - started)
+    return connection
+
+
+class InstrumentedQueuePool(QueuePool):
+    """ QueuePool (moteur synchrone) qui mesure l'attente au checkout. """
+    checkout_stats = CheckoutStats()
+
+    def _do_get(self):
+        return _timed_do_get(InstrumentedQueuePool, self)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """ AsyncAdaptedQueuePool (moteur asynchrone) qui mesure l'attente au checkout. """
+    checkout_stats = CheckoutStats()
+
+    def _do_get(self):
+        return _timed_do_get(InstrumentedAsyncQueuePool, self)
+
+
+def pool_snapshot(pool) -> dict:
+    """ État courant d'un pool et statistiques cumulées de checkout. """
+    snapshot = {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # Négatif tant que le pool n'a pas ouvert toutes ses connexions de base
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,
+        "timeout_s": pool.timeout(),
+    }
+    stats = getattr(pool, "checkout_stats", None)
+    if stats is not None:
+        snapshot.update(stats.snapshot())
+    return snapshot
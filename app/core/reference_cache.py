@@ -0,0 +1,157 @@
+"""
+Cache des données de référence (petites tables rarement modifiées) :
+`type_membre`, `categorie`, `editeur` et `emplacement`.
+
+Chaque table est chargée en entier, en une seule requête, puis servie depuis la
+mémoire jusqu'à expiration du TTL (`REFERENCE_CACHE_TTL_SECONDS`) ou jusqu'au
+prochain COMMIT qui modifie la table (voir `app.core.invalidation`).
+Un ID absent du cache (ligne créée depuis un autre worker, par exemple) provoque
+un rechargement de la table avant de conclure qu'il n'existe pas.
+Les valeurs renvoyées sont des instantanés immuables, indépendants de la Session.
+
+Chaque table a un numéro de génération, incrémenté à chaque invalidation : un
+chargement commencé avant une invalidation n'est pas remis en cache après elle.
+Une table modifiée par la transaction en cours (non validée) est relue sans être
+mise en cache.
+"""
+import decimal
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core import invalidation
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.document import Categorie, Editeur, Emplacement
+from app.models.membre import TypeMembre
+
+
+@dataclass(frozen=True)
+class TypeMembreRef:
+    """ Instantané d'un type de membre et de ses règles d'emprunt. """
+    id: int
+    libelle: str
+    max_emprunt: int
+    duree_emprunt: int
+    taux_penalite_jour: decimal.Decimal
+
+
+@dataclass(frozen=True)
+class LibelleRef:
+    """ Instantané d'une ligne de référence identifiée par un libellé. """
+    id: int
+    libelle: str
+
+
+def _load_types_membre(db: Session) -> dict[int, TypeMembreRef]:
+    rows = db.query(
+        TypeMembre.id, TypeMembre.libelle, TypeMembre.max_emprunt,
+        TypeMembre.duree_emprunt, TypeMembre.taux_penalite_jour,
+    ).all()
+    return {row.id: TypeMembreRef(*row) for row in rows}
+
+
+def _load_categories(db: Session) -> dict[int, LibelleRef]:
+    return {row.id: LibelleRef(*row) for row in db.query(Categorie.id, Categorie.libelle).all()}
+
+
+def _load_editeurs(db: Session) -> dict[int, LibelleRef]:
+    return {row.id: LibelleRef(*row) for row in db.query(Editeur.id, Editeur.libelle).all()}
+
+
+def _load_emplacements(db: Session) -> dict[int, LibelleRef]:
+    return {row.id: LibelleRef(*row) for row in db.query(Emplacement.id, Emplacement.code_rayon).all()}
+
+
+_LOADERS: dict[str, Callable[[Session], dict]] = {
+    TypeMembre.__tablename__: _load_types_membre,
+    Categorie.__tablename__: _load_categories,
+    Editeur.__tablename__: _load_editeurs,
+    Emplacement.__tablename__: _load_emplacements,
+}
+
+_cache = TTLCache(maxsize=len(_LOADERS), ttl=settings.REFERENCE_CACHE_TTL_SECONDS)
+_generations: dict[str, int] = dict.fromkeys(_LOADERS, 0)
+_generation_lock = threading.Lock()
+
+
+def _load(db: Session, table: str) -> dict:
+    """ Lit une table et la met en cache, sauf si elle a été invalidée pendant la lecture. """
+    with _generation_lock:
+        generation = _generations[table]
+    rows = _LOADERS[table](db)
+    if table in invalidation.modified_tables(db):
+        # Lignes non validées de la transaction en cours
+        return rows
+    with _generation_lock:
+        if _generations[table] == generation:
+            _cache.set(table, rows)
+    return rows
+
+
+def _table(db: Session, table: str) -> dict:
+    rows = _cache.get(table)
+    return rows if rows is not None else _load(db, table)
+
+
+def _row(db: Session, table: str, row_id: int):
+    """ Ligne d'une table de référence ; en cas d'absence, la table est rechargée une fois avant de renvoyer None. """
+    row = _table(db, table).get(row_id)
+    if row is not None:
+        return row
+    return _load(db, table).get(row_id)
+
+
+def get_types_membre(db: Session) -> dict[int, TypeMembreRef]:
+    """ Renvoie tous les types de membre, indexés par ID. """
+    return _table(db, TypeMembre.__tablename__)
+
+
+def get_type_membre(db: Session, type_membre_id: int) -> Optional[TypeMembreRef]:
+    """ Renvoie un type de membre (libellé et règles d'emprunt) ou None s'il n'existe pas. """
+    return _row(db, TypeMembre.__tablename__, type_membre_id)
+
+
+def get_categorie(db: Session, categorie_id: int) -> Optional[LibelleRef]:
+    """ Renvoie le libellé d'une catégorie ou None si elle n'existe pas. """
+    return _row(db, Categorie.__tablename__, categorie_id)
+
+
+def get_editeur(db: Session, editeur_id: int) -> Optional[LibelleRef]:
+    """ Renvoie le libellé d'un éditeur ou None s'il n'existe pas. """
+    return _row(db, Editeur.__tablename__, editeur_id)
+
+
+def get_emplacement(db: Session, emplacement_id: int) -> Optional[LibelleRef]:
+    """ Renvoie le code rayon d'un emplacement ou None s'il n'existe pas. """
+    return _row(db, Emplacement.__tablename__, emplacement_id)
+
+
+def invalidate(table: Optional[str] = None) -> None:
+    """ Invalide une table de référence (ou toutes si `table` est None). """
+    with _generation_lock:
+        for name in (_LOADERS if table is None else [table]):
+            _generations[name] = _generations.get(name, 0) + 1
+            _cache.pop(name)
+
+
+def refresh(db: Session) -> None:
+    """ Recharge toutes les tables de référence (tâche planifiée, avant l'expiration du TTL). """
+    for table in _LOADERS:
+        _load(db, table)
+
+
+def stats() -> dict:
+    """ Statistiques du cache (succès / échecs). """
+    return _cache.stats()
+
+
+def _invalidate_modified(tables: set[str]) -> None:
+    for table in tables & _LOADERS.keys():
+        invalidate(table)
+
+
+# Invalidation automatique dès qu'une transaction modifiant ces tables est validée
+invalidation.on_commit(_LOADERS.keys(), _invalidate_modified)
@@ -0,0 +1,411 @@
+"""
+Cache des réponses JSON des routes de lecture du catalogue.
+
+Une entrée contient le corps JSON déjà sérialisé et son ETag : un succès ne
+touche ni la base ni Pydantic, et un If-None-Match correspondant renvoie 304.
+Les entrées sont regroupées par espace de noms (« categories », « documents »...)
+associé aux tables dont dépend la réponse : dès qu'un COMMIT modifie une de ces
+tables (voir `app.core.invalidation`), la génération de l'espace de noms est
+incrémentée et toutes ses entrées deviennent inaccessibles.
+
+Les détails de documents sont invalidés document par document : chaque entrée
+porte aussi la génération de son document, et seuls les documents touchés par la
+transaction (document, exemplaires, emprunts, réservations flushés ou signalés
+par `mark_documents`) voient la leur incrémentée. Un prêt ne vide donc pas le
+cache des autres titres. Une instruction en masse dont les documents ne sont pas
+connus invalide tout l'espace de noms.
+
+Backends (`RESPONSE_CACHE_BACKEND`) :
+- « memory » : LRU en mémoire (`TTLCache`), propre à chaque worker ; l'invalidation
+  n'atteint que le worker qui a écrit : les autres workers continuent de servir
+  l'ancienne réponse jusqu'à l'expiration de son TTL (RESPONSE_CACHE_TTL_DOCUMENT_SECONDS
+  pour un document, y compris sa disponibilité) ;
+- « sqlite » : fichier SQLite local partagé par les workers de la machine ; les
+  générations y sont stockées, donc une écriture dans un worker (ou une commande
+  CLI) invalide l'entrée pour tous ;
+- « none » : cache désactivé.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from itertools import chain
+from typing import Iterable, NamedTuple, Optional, Protocol
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+from starlette.concurrency import run_in_threadpool
+
+from app.core import invalidation
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.etag import etag_matches, not_modified, set_etag
+from app.core.json_response import PydanticJSONResponse
+from app.models.document import Exemplaire
+
+logger = logging.getLogger(__name__)
+
+# Espaces de noms et tables dont dépendent leurs réponses
+NAMESPACE_TABLES: dict[str, frozenset[str]] = {
+    "auteurs": frozenset({"auteur"}),
+    "categories": frozenset({"categorie"}),
+    "editeurs": frozenset({"editeur"}),
+    # La disponibilité fait partie de DocumentRead
+    "documents": frozenset({"document", "exemplaire", "emprunt", "reservation"}),
+}
+
+# Espace de noms invalidé document par document (voir _collect_flushed_documents)
+DOCUMENTS = "documents"
+
+# Option d'exécution d'une instruction en masse dont l'appelant signale lui-même les
+# documents touchés avec `mark_documents` (sinon tout l'espace de noms est invalidé)
+DOCUMENTS_MARKED = "documents_signales"
+
+_SESSION_KEY = "documents_modifies"
+# Valeur de session.info[_SESSION_KEY] : documents inconnus, tout l'espace de noms est invalidé
+_ALL = None
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+
+
+class Backend(Protocol):
+    name: str
+    # Accès disque (ou réseau) : appelé depuis une route async, il passe par le threadpool
+    blocking: bool
+
+    def get(self, key: str) -> Optional[CachedResponse]: ...
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None: ...
+    # Portée d'une génération : un espace de noms (« documents ») ou un élément (« documents/42 »)
+    def generation(self, scope: str) -> int: ...
+    def bump(self, scope: str) -> None: ...
+    def size(self) -> int: ...
+
+
+def _item_scope(namespace: str, item_id: int) -> str:
+    return f"{namespace}/{item_id}"
+
+
+class MemoryBackend:
+    """ LRU en mémoire, par worker. """
+    name = "memory"
+    blocking = False
+
+    def __init__(self, maxsize: int):
+        self._entries = TTLCache(maxsize=maxsize)
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    def generation(self, scope: str) -> int:
+        return self._generations.get(scope, 0)
+
+    def bump(self, scope: str) -> None:
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """ Fichier SQLite local partagé entre les workers (mode WAL, une connexion par thread). """
+    name = "sqlite"
+    # Attente possible du verrou d'écriture (timeout de 5 s) si d'autres workers écrivent
+    blocking = True
+
+    # Nettoyage des entrées expirées toutes les N écritures
+    _PURGE_EVERY = 1000
+
+    def __init__(self, path: str, maxsize: int):
+        self.path = path
+        self.maxsize = maxsize
+        self._local = threading.local()
+        self._writes = 0
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_expires_at_idx ON entries (expires_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS generations (namespace TEXT PRIMARY KEY, generation INTEGER NOT NULL)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        row = self._connection().execute(
+            "SELECT body, etag FROM entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return CachedResponse(row[0], row[1]) if row else None
+
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None:
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, body, etag, expires_at) VALUES (?, ?, ?, ?)",
+            (key, value.body, value.etag, time.time() + ttl),
+        )
+        self._writes += 1
+        if self._writes % self._PURGE_EVERY == 0:
+            self._purge(conn)
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        # Au-delà de la taille maximale, les entrées expirant le plus tôt sont supprimées
+        conn.execute(
+            "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY expires_at LIMIT max(0, (SELECT count(*) FROM entries) - ?))",
+            (self.maxsize,),
+        )
+
+    def generation(self, scope: str) -> int:
+        row = self._connection().execute("SELECT generation FROM generations WHERE namespace = ?", (scope,)).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, scope: str) -> None:
+        conn = self._connection()
+        conn.execute(
+            "INSERT INTO generations (namespace, generation) VALUES (?, 1) "
+            "ON CONFLICT(namespace) DO UPDATE SET generation = generation + 1",
+            (scope,),
+        )
+        # Les entrées des générations précédentes ne sont plus lisibles : libère la place.
+        # Intervalle de clés (préfixe « scope: ») servi par la clé primaire, contrairement à LIKE
+        prefix = self._key_prefix(scope)
+        conn.execute("DELETE FROM entries WHERE key >= ? AND key < ?", (prefix, prefix[:-1] + ";"))
+
+    def _key_prefix(self, scope: str) -> str:
+        """ Préfixe commun des clés d'une portée : « documents: » ou « documents:<génération>:42: ». """
+        namespace, _, item_id = scope.partition("/")
+        if not item_id:
+            return f"{namespace}:"
+        return f"{namespace}:{self.generation(namespace)}:{item_id}:"
+
+    def size(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM entries").fetchone()[0]
+
+
+class ResponseCache:
+    def __init__(self, backend: Optional[Backend]):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def key(self, namespace: str, request: Request, item_id: Optional[int] = None) -> Optional[str]:
+        """
+        Clé de la requête dans la génération courante de l'espace de noms (et de l'élément
+        `item_id`, invalidé séparément). Elle doit être calculée avant la lecture en base et
+        réutilisée pour `store` : une invalidation survenue entre-temps rend l'entrée
+        inaccessible au lieu d'y ranger un état périmé.
+        """
+        if not self.enabled:
+            return None
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        prefix = f"{namespace}:{self.backend.generation(namespace)}:"
+        if item_id is not None:
+            prefix += f"{item_id}:{self.backend.generation(_item_scope(namespace, item_id))}:"
+        return f"{prefix}{request.url.path}?{query}"
+
+    def _count(self, counters: dict[str, int], namespace: str) -> None:
+        with self._lock:
+            counters[namespace] = counters.get(namespace, 0) + 1
+
+    def lookup(self, namespace: str, key: Optional[str], request: Request) -> Optional[Response]:
+        """ Réponse en cache pour cette clé (304 si l'ETag correspond), ou None. """
+        if key is None:
+            return None
+        cached = self.backend.get(key)
+        if cached is None:
+            self._count(self._misses, namespace)
+            return None
+        self._count(self._hits, namespace)
+        if cached.etag and etag_matches(request, cached.etag):
+            return not_modified(cached.etag)
+        response = Response(content=cached.body, media_type="application/json")
+        if cached.etag:
+            set_etag(response, cached.etag)
+        return response
+
+    def store(self, key: Optional[str], payload: BaseModel | list, etag: Optional[str], ttl: float) -> Response:
+        """ Sérialise `payload`, l'enregistre sous `key` et renvoie la réponse JSON correspondante. """
+        body = PydanticJSONResponse(payload).body
+        if key is not None:
+            self.backend.set(key, CachedResponse(body, etag), ttl)
+        response = Response(content=body, media_type="application/json")
+        if etag:
+            set_etag(response, etag)
+        return response
+
+    async def _offload(self, func, *args):
+        if self.enabled and self.backend.blocking:
+            return await run_in_threadpool(func, *args)
+        return func(*args)
+
+    async def key_async(self, namespace: str, request: Request, item_id: Optional[int] = None) -> Optional[str]:
+        """ `key` pour les routes async : un backend bloquant est interrogé hors de la boucle d'événements. """
+        return await self._offload(self.key, namespace, request, item_id)
+
+    async def lookup_async(self, namespace: str, key: Optional[str], request: Request) -> Optional[Response]:
+        """ `lookup` pour les routes async (voir `key_async`). """
+        return await self._offload(self.lookup, namespace, key, request)
+
+    async def store_async(self, key: Optional[str], payload: BaseModel | list, etag: Optional[str], ttl: float) -> Response:
+        """ `store` pour les routes async (voir `key_async`). """
+        return await self._offload(self.store, key, payload, etag, ttl)
+
+    def invalidate(self, *namespaces: str) -> None:
+        """ Rend inaccessibles toutes les entrées des espaces de noms donnés. """
+        if self.enabled:
+            for namespace in namespaces:
+                self.backend.bump(namespace)
+
+    def invalidate_items(self, namespace: str, item_ids: Iterable[int]) -> None:
+        """ Rend inaccessibles les entrées des éléments donnés d'un espace de noms. """
+        if self.enabled:
+            for item_id in item_ids:
+                self.backend.bump(_item_scope(namespace, item_id))
+
+    def stats(self) -> dict:
+        """ Succès / échecs par espace de noms (compteurs du worker courant). """
+        with self._lock:
+            namespaces = {}
+            for namespace in NAMESPACE_TABLES:
+                hits, misses = self._hits.get(namespace, 0), self._misses.get(namespace, 0)
+                namespaces[namespace] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+                }
+        return {
+            "backend": self.backend.name if self.enabled else None,
+            "size": self.backend.size() if self.enabled else 0,
+            "namespaces": namespaces,
+        }
+
+
+def _create_backend() -> Optional[Backend]:
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryBackend(settings.RESPONSE_CACHE_MAXSIZE)
+    if settings.RESPONSE_CACHE_BACKEND == "sqlite":
+        return SQLiteBackend(settings.RESPONSE_CACHE_PATH, settings.RESPONSE_CACHE_MAXSIZE)
+    return None
+
+
+response_cache = ResponseCache(_create_backend())
+
+
+def mark_documents(session: Session, document_ids: Iterable[int]) -> None:
+    """ Signale des documents modifiés par une instruction en masse exécutée avec DOCUMENTS_MARKED. """
+    modified = session.info.setdefault(_SESSION_KEY, set())
+    if modified is not _ALL:
+        modified.update(document_ids)
+
+
+def _mark_all_documents(session: Session) -> None:
+    session.info[_SESSION_KEY] = _ALL
+
+
+def _changed(obj, *attributes: str) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+def _document_ids(session: Session, obj) -> Optional[set[int]]:
+    """ Documents dont la réponse dépend de `obj` (ancienne valeur comprise), None s'ils sont inconnus. """
+    table = obj.__table__.name
+    if table == "document":
+        return {obj.id}
+    if table in ("exemplaire", "reservation"):
+        # Un exemplaire ou une réservation déplacé(e) modifie aussi son ancien document
+        return {obj.document_id, *inspect(obj).attrs.document_id.history.deleted}
+    if table == "emprunt":
+        # Seuls l'ouverture et la clôture d'un emprunt changent la disponibilité
+        if obj not in session.new and obj not in session.deleted and not _changed(obj, "date_retour_reelle", "exemplaire_id"):
+            return set()
+        # L'exemplaire est presque toujours chargé (et verrouillé) dans la même transaction
+        exemplaire = session.identity_map.get(identity_key(Exemplaire, obj.exemplaire_id))
+        return {exemplaire.document_id} if exemplaire is not None else None
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_documents(session, flush_context):
+    if session.info.get(_SESSION_KEY, set()) is _ALL:
+        return
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if obj.__table__.name not in NAMESPACE_TABLES[DOCUMENTS]:
+            continue
+        document_ids = _document_ids(session, obj)
+        if document_ids is None:
+            _mark_all_documents(session)
+            return
+        mark_documents(session, document_ids)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_documents(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is None or table.name not in NAMESPACE_TABLES[DOCUMENTS]:
+        return
+    if orm_execute_state.execution_options.get(DOCUMENTS_MARKED):
+        return
+    if orm_execute_state.is_insert and table.name == "document":
+        # Nouveaux documents : aucune réponse en cache ne les concerne
+        return
+    _mark_all_documents(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_documents(session):
+    if _SESSION_KEY not in session.info:
+        return
+    document_ids = session.info.pop(_SESSION_KEY)
+    try:
+        if document_ids is _ALL:
+            response_cache.invalidate(DOCUMENTS)
+        else:
+            response_cache.invalidate_items(DOCUMENTS, document_ids)
+    except Exception:
+        # Une invalidation de cache ne doit jamais faire échouer la requête
+        logger.exception("Échec de l'invalidation des documents en cache")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_SESSION_KEY, None)
+
+
+def _invalidate_modified(tables: set[str]) -> None:
+    response_cache.invalidate(*(
+        ns for ns, ns_tables in NAMESPACE_TABLES.items()
+        if ns != DOCUMENTS and ns_tables & tables
+    ))
+
+
+# Invalidation dès qu'un COMMIT modifie une table dont dépend un espace de noms
+# (« documents » est invalidé document par document ci-dessus)
+invalidation.on_commit(
+    frozenset().union(*(tables for ns, tables in NAMESPACE_TABLES.items() if ns != DOCUMENTS)),
+    _invalidate_modified,
+)
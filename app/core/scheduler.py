@@ -0,0 +1,180 @@
+"""
+Planificateur de tâches périodiques exécuté dans le processus de l'API.
+
+Démarré depuis le lifespan FastAPI (`SCHEDULER_ENABLED`). Chaque tâche tourne
+dans sa propre boucle asyncio, avec un intervalle et une gigue aléatoire
+(évite que tous les workers se réveillent ensemble) ; le travail lui-même
+s'exécute dans un pool de threads dédié, hors du threadpool des requêtes.
+
+Les tâches `exclusive` (écritures en base) prennent un verrou consultatif
+PostgreSQL (`pg_try_advisory_lock`) sur une connexion dédiée : dans un
+déploiement multi-workers, un seul worker exécute chaque tâche, les autres
+comptent l'exécution comme « ignorée ». Les tâches non exclusives (caches
+en mémoire) s'exécutent dans chaque worker.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobStats:
+    """ Mesures d'exécution d'une tâche. """
+    runs: int = 0
+    skipped: int = 0
+    failures: int = 0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    last_duration: Optional[float] = None
+    last_run_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    next_run_at: Optional[datetime] = None
+
+    def snapshot(self) -> dict:
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "avg_duration_s": round(self.total_duration / self.runs, 3) if self.runs else None,
+            "max_duration_s": round(self.max_duration, 3),
+            "last_duration_s": None if self.last_duration is None else round(self.last_duration, 3),
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+            "next_run_at": self.next_run_at,
+        }
+
+
+@dataclass
+class Job:
+    """ Tâche périodique : `func(db)` est appelée avec une Session dédiée. """
+    name: str
+    func: Callable[[Session], object]
+    interval: float
+    jitter: float = 0.0
+    initial_delay: float = 0.0
+    exclusive: bool = True
+    stats: JobStats = field(default_factory=JobStats)
+
+    @property
+    def lock_key(self) -> int:
+        # Clé stable entre workers et redémarrages (hash() de Python est randomisé)
+        return zlib.crc32(f"scheduler:{self.name}".encode())
+
+
+class Scheduler:
+    def __init__(self, max_workers: int = 2):
+        self._jobs: dict[str, Job] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+
+    def add_job(self, name: str, func: Callable[[Session], object], interval: float, jitter: float = 0.0,
+                initial_delay: float = 0.0, exclusive: bool = True) -> None:
+        """ Enregistre une tâche (à appeler avant `start`). """
+        self._jobs[name] = Job(name, func, interval, jitter, initial_delay, exclusive)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """ Lance une boucle par tâche sur la boucle d'événements courante. """
+        if self._tasks:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="scheduler")
+        self._tasks = [asyncio.create_task(self._loop(job), name=f"scheduler:{job.name}") for job in self._jobs.values()]
+        logger.info("Planificateur démarré : %s", ", ".join(self._jobs) or "aucune tâche")
+
+    async def stop(self) -> None:
+        """ Arrête les boucles ; une exécution en cours se termine dans son thread. """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _loop(self, job: Job) -> None:
+        delay = job.initial_delay
+        loop = asyncio.get_running_loop()
+        while True:
+            delay += random.uniform(0, job.jitter)
+            job.stats.next_run_at = datetime.fromtimestamp(time.time() + delay)
+            await asyncio.sleep(delay)
+            await loop.run_in_executor(self._executor, self.run_job, job)
+            delay = job.interval
+
+    def run_job(self, job: Job) -> None:
+        """ Exécute une tâche (dans le thread courant), sous verrou consultatif si elle est exclusive. """
+        started = time.perf_counter()
+        try:
+            if job.exclusive and engine.dialect.name == "postgresql":
+                with engine.connect() as conn:
+                    acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": job.lock_key}).scalar()
+                    conn.commit()
+                    if not acquired:
+                        # Un autre worker exécute déjà cette tâche
+                        self._record(job, skipped=True)
+                        return
+                    try:
+                        # La Session valide ses propres transactions sur la connexion qui détient le verrou
+                        with Session(bind=conn) as db:
+                            job.func(db)
+                    finally:
+                        conn.rollback()
+                        conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": job.lock_key})
+                        conn.commit()
+            else:
+                with SessionLocal() as db:
+                    job.func(db)
+        except Exception as e:
+            logger.exception("Échec de la tâche planifiée %s", job.name)
+            self._record(job, duration=time.perf_counter() - started, error=f"{e.__class__.__name__}: {e}")
+            return
+        self._record(job, duration=time.perf_counter() - started)
+
+    def _record(self, job: Job, duration: float = 0.0, skipped: bool = False, error: Optional[str] = None) -> None:
+        with self._lock:
+            stats = job.stats
+            stats.last_run_at = datetime.now()
+            if skipped:
+                stats.skipped += 1
+                return
+            stats.runs += 1
+            stats.total_duration += duration
+            stats.max_duration = max(stats.max_duration, duration)
+            stats.last_duration = duration
+            if error is not None:
+                stats.failures += 1
+            stats.last_error = error
+
+    def stats(self) -> dict:
+        """ Mesures de toutes les tâches enregistrées. """
+        with self._lock:
+            return {
+                "running": self.running,
+                "jobs": {
+                    name: {"interval_s": job.interval, "exclusive": job.exclusive, **job.stats.snapshot()}
+                    for name, job in self._jobs.items()
+                },
+            }
+
+
+# Instance unique du processus (démarrée par le lifespan de app.main)
+scheduler = Scheduler()
@@ -0,0 +1,107 @@
+"""
+Index inversé en mémoire (Python pur) pour la recherche plein texte.
+
+Utilisé lorsque la base n'est pas PostgreSQL (tests, SQLite) : même logique que
+la recherche tsvector (tous les termes doivent correspondre, pondération par
+champ, dernier terme traité comme un préfixe) avec un score de type TF-IDF.
+"""
+import bisect
+import math
+import re
+import threading
+import unicodedata
+from typing import Iterable, Optional
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Mots vides les plus fréquents (français / anglais) ignorés à l'indexation
+_STOPWORDS = frozenset(
+    "le la les l de des du d un une et ou en au aux a à dans par pour sur avec sans "
+    "the of and or in on to for with".split()
+)
+
+
+def normalize(text: str) -> str:
+    """ Minuscules et suppression des accents ("Éléphant" -> "elephant"). """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """ Découpe un texte en termes normalisés, sans mots vides. """
+    if not text:
+        return []
+    return [token for token in _TOKEN_RE.findall(normalize(text)) if token not in _STOPWORDS]
+
+
+class InvertedIndex:
+    """ Index terme -> {doc_id: poids}, thread-safe en lecture après construction. """
+
+    def __init__(self):
+        self._postings: dict[str, dict[int, float]] = {}
+        self._doc_terms: dict[int, set[str]] = {}
+        self._sorted_terms: Optional[list[str]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, doc_id: int, fields: Iterable[tuple[Optional[str], float]]) -> None:
+        """ Indexe un document à partir de champs (texte, poids). """
+        with self._lock:
+            self._remove(doc_id)
+            terms = self._doc_terms.setdefault(doc_id, set())
+            for text, weight in fields:
+                for token in tokenize(text):
+                    postings = self._postings.setdefault(token, {})
+                    postings[doc_id] = postings.get(doc_id, 0.0) + weight
+                    terms.add(token)
+            self._sorted_terms = None
+
+    def remove(self, doc_id: int) -> None:
+        """ Retire un document de l'index. """
+        with self._lock:
+            self._remove(doc_id)
+            self._sorted_terms = None
+
+    def _remove(self, doc_id: int) -> None:
+        for token in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        if self._sorted_terms is None:
+            with self._lock:
+                self._sorted_terms = sorted(self._postings)
+        terms = self._sorted_terms
+        start = bisect.bisect_left(terms, prefix)
+        end = bisect.bisect_left(terms, prefix + "\uffff")
+        return terms[start:end]
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[int, float]]:
+        """ Renvoie les (doc_id, score) contenant tous les termes de `query`, par score décroissant. """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        total_docs = len(self._doc_terms) or 1
+        scores: Optional[dict[int, float]] = None
+        for position, term in enumerate(terms):
+            # Le dernier terme est traité comme un préfixe (saisie en cours)
+            variants = self._expand_prefix(term) if position == len(terms) - 1 else [term]
+            term_scores: dict[int, float] = {}
+            for variant in variants:
+                postings = self._postings.get(variant, {})
+                idf = math.log(1 + total_docs / (len(postings) or 1))
+                for doc_id, weight in postings.items():
+                    term_scores[doc_id] = term_scores.get(doc_id, 0.0) + weight * idf
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: score + term_scores[doc_id] for doc_id, score in scores.items() if doc_id in term_scores}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
@@ -1,7 +1,6 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
 from typing import Any
 from passlib.context import CryptContext
 from app.repositories import user_repo  # adapte le chemin / fonction
@@ -12,9 +11,16 @@ from app.core import config # Pour accéder à la clé secrète
 from app.schemas.token_schema import TokenData
 
 
-from app.core.database import get_db # Fonction existante pour obtenir la session DB
-from app.repositories import user_repo # Repository à créer
-from app.models.utilisateur import UtilisateurSys # Modèle DB
+from app.core.database import SessionLocal, AsyncSessionLocal # Fonction existante pour obtenir la session DB
+from app.core import invalidation
+from app.core.cache import TTLCache
+from app.repositories import async_user_repo, user_repo # Repository à créer
+from app.schemas.user_schema import CurrentUser
+from starlette.concurrency import run_in_threadpool
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
 
 
 from fastapi.security import OAuth2PasswordRequestForm
@@ -22,13 +28,97 @@ from fastapi.security import OAuth2PasswordRequestForm
 # Définit le contexte de hachage (utiliser bcrypt car il est lent et sécurisé)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Pool dédié et borné pour bcrypt : bcrypt libère le GIL, les threads s'exécutent donc
+# en parallèle, mais leur nombre est limité pour ne pas saturer les CPU lors d'une
+# rafale de connexions. Ni la boucle d'événements ni le threadpool de Starlette
+# (utilisé par les routes synchrones) ne sont bloqués par le hachage.
+_password_executor = ThreadPoolExecutor(
+    max_workers=config.settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+
+
+class _HashingStats:
+    """ Mesures du hachage : nombre d'appels, attente dans la file, durée de calcul. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        # Soumis au pool mais pas encore démarrés / en cours de calcul
+        self.queued = 0
+        self.in_flight = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.max_wait = 0.0
+        self.max_run = 0.0
+
+    def submitted(self, count: int) -> None:
+        with self._lock:
+            self.queued += count
+
+    def run(self, func, submitted_at: float, *args):
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+        try:
+            return func(*args)
+        finally:
+            ended = time.perf_counter()
+            wait, run = started - submitted_at, ended - started
+            with self._lock:
+                self.in_flight -= 1
+                self.calls += 1
+                self.total_wait += wait
+                self.total_run += run
+                self.max_wait = max(self.max_wait, wait)
+                self.max_run = max(self.max_run, run)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            calls = self.calls or 1
+            return {
+                "workers": config.settings.PASSWORD_HASH_WORKERS,
+                "calls": self.calls,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "avg_wait_ms": round(self.total_wait / calls * 1000, 2),
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "avg_hash_ms": round(self.total_run / calls * 1000, 2),
+                "max_hash_ms": round(self.max_run * 1000, 2),
+            }
+
+
+_hashing_stats = _HashingStats()
+
+
+def _submit_hashing(func, *args):
+    _hashing_stats.submitted(1)
+    try:
+        return _password_executor.submit(_hashing_stats.run, func, time.perf_counter(), *args)
+    except Exception:
+        # Pool arrêté : la tâche ne démarrera jamais
+        _hashing_stats.submitted(-1)
+        raise
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Vérifie si le mot de passe simple correspond au mot de passe haché."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Vérifie si le mot de passe simple correspond au mot de passe haché (appel bloquant)."""
+    return _submit_hashing(pwd_context.verify, plain_password, hashed_password).result()
 
 def get_password_hash(password: str) -> str:
-    """Hache et sale le mot de passe."""
-    return pwd_context.hash(password)
+    """Hache et sale le mot de passe (appel bloquant)."""
+    return _submit_hashing(pwd_context.hash, password).result()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Vérifie le mot de passe dans le pool de hachage sans bloquer la boucle d'événements."""
+    return await asyncio.wrap_future(_submit_hashing(pwd_context.verify, plain_password, hashed_password))
+
+
+def password_hashing_stats() -> dict:
+    """ Latence et débit du hachage des mots de passe. """
+    return _hashing_stats.snapshot()
 
 
 oauth2_scheme = OAuth2PasswordRequestForm
@@ -73,11 +163,57 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 
+# ----------------------------------------------------------------------
+# 3. Caches d'authentification (tokens décodés et utilisateurs actifs)
+# ----------------------------------------------------------------------
+
+# token -> TokenData ; une entrée n'est jamais conservée au-delà de l'expiration du token
+_token_cache = TTLCache(maxsize=config.settings.AUTH_CACHE_MAXSIZE, ttl=config.settings.AUTH_CACHE_TTL_SECONDS)
+# user_id -> CurrentUser (id, username, est_actif, roles)
+_user_cache = TTLCache(maxsize=config.settings.AUTH_CACHE_MAXSIZE, ttl=config.settings.AUTH_CACHE_TTL_SECONDS)
+# Incrémenté à chaque invalidation : un chargement commencé avant une invalidation
+# ne doit pas remettre en cache un instantané périmé. L'incrément et la comparaison
+# suivie de l'écriture en cache sont faits sous `_user_lock` (threadpool + boucle d'événements).
+# Les caches sont propres à chaque worker : une désactivation n'invalide que le worker
+# qui l'a validée, les autres gardent l'ancien instantané jusqu'à AUTH_CACHE_TTL_SECONDS.
+_user_generation = 0
+_user_lock = threading.Lock()
+
+
+def invalidate_user(user_id: Optional[int] = None) -> None:
+    """ Invalide l'instantané d'un utilisateur (ou de tous si `user_id` est None). """
+    global _user_generation
+    with _user_lock:
+        _user_generation += 1
+        if user_id is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(user_id)
+
+
+def auth_cache_stats() -> dict:
+    """ Statistiques des caches d'authentification. """
+    return {"tokens": _token_cache.stats(), "users": _user_cache.stats()}
+
+
+# Toute modification validée d'un utilisateur ou de ses rôles (désactivation, changement
+# de username, attribution de rôle...) invalide les instantanés mis en cache.
+invalidation.on_commit(
+    ["utilisateur_sys", "utilisateur_role", "role"],
+    lambda tables: invalidate_user(),
+)
+
+
 def decode_access_token(token: str) -> TokenData:
     """
     Décode un token JWT et renvoie les données qu'il contient.
     Lève une HTTPException si le token est invalide ou expiré.
+    Le résultat est mis en cache jusqu'à l'expiration du token (au plus AUTH_CACHE_TTL_SECONDS).
     """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         # 1. Décodage du token en utilisant la clé secrète
         payload = jwt.decode(
@@ -96,8 +232,12 @@ def decode_access_token(token: str) -> TokenData:
                 detail="Token invalide : Données utilisateur manquantes.",
             )
         
-        # 3. Renvoie les données décodées
-        return TokenData(username=username, user_id=user_id)
+        # 3. Renvoie les données décodées (mises en cache jusqu'à l'expiration du token)
+        token_data = TokenData(username=username, user_id=user_id)
+        remaining = payload.get("exp", 0) - time.time()
+        if remaining > 0:
+            _token_cache.set(token, token_data, ttl=min(remaining, config.settings.AUTH_CACHE_TTL_SECONDS))
+        return token_data
 
     except JWTError:
         # Gère les erreurs de signature, d'expiration, ou de format
@@ -111,18 +251,35 @@ def decode_access_token(token: str) -> TokenData:
 # 1. Définit le schéma OAuth2 et le point de terminaison de token (pour la documentation)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="v1/users")
 
+def _load_current_user(user_id: int) -> Optional[CurrentUser]:
+    """ Charge l'instantané de l'utilisateur (une seule requête) dans une session dédiée. """
+    with SessionLocal() as db:
+        return user_repo.get_user_snapshot(db, user_id)
+
+
 async def get_current_active_user(
-    db: Session = Depends(get_db), 
     token: str = Depends(oauth2_scheme) # ⬅️ Récupère le token de l'en-tête
-) -> UtilisateurSys:
+) -> CurrentUser:
     
-    # 2. Décodage du token pour obtenir les claims
+    # 2. Décodage du token pour obtenir les claims (depuis le cache si possible)
     token_data = decode_access_token(token)
     
-    # 3. Récupération de l'utilisateur par son username
-    user = user_repo.get_user_by_username(db, username=token_data.username)
-    
+    # 3. Récupération de l'utilisateur : cache, sinon une requête exécutée hors de la boucle d'événements
+    user = _user_cache.get(token_data.user_id)
     if user is None:
+        with _user_lock:
+            generation = _user_generation
+        if AsyncSessionLocal is not None:
+            async with AsyncSessionLocal() as db:
+                user = await async_user_repo.get_user_snapshot(db, token_data.user_id)
+        else:
+            user = await run_in_threadpool(_load_current_user, token_data.user_id)
+        if user is not None:
+            with _user_lock:
+                if generation == _user_generation:
+                    _user_cache.set(user.id, user)
+    
+    if user is None or user.username != token_data.username:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Utilisateur introuvable.",
@@ -0,0 +1,161 @@
+"""
+Instrumentation SQL par requête HTTP et journal des requêtes lentes.
+
+Des écouteurs d'événements du moteur (`before/after_cursor_execute`) chronomètrent
+chaque instruction SQL. Pendant une requête HTTP, `SQLMetricsMiddleware` place un
+`RequestSQLStats` dans une ContextVar : les mesures (nombre d'instructions, temps
+total en base, instruction la plus lente) y sont cumulées, y compris depuis le
+threadpool des routes synchrones (Starlette y copie le contexte), puis renvoyées
+dans les en-têtes `Server-Timing` et `X-DB-Query-Count`.
+
+Journal structuré (une ligne JSON par événement, logger `app.sql`) :
+- `slow_query` : instruction plus lente que SLOW_QUERY_THRESHOLD_MS (aussi hors requête
+  HTTP, ex: tâches planifiées) ;
+- `slow_request` : requête HTTP dont le temps SQL total dépasse SLOW_REQUEST_SQL_THRESHOLD_MS
+  ou dont le nombre d'instructions dépasse SLOW_REQUEST_QUERY_COUNT (signe d'un N+1).
+Les paramètres des instructions ne sont jamais journalisés (données personnelles).
+"""
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+# Longueur maximale d'une instruction SQL dans le journal
+MAX_STATEMENT_LENGTH = 1000
+
+_TIMERS_KEY = "sql_metrics_started"
+
+
+@dataclass
+class RequestSQLStats:
+    """ Mesures SQL cumulées d'une requête HTTP. """
+    method: str = ""
+    path: str = ""
+    count: int = 0
+    total_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: Optional[str] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, statement: str, duration: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_time += duration
+            if duration > self.slowest_time:
+                self.slowest_time = duration
+                self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """ Valeur de l'en-tête Server-Timing (durées en millisecondes, ASCII uniquement). """
+        return (
+            f'db;desc="SQL x{self.count}";dur={self.total_time * 1000:.1f}, '
+            f'db-max;desc="SQL max";dur={self.slowest_time * 1000:.1f}'
+        )
+
+
+_current: ContextVar[Optional[RequestSQLStats]] = ContextVar("request_sql_stats", default=None)
+
+
+def current_stats() -> Optional[RequestSQLStats]:
+    """ Mesures de la requête HTTP en cours (None hors requête). """
+    return _current.get()
+
+
+def _truncate(statement: str) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= MAX_STATEMENT_LENGTH else statement[:MAX_STATEMENT_LENGTH] + "..."
+
+
+def _log(event_name: str, **fields) -> None:
+    logger.warning(json.dumps({"event": event_name, **fields}, ensure_ascii=False, default=str))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_TIMERS_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timers = conn.info.get(_TIMERS_KEY)
+    if not timers:
+        return
+    duration = time.perf_counter() - timers.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        _log(
+            "slow_query",
+            duration_ms=round(duration * 1000, 1),
+            statement=_truncate(statement),
+            executemany=executemany,
+            method=stats.method if stats else None,
+            path=stats.path if stats else None,
+        )
+
+
+def _handle_error(exception_context):
+    # L'instruction a échoué : son chronomètre ne sera jamais arrêté par after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(_TIMERS_KEY):
+        conn.info[_TIMERS_KEY].pop()
+
+
+def instrument(engine: Engine) -> None:
+    """ Installe les écouteurs sur un moteur synchrone (ou `async_engine.sync_engine`). """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class SQLMetricsMiddleware:
+    """ Middleware ASGI : mesures SQL de chaque requête HTTP, en-tête Server-Timing et journal des requêtes lentes. """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSQLStats(method=scope["method"], path=scope["path"])
+        token = _current.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                # Les réponses en flux (exports) envoient leurs en-têtes avant la fin des requêtes SQL
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                headers.append((b"x-db-query-count", str(stats.count).encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if (
+                stats.total_time * 1000 >= settings.SLOW_REQUEST_SQL_THRESHOLD_MS
+                or stats.count >= settings.SLOW_REQUEST_QUERY_COUNT
+            ):
+                _log(
+                    "slow_request",
+                    method=stats.method,
+                    path=stats.path,
+                    query_count=stats.count,
+                    db_time_ms=round(stats.total_time * 1000, 1),
+                    request_time_ms=round((time.perf_counter() - started) * 1000, 1),
+                    slowest_ms=round(stats.slowest_time * 1000, 1),
+                    slowest_statement=_truncate(stats.slowest_statement) if stats.slowest_statement else None,
+                )
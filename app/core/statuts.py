@@ -0,0 +1,26 @@
+"""
+Valeurs des colonnes `statut` (exemplaire, réservation, pénalité).
+
+Centralisées ici pour que les requêtes d'agrégation et les services de
+circulation utilisent exactement les mêmes libellés.
+"""
+
+# exemplaire.statut
+EXEMPLAIRE_DISPONIBLE = "Disponible"
+EXEMPLAIRE_EMPRUNTE = "Emprunté"
+EXEMPLAIRE_MIS_DE_COTE = "Mis de côté"
+
+# reservation.statut
+RESERVATION_EN_ATTENTE = "En attente"
+RESERVATION_MISE_DE_COTE = "Mise de côté"
+RESERVATION_HONOREE = "Honorée"
+RESERVATION_ANNULEE = "Annulée"
+RESERVATION_EXPIREE = "Expirée"
+
+# penalite.statut / penalite.motif
+PENALITE_IMPAYEE = "Impayée"
+PENALITE_PAYEE = "Payée"
+PENALITE_MOTIF_RETARD = "Retard"
+
+# Réservations comptées comme actives (file d'attente ou exemplaire mis de côté)
+RESERVATIONS_ACTIVES = (RESERVATION_EN_ATTENTE, RESERVATION_MISE_DE_COTE)
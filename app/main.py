@@ -1,18 +1,38 @@
 # Contenu du fichier app/main.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.v1 import auteurs, categories, editeurs, membres, documents, users  # Importe les objets APIRouter
+from app.api.v1 import auteurs, autocomplete, categories, editeurs, membres, documents, exports, statistiques, users, monitoring, transactions  # Importe les objets APIRouter
 
 # Importer les modèles pour s'assurer que SQLAlchemy a enregistré
 # toutes les classes mapped (évite les erreurs de relation non résolues)
 import app.models  # noqa: F401
 
+from app.core.config import settings
+from app.core.sql_metrics import SQLMetricsMiddleware
+from app.core.scheduler import scheduler
+from app.services import autocomplete_service, categorie_tree_service, scheduled_jobs
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """ Démarrage / arrêt : préchauffage des index en mémoire et tâches planifiées. """
+    autocomplete_service.warm_up()
+    categorie_tree_service.warm_up()
+    if settings.SCHEDULER_ENABLED:
+        scheduled_jobs.register_jobs(scheduler)
+        scheduler.start()
+    yield
+    await scheduler.stop()
+
 # 1. Initialisation de l'application
 app = FastAPI(
     title="API de Gestion de Bibliothèque",
     description="Backend pour le système de gestion des emprunts et du catalogue.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 origins = [
@@ -27,8 +47,13 @@ app.add_middleware(
     allow_credentials=True,            # ⬅️ Autoriser les cookies/headers d'authentification
     allow_methods=["*"],               # ⬅️ Autoriser TOUTES les méthodes (GET, POST, OPTIONS, etc.)
     allow_headers=["*"],               # ⬅️ Autoriser TOUS les en-têtes (y compris Content-Type, Authorization)
+    expose_headers=["Server-Timing", "X-DB-Query-Count"],
 )
 
+# Mesures SQL par requête : en-têtes Server-Timing / X-DB-Query-Count et journal des requêtes lentes
+if settings.SQL_METRICS_ENABLED:
+    app.add_middleware(SQLMetricsMiddleware)
+
 # 2. Définition du premier point de terminaison (endpoint)
 @app.get("/")
 def read_root():
@@ -43,4 +68,9 @@ app.include_router(documents.router, prefix="/api/v1/documents", tags=["Document
 app.include_router(users.router, prefix="/api/v1/users", tags=["Utilisateurs"])
 app.include_router(auteurs.router, prefix="/api/v1/auteurs", tags=["Auteurs"])
 app.include_router(editeurs.router, prefix="/api/v1/editeurs", tags=["Éditeurs"])
-app.include_router(categories.router, prefix="/api/v1/categories", tags=["Catégories"])
\ No newline at end of file
+app.include_router(categories.router, prefix="/api/v1/categories", tags=["Catégories"])
+app.include_router(transactions.router, prefix="/api/v1/transactions", tags=["Transactions"])
+app.include_router(exports.router, prefix="/api/v1/exports", tags=["Exports"])
+app.include_router(statistiques.router, prefix="/api/v1/statistiques", tags=["Statistiques"])
+app.include_router(autocomplete.router, prefix="/api/v1/autocomplete", tags=["Autocomplétion"])
+app.include_router(monitoring.router, prefix="/api/v1/monitoring", tags=["Supervision"])
\ No newline at end of file
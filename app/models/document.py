@@ -1,7 +1,8 @@
 from typing import Optional
 from app.core.database import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Boolean, Date, DateTime, ForeignKeyConstraint, Integer, Numeric, PrimaryKeyConstraint, String, Text, UniqueConstraint, func, text
+from sqlalchemy import Boolean, Date, DateTime, ForeignKeyConstraint, Index, Integer, Numeric, PrimaryKeyConstraint, String, Text, UniqueConstraint, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 import datetime
 from app.models.emprunt import Reservation
 from app.models.utilisateur import UtilisateurSys
@@ -11,6 +12,8 @@ class Auteur(Base):
     __tablename__ = 'auteur'
     __table_args__ = (
         PrimaryKeyConstraint('id', name='auteur_pkey'),
+        Index('auteur_nom_trgm_idx', 'nom', postgresql_using='gin', postgresql_ops={'nom': 'gin_trgm_ops'}),
+        Index('auteur_prenoms_trgm_idx', 'prenoms', postgresql_using='gin', postgresql_ops={'prenoms': 'gin_trgm_ops'}),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -29,7 +32,9 @@ class Categorie(Base):
     __table_args__ = (
         ForeignKeyConstraint(['parent_categorie_id'], ['categorie.id'], name='categorie_parent_categorie_id_fkey'),
         PrimaryKeyConstraint('id', name='categorie_pkey'),
-        UniqueConstraint('libelle', name='categorie_libelle_key')
+        UniqueConstraint('libelle', name='categorie_libelle_key'),
+        # Parcours récursif des sous-catégories (CTE, arbre en mémoire froid)
+        Index('categorie_parent_categorie_id_idx', 'parent_categorie_id'),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -48,7 +53,8 @@ class Editeur(Base):
     __tablename__ = 'editeur'
     __table_args__ = (
         PrimaryKeyConstraint('id', name='editeur_pkey'),
-        UniqueConstraint('libelle', name='editeur_libelle_key')
+        UniqueConstraint('libelle', name='editeur_libelle_key'),
+        Index('editeur_libelle_trgm_idx', 'libelle', postgresql_using='gin', postgresql_ops={'libelle': 'gin_trgm_ops'}),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -67,7 +73,15 @@ class Document(Base):
         ForeignKeyConstraint(['editeur_id'], ['editeur.id'], name='document_editeur_id_fkey'),
         ForeignKeyConstraint(['utilisateur_creation_id'], ['utilisateur_sys.id'], name='document_utilisateur_creation_id_fkey'),
         PrimaryKeyConstraint('id', name='document_pkey'),
-        UniqueConstraint('isbn', name='document_isbn_key')
+        UniqueConstraint('isbn', name='document_isbn_key'),
+        Index('document_search_vector_idx', 'search_vector', postgresql_using='gin'),
+        Index('document_titre_trgm_idx', 'titre', postgresql_using='gin', postgresql_ops={'titre': 'gin_trgm_ops'}),
+        # Filtre par sous-arbre de catégories et nombre de documents par catégorie
+        Index('document_categorie_id_idx', 'categorie_id', 'id'),
+        # Liste des documents : filtre par éditeur, tris keyset (titre, id) et (année, id)
+        Index('document_editeur_id_idx', 'editeur_id', 'id'),
+        Index('document_titre_idx', 'titre', 'id'),
+        Index('document_annee_tri_idx', text('coalesce(annee_publication, 0)'), 'id'),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -79,6 +93,8 @@ class Document(Base):
     isbn: Mapped[Optional[str]] = mapped_column(String(13))
     resume: Mapped[Optional[str]] = mapped_column(Text)
     date_modification: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime, nullable=False, onupdate=func.now())
+    # Maintenu par triggers PostgreSQL (migrations/0001_document_search.sql) ; jamais chargé par défaut
+    search_vector: Mapped[Optional[str]] = mapped_column(Text().with_variant(TSVECTOR(), 'postgresql'), deferred=True)
 
     categorie: Mapped['Categorie'] = relationship('Categorie', back_populates='document')
     editeur: Mapped['Editeur'] = relationship('Editeur', back_populates='document')
@@ -93,7 +109,9 @@ class DocumentAuteur(Base):
     __table_args__ = (
         ForeignKeyConstraint(['auteur_id'], ['auteur.id'], name='document_auteur_auteur_id_fkey'),
         ForeignKeyConstraint(['document_id'], ['document.id'], name='document_auteur_document_id_fkey'),
-        PrimaryKeyConstraint('document_id', 'auteur_id', name='document_auteur_pkey')
+        PrimaryKeyConstraint('document_id', 'auteur_id', name='document_auteur_pkey'),
+        # Documents d'un auteur (la clé primaire ne sert que la recherche par document)
+        Index('document_auteur_auteur_id_idx', 'auteur_id', 'document_id'),
     )
 
     document_id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -111,7 +129,11 @@ class Exemplaire(Base):
         ForeignKeyConstraint(['emplacement_id'], ['emplacement.id'], name='exemplaire_emplacement_id_fkey'),
         ForeignKeyConstraint(['utilisateur_ajout_id'], ['utilisateur_sys.id'], name='exemplaire_utilisateur_ajout_id_fkey'),
         PrimaryKeyConstraint('id', name='exemplaire_pkey'),
-        UniqueConstraint('numero_inventaire', name='exemplaire_numero_inventaire_key')
+        UniqueConstraint('numero_inventaire', name='exemplaire_numero_inventaire_key'),
+        Index('exemplaire_document_id_idx', 'document_id', 'statut'),
+        Index('exemplaire_mis_de_cote_idx', 'document_id',
+              postgresql_where=text("statut = 'Mis de côté'"),
+              sqlite_where=text("statut = 'Mis de côté'")),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
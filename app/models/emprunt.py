@@ -2,7 +2,7 @@ from typing import Optional
 import datetime
 import decimal
 from app.core.database import Base
-from sqlalchemy import Boolean, Date, DateTime, ForeignKeyConstraint, Integer, Numeric, PrimaryKeyConstraint, String, Text, UniqueConstraint, text
+from sqlalchemy import Boolean, Date, DateTime, ForeignKeyConstraint, Index, Integer, Numeric, PrimaryKeyConstraint, String, Text, UniqueConstraint, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -11,7 +11,20 @@ class Reservation(Base):
     __table_args__ = (
         ForeignKeyConstraint(['document_id'], ['document.id'], name='reservation_document_id_fkey'),
         ForeignKeyConstraint(['membre_id'], ['membre.id'], name='reservation_membre_id_fkey'),
-        PrimaryKeyConstraint('id', name='reservation_pkey')
+        PrimaryKeyConstraint('id', name='reservation_pkey'),
+        Index('reservation_document_id_statut_idx', 'document_id', 'statut'),
+        # File d'attente FIFO par document : tête de file et rang en parcours d'index
+        Index('reservation_file_attente_idx', 'document_id', 'date_reservation', 'id',
+              postgresql_where=text("statut = 'En attente'"),
+              sqlite_where=text("statut = 'En attente'")),
+        # Mises de côté à expirer (balayage périodique)
+        Index('reservation_mise_de_cote_expiration_idx', 'date_expiration_mise_de_cote',
+              postgresql_where=text("statut = 'Mise de côté'"),
+              sqlite_where=text("statut = 'Mise de côté'")),
+        # Une seule réservation active par membre et par document
+        Index('reservation_active_membre_document_idx', 'membre_id', 'document_id', unique=True,
+              postgresql_where=text("statut IN ('En attente', 'Mise de côté')"),
+              sqlite_where=text("statut IN ('En attente', 'Mise de côté')")),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -34,7 +47,22 @@ class Emprunt(Base):
         ForeignKeyConstraint(['membre_id'], ['membre.id'], name='emprunt_membre_id_fkey'),
         ForeignKeyConstraint(['utilisateur_emprunt_id'], ['utilisateur_sys.id'], name='emprunt_utilisateur_emprunt_id_fkey'),
         ForeignKeyConstraint(['utilisateur_retour_id'], ['utilisateur_sys.id'], name='emprunt_utilisateur_retour_id_fkey'),
-        PrimaryKeyConstraint('id', name='emprunt_pkey')
+        PrimaryKeyConstraint('id', name='emprunt_pkey'),
+        # Un seul emprunt en cours (retour non enregistré) par exemplaire
+        Index('emprunt_en_cours_exemplaire_idx', 'exemplaire_id', unique=True,
+              postgresql_where=text('date_retour_reelle IS NULL'),
+              sqlite_where=text('date_retour_reelle IS NULL')),
+        Index('emprunt_date_retour_prevue_idx', 'date_retour_prevue'),
+        # Historique des emprunts d'un membre / d'un exemplaire (et contrôle des clés étrangères)
+        Index('emprunt_membre_id_idx', 'membre_id', 'date_emprunt'),
+        Index('emprunt_exemplaire_id_idx', 'exemplaire_id', 'date_emprunt'),
+        # Fenêtres d'agrégation des statistiques de circulation (statistique_service)
+        Index('emprunt_date_emprunt_idx', 'date_emprunt'),
+        Index('emprunt_date_retour_reelle_idx', 'date_retour_reelle'),
+        # Emprunts en cours d'un membre (quota au prêt, compte adhérent)
+        Index('emprunt_en_cours_membre_idx', 'membre_id',
+              postgresql_where=text('date_retour_reelle IS NULL'),
+              sqlite_where=text('date_retour_reelle IS NULL')),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -60,7 +88,15 @@ class Penalite(Base):
         ForeignKeyConstraint(['emprunt_id'], ['emprunt.id'], name='penalite_emprunt_id_fkey'),
         ForeignKeyConstraint(['membre_id'], ['membre.id'], name='penalite_membre_id_fkey'),
         ForeignKeyConstraint(['utilisateur_creation_id'], ['utilisateur_sys.id'], name='penalite_utilisateur_creation_id_fkey'),
-        PrimaryKeyConstraint('id', name='penalite_pkey')
+        PrimaryKeyConstraint('id', name='penalite_pkey'),
+        # Une seule pénalité de retard par emprunt (recalculée chaque jour, voir penalite_service)
+        Index('penalite_retard_emprunt_idx', 'emprunt_id', unique=True,
+              postgresql_where=text("motif = 'Retard'"),
+              sqlite_where=text("motif = 'Retard'")),
+        # Solde des pénalités impayées d'un membre (compte adhérent)
+        Index('penalite_impayee_membre_idx', 'membre_id',
+              postgresql_where=text("statut = 'Impayée'"),
+              sqlite_where=text("statut = 'Impayée'")),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -31,6 +31,11 @@ class Membre(Base):
     emprunt: Mapped[list['Emprunt']] = relationship('Emprunt', back_populates='membre')
     penalite: Mapped[list['Penalite']] = relationship('Penalite', back_populates='membre')
 
+    @property
+    def type_membre_libelle(self) -> Optional[str]:
+        """ Libellé du type de membre (chargé par jointure dans membre_repo, sans requête supplémentaire). """
+        return self.type_membre.libelle if self.type_membre else None
+
 
 
 class TypeMembre(Base):
@@ -0,0 +1,58 @@
+import datetime
+
+from app.core.database import Base
+
+from sqlalchemy import Date, DateTime, Index, Integer, PrimaryKeyConstraint, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+# Tables d'agrégats de la circulation, alimentées par `statistique_service.refresh_rollups`
+# (tâche planifiée) et reconstruites par `python -m app.cli.backfill_statistics`.
+# Aucune clé étrangère : les agrégats survivent à la suppression d'un document ou d'un type.
+
+class StatCirculationJour(Base):
+    __tablename__ = 'stat_circulation_jour'
+    __table_args__ = (
+        PrimaryKeyConstraint('jour', 'type_membre_id', name='stat_circulation_jour_pkey'),
+    )
+
+    jour: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    type_membre_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    emprunts: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text('0'))
+    retours: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text('0'))
+
+
+class StatEmpruntCategorieJour(Base):
+    __tablename__ = 'stat_emprunt_categorie_jour'
+    __table_args__ = (
+        PrimaryKeyConstraint('jour', 'categorie_id', 'editeur_id', name='stat_emprunt_categorie_jour_pkey'),
+    )
+
+    jour: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    categorie_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    editeur_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    emprunts: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text('0'))
+
+
+class StatEmpruntDocument(Base):
+    __tablename__ = 'stat_emprunt_document'
+    __table_args__ = (
+        PrimaryKeyConstraint('document_id', name='stat_emprunt_document_pkey'),
+        # Classement des documents les plus empruntés sans tri
+        Index('stat_emprunt_document_emprunts_idx', text('emprunts DESC'), 'document_id'),
+    )
+
+    document_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    emprunts: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text('0'))
+    dernier_emprunt: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
+
+
+class StatWatermark(Base):
+    __tablename__ = 'stat_watermark'
+    __table_args__ = (
+        PrimaryKeyConstraint('nom', name='stat_watermark_pkey'),
+    )
+
+    # Borne (exclue) jusqu'à laquelle les emprunts et retours ont été agrégés
+    nom: Mapped[str] = mapped_column(String(50), primary_key=True)
+    valeur: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
@@ -0,0 +1,33 @@
+from typing import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.document import Document
+from app.repositories import document_repo
+
+
+# Variantes asynchrones des lectures de `document_repo` (mêmes requêtes SELECT)
+
+async def get_document_by_id(db: AsyncSession, document_id: int) -> Document | None:
+    """ Récupère un document par son ID. """
+    result = await db.execute(document_repo.document_by_id_stmt(document_id))
+    return result.scalar_one_or_none()
+
+async def get_all_documents(db: AsyncSession, limit: int, after: Sequence | None = None, criteria: Sequence = (), tri: str = "id") -> list[Document]:
+    """ Récupère une page de documents filtrée et triée, après le curseur `after`. """
+    result = await db.execute(document_repo.documents_page_stmt(limit, after, criteria, tri))
+    return list(result.scalars())
+
+
+async def get_availability(db: AsyncSession, document_ids: list[int]) -> dict[int, tuple[int, int, int]]:
+    """ Disponibilité de plusieurs documents en une requête : {id: (exemplaires, disponibles, réservations)}. """
+    if not document_ids:
+        return {}
+    result = await db.execute(document_repo.availability_stmt(document_ids))
+    return {row[0]: (row[1], row[2], row[3]) for row in result}
+
+
+async def get_versions(db: AsyncSession, stmt) -> list[tuple]:
+    """ Exécute une requête de versions (ETag) et renvoie les lignes brutes. """
+    result = await db.execute(stmt)
+    return [tuple(row) for row in result]
@@ -0,0 +1,35 @@
+import decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.membre import Membre
+from . import membre_repo
+
+
+# Variantes asynchrones des lectures de `membre_repo` (type de membre chargé par jointure)
+
+async def get_membre_by_id(db: AsyncSession, membre_id: int) -> Membre | None:
+    """ Récupère un membre (et son type) par son ID. """
+    result = await db.execute(membre_repo.membre_by_id_stmt(membre_id))
+    return result.scalar_one_or_none()
+
+async def get_members(db: AsyncSession, limit: int, after_id: int | None = None) -> list[Membre]:
+    """ Récupère une page de membres (triés par ID) après le curseur `after_id`, avec leur type. """
+    result = await db.execute(membre_repo.members_page_stmt(limit, after_id))
+    return list(result.scalars())
+
+
+async def get_versions(db: AsyncSession, stmt) -> list[tuple]:
+    """ Exécute une requête de versions (ETag) et renvoie les lignes brutes. """
+    result = await db.execute(stmt)
+    return [tuple(row) for row in result]
+
+
+async def get_account(db: AsyncSession, membre_id: int) -> tuple[Membre, decimal.Decimal, list, list] | None:
+    """ Membre, solde dû, emprunts en cours et réservations actives (trois requêtes). """
+    row = (await db.execute(membre_repo.account_stmt(membre_id))).first()
+    if row is None:
+        return None
+    loans = (await db.execute(membre_repo.current_loans_stmt(membre_id))).all()
+    reservations = (await db.execute(membre_repo.active_reservations_stmt(membre_id))).all()
+    return row[0], row[1], loans, reservations
@@ -0,0 +1,19 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.utilisateur import UtilisateurSys
+from ..schemas.user_schema import CurrentUser
+from . import user_repo
+
+
+# Variantes asynchrones des lectures de `user_repo`
+
+async def get_user_by_username(db: AsyncSession, username: str) -> UtilisateurSys | None:
+    """ Récupère un utilisateur par son nom d'utilisateur. """
+    result = await db.execute(select(UtilisateurSys).where(UtilisateurSys.username == username))
+    return result.scalar_one_or_none()
+
+async def get_user_snapshot(db: AsyncSession, user_id: int) -> CurrentUser | None:
+    """ Récupère l'instantané d'authentification d'un utilisateur en une requête. """
+    result = await db.execute(user_repo.user_snapshot_stmt(user_id))
+    return user_repo.snapshot_from_rows(result.all())
@@ -1,4 +1,6 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from ..core.pagination import keyset_query
 from ..models.document import Auteur
 from ..schemas.auteur_schema import AuteurCreateSchema as AuteurCreate
 
@@ -25,9 +27,15 @@ def get_auteur_by_name(db: Session, nom: str) -> Auteur | None:
     """ Récupère un auteur par son nom. """
     return db.query(Auteur).filter(Auteur.nom == nom).first()
 
-def get_all_auteurs(db: Session) -> list[Auteur]:
-    """ Récupère tous les auteurs. """
-    return db.query(Auteur).all()
+def get_existing_auteur_ids(db: Session, auteur_ids: set[int]) -> set[int]:
+    """ Renvoie, parmi `auteur_ids`, les IDs d'auteurs existants (une seule requête IN). """
+    if not auteur_ids:
+        return set()
+    return set(db.scalars(select(Auteur.id).where(Auteur.id.in_(auteur_ids))))
+
+def get_all_auteurs(db: Session, limit: int, after_id: int | None = None) -> list[Auteur]:
+    """ Récupère une page d'auteurs (triés par ID) après le curseur `after_id`. """
+    return keyset_query(db.query(Auteur), Auteur.id, limit, after_id).all()
 
 
 def delete_auteur(db: Session, auteur_id: int) -> Auteur | None:
@@ -37,4 +45,15 @@ def delete_auteur(db: Session, auteur_id: int) -> Auteur | None:
         return None
     db.delete(auteur_to_delete)
     db.commit()
-    return auteur_to_delete
\ No newline at end of file
+    return auteur_to_delete
+
+
+def get_auteur_version(db: Session, auteur_id: int) -> tuple | None:
+    """ Version d'un auteur pour son ETag : (id, date_modification). """
+    row = db.execute(select(Auteur.id, Auteur.date_modification).where(Auteur.id == auteur_id)).first()
+    return tuple(row) if row else None
+
+def get_auteurs_page_versions(db: Session, limit: int, after_id: int | None = None) -> list[tuple]:
+    """ Versions (id, date_modification) d'une page d'auteurs, même pagination que `get_all_auteurs`. """
+    stmt = keyset_query(select(Auteur.id, Auteur.date_modification), Auteur.id, limit, after_id)
+    return [tuple(row) for row in db.execute(stmt)]
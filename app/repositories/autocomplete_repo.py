@@ -0,0 +1,48 @@
+from typing import Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.document import Auteur, Document, Editeur
+
+
+def iter_suggestion_rows(db: Session, chunk_size: int = 5000) -> Iterator[tuple[str, int, str]]:
+    """ Parcourt par blocs les libellés proposés en autocomplétion : (type, id, libellé). """
+    for document_id, titre in db.execute(select(Document.id, Document.titre).execution_options(yield_per=chunk_size)):
+        yield "document", document_id, titre
+    for auteur_id, prenoms, nom in db.execute(select(Auteur.id, Auteur.prenoms, Auteur.nom).execution_options(yield_per=chunk_size)):
+        yield "auteur", auteur_id, " ".join(filter(None, [prenoms, nom]))
+    for editeur_id, libelle in db.execute(select(Editeur.id, Editeur.libelle).execution_options(yield_per=chunk_size)):
+        yield "editeur", editeur_id, libelle
+
+
+def _contains(column, query: str):
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+
+def search_suggestions(db: Session, query: str, limit: int, types: set[str] | None = None) -> list[tuple[str, int, str]]:
+    """
+    Recherche directe en base (index pg_trgm, migrations/0002_autocomplete_trigram.sql),
+    utilisée tant que l'index en mémoire n'est pas prêt. Seules les tables des `types`
+    demandés (tous si None) sont interrogées.
+    """
+    suggestions: list[tuple[str, int, str]] = []
+    if not types or "document" in types:
+        documents = db.execute(
+            select(Document.id, Document.titre).where(_contains(Document.titre, query)).limit(limit)
+        ).all()
+        suggestions += [("document", row.id, row.titre) for row in documents]
+    if not types or "auteur" in types:
+        auteurs = db.execute(
+            select(Auteur.id, Auteur.prenoms, Auteur.nom)
+            .where(_contains(Auteur.nom, query) | _contains(Auteur.prenoms, query))
+            .limit(limit)
+        ).all()
+        suggestions += [("auteur", row.id, " ".join(filter(None, [row.prenoms, row.nom]))) for row in auteurs]
+    if not types or "editeur" in types:
+        editeurs = db.execute(
+            select(Editeur.id, Editeur.libelle).where(_contains(Editeur.libelle, query)).limit(limit)
+        ).all()
+        suggestions += [("editeur", row.id, row.libelle) for row in editeurs]
+    return suggestions
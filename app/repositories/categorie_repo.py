@@ -1,5 +1,7 @@
+from sqlalchemy import Select, func, select
 from sqlalchemy.orm import Session
-from ..models.document import Categorie
+from ..core.pagination import keyset_query
+from ..models.document import Categorie, Document
 from ..schemas.categorie_schema import CategorieSchema, CategorieCreateSchema as CategorieCreate
 
 def create_categorie(db: Session, categorie: CategorieCreate) -> Categorie:
@@ -21,9 +23,9 @@ def get_categorie_by_name(db: Session, nom: str) -> Categorie | None:
     """ Récupère une catégorie par son nom. """
     return db.query(Categorie).filter(Categorie.nom == nom).first()
 
-def get_all_categories(db: Session) -> list[Categorie]:
-    """ Récupère toutes les catégories. """
-    return db.query(Categorie).all()
+def get_all_categories(db: Session, limit: int, after_id: int | None = None) -> list[Categorie]:
+    """ Récupère une page de catégories (triées par ID) après le curseur `after_id`. """
+    return keyset_query(db.query(Categorie), Categorie.id, limit, after_id).all()
 
 def delete_categorie(db: Session, categorie_id: int) -> Categorie | None:
     """ Supprime une catégorie par son ID. """
@@ -34,3 +36,37 @@ def delete_categorie(db: Session, categorie_id: int) -> Categorie | None:
     db.commit()
     return categorie_to_delete
 
+
+def get_categorie_version(db: Session, categorie_id: int) -> tuple | None:
+    """ Version d'une catégorie pour son ETag : (id, date_modification). """
+    row = db.execute(select(Categorie.id, Categorie.date_modification).where(Categorie.id == categorie_id)).first()
+    return tuple(row) if row else None
+
+def get_categories_page_versions(db: Session, limit: int, after_id: int | None = None) -> list[tuple]:
+    """ Versions (id, date_modification) d'une page de catégories, même pagination que `get_all_categories`. """
+    stmt = keyset_query(select(Categorie.id, Categorie.date_modification), Categorie.id, limit, after_id)
+    return [tuple(row) for row in db.execute(stmt)]
+
+
+# --- Arbre des catégories (voir categorie_tree_service) ---
+
+def get_tree_rows(db: Session) -> list[tuple[int, str, int | None]]:
+    """ Toutes les catégories sous forme (id, libellé, parent_categorie_id), en une requête. """
+    return [tuple(row) for row in db.execute(select(Categorie.id, Categorie.libelle, Categorie.parent_categorie_id))]
+
+def count_documents_by_categorie(db: Session) -> dict[int, int]:
+    """ Nombre de documents rattachés directement à chaque catégorie (servi par document_categorie_id_idx). """
+    rows = db.execute(select(Document.categorie_id, func.count()).group_by(Document.categorie_id))
+    return {categorie_id: count for categorie_id, count in rows}
+
+def subtree_ids_stmt(categorie_id: int) -> Select:
+    """
+    SELECT récursif (CTE) des IDs d'une catégorie et de toutes ses sous-catégories,
+    utilisé tant que l'arbre en mémoire n'est pas construit. UNION (et non UNION ALL) :
+    la récursion s'arrête même si les données contiennent un cycle.
+    """
+    sous_categories = select(Categorie.id).where(Categorie.id == categorie_id).cte("sous_categories", recursive=True)
+    sous_categories = sous_categories.union(
+        select(Categorie.id).join(sous_categories, Categorie.parent_categorie_id == sous_categories.c.id)
+    )
+    return select(sous_categories.c.id)
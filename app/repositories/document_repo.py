@@ -1,20 +1,188 @@
 from datetime import datetime
-from typing import List
+from typing import Collection, List, Sequence
 
+from sqlalchemy import ColumnElement, Select, and_, cast, exists, func, insert, literal_column, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.orm import Session
 
-from app.repositories import auteur_repo
-from app.models.document import Document, DocumentAuteur
+from app.core import statuts
+from app.core.pagination import composite_keyset_query
+from app.repositories import auteur_repo, categorie_repo
+from app.core.config import settings
+from app.models.document import Auteur, Categorie, Document, DocumentAuteur, Editeur, Exemplaire
+from app.models.emprunt import Emprunt, Reservation
 from app.schemas.document_schema import DocumentCreate, DocumentUpdate
 
 
+# Requêtes de lecture partagées avec `async_document_repo` (mêmes SELECT en mode sync et async)
+def document_by_id_stmt(document_id: int) -> Select:
+    """ SELECT d'un document par son ID. """
+    return select(Document).where(Document.id == document_id)
+
+# Tris de la liste des documents : colonnes de la clé keyset, l'id en dernier rend l'ordre total.
+# Chacun est servi par un index composite (voir les index du modèle Document).
+# Année inconnue triée comme 0 : la clé n'est jamais NULL (une comparaison de lignes avec NULL exclurait la ligne).
+# 0 en littéral SQL : un paramètre lié ($1) empêcherait PostgreSQL de reconnaître
+# l'expression de l'index document_annee_tri_idx (coalesce(annee_publication, 0)).
+ANNEE_TRI = func.coalesce(Document.annee_publication, literal_column("0"))
+DOCUMENT_SORT_COLUMNS = {
+    "id": (Document.id,),
+    "titre": (Document.titre, Document.id),
+    "annee_publication": (ANNEE_TRI, Document.id),
+}
+
+
+def _paginate(stmt: Select, limit: int, after: Sequence | None, tri: str) -> Select:
+    return composite_keyset_query(
+        stmt, DOCUMENT_SORT_COLUMNS[tri.lstrip("-")], limit, after, descending=tri.startswith("-"),
+    )
+
+def documents_page_stmt(limit: int, after: Sequence | None = None, criteria: Sequence = (), tri: str = "id") -> Select:
+    """ SELECT d'une page de documents filtrée par `criteria`, triée par `tri`, après le curseur `after` (valeurs de la clé). """
+    return _paginate(select(Document).where(*criteria), limit, after, tri)
+
+
+def document_version_stmt(document_id: int) -> Select:
+    """ Version d'un document pour son ETag : (id, date_modification). """
+    return select(Document.id, Document.date_modification).where(Document.id == document_id)
+
+def documents_page_versions_stmt(limit: int, after: Sequence | None = None, criteria: Sequence = (), tri: str = "id") -> Select:
+    """ Versions (id, date_modification) d'une page de documents, même pagination, tri et filtres que `documents_page_stmt`. """
+    return _paginate(select(Document.id, Document.date_modification).where(*criteria), limit, after, tri)
+
+
+def in_categories(categorie_ids: Collection[int]) -> ColumnElement[bool]:
+    """ Filtre sur un ensemble de catégories (sous-arbre résolu par l'arbre en mémoire) : un seul IN. """
+    return Document.categorie_id.in_(sorted(categorie_ids))
+
+def in_categorie_subtree(categorie_id: int) -> ColumnElement[bool]:
+    """ Filtre sur une catégorie et ses sous-catégories par CTE récursive (arbre en mémoire froid). """
+    return Document.categorie_id.in_(categorie_repo.subtree_ids_stmt(categorie_id))
+
+def has_auteur(auteur_id: int) -> ColumnElement[bool]:
+    """ Filtre sur un auteur (semi-jointure servie par document_auteur_auteur_id_idx). """
+    return exists().where(DocumentAuteur.document_id == Document.id, DocumentAuteur.auteur_id == auteur_id)
+
+def published_between(annee_min: int | None, annee_max: int | None) -> ColumnElement[bool]:
+    """ Filtre sur l'année de publication (bornes incluses), exprimé sur la clé de tri indexée. """
+    clauses = [Document.annee_publication.is_not(None)]
+    if annee_min is not None:
+        clauses.append(ANNEE_TRI >= annee_min)
+    if annee_max is not None:
+        clauses.append(ANNEE_TRI <= annee_max)
+    return and_(*clauses)
+
+
+def availability_stmt(document_ids: list[int]) -> Select:
+    """
+    SELECT groupé de la disponibilité d'une page de documents :
+    (document_id, exemplaires, exemplaires disponibles, réservations actives).
+    Un exemplaire est disponible si son statut l'indique et qu'aucun emprunt n'est en cours.
+    """
+    emprunt_en_cours = exists().where(
+        Emprunt.exemplaire_id == Exemplaire.id,
+        Emprunt.date_retour_reelle.is_(None),
+    )
+    exemplaires = (
+        select(
+            Exemplaire.document_id,
+            func.count(Exemplaire.id).label("total"),
+            func.count(Exemplaire.id).filter(
+                and_(Exemplaire.statut == statuts.EXEMPLAIRE_DISPONIBLE, ~emprunt_en_cours)
+            ).label("disponibles"),
+        )
+        .where(Exemplaire.document_id.in_(document_ids))
+        .group_by(Exemplaire.document_id)
+        .subquery()
+    )
+    reservations = (
+        select(Reservation.document_id, func.count(Reservation.id).label("actives"))
+        .where(
+            Reservation.document_id.in_(document_ids),
+            Reservation.statut.in_(statuts.RESERVATIONS_ACTIVES),
+        )
+        .group_by(Reservation.document_id)
+        .subquery()
+    )
+    return (
+        select(
+            Document.id,
+            func.coalesce(exemplaires.c.total, 0),
+            func.coalesce(exemplaires.c.disponibles, 0),
+            func.coalesce(reservations.c.actives, 0),
+        )
+        .outerjoin(exemplaires, exemplaires.c.document_id == Document.id)
+        .outerjoin(reservations, reservations.c.document_id == Document.id)
+        .where(Document.id.in_(document_ids))
+    )
+
+
 def get_document_by_id(db: Session, document_id: int) -> Document | None:
     """ Récupère un document par son ID. """
-    return db.query(Document).filter(Document.id == document_id).first()
+    return db.execute(document_by_id_stmt(document_id)).scalar_one_or_none()
+
+def get_all_documents(db: Session, limit: int, after: Sequence | None = None, criteria: Sequence = (), tri: str = "id") -> list[Document]:
+    """ Récupère une page de documents filtrée et triée, après le curseur `after`. """
+    return list(db.execute(documents_page_stmt(limit, after, criteria, tri)).scalars())
+
+
+def get_versions(db: Session, stmt: Select) -> list[tuple]:
+    """ Exécute une requête de versions (ETag) et renvoie les lignes brutes. """
+    return [tuple(row) for row in db.execute(stmt)]
 
-def get_all_documents(db: Session) -> list[Document]:
-    """ Récupère tous les documents. """
-    return db.query(Document).all()
+
+def get_availability(db: Session, document_ids: list[int]) -> dict[int, tuple[int, int, int]]:
+    """ Disponibilité de plusieurs documents en une requête : {id: (exemplaires, disponibles, réservations)}. """
+    if not document_ids:
+        return {}
+    return {row[0]: (row[1], row[2], row[3]) for row in db.execute(availability_stmt(document_ids))}
+
+
+def get_documents_by_ids(db: Session, document_ids: list[int]) -> list[Document]:
+    """ Récupère plusieurs documents en une requête IN (ordre non garanti). """
+    if not document_ids:
+        return []
+    return list(db.scalars(select(Document).where(Document.id.in_(document_ids))))
+
+
+def search_documents(db: Session, query: str, limit: int) -> list[tuple[Document, float]]:
+    """
+    Recherche plein texte PostgreSQL : `search_vector @@ websearch_to_tsquery(...)`
+    (index GIN), classé par ts_rank_cd.
+    """
+    ts_query = func.websearch_to_tsquery(cast(settings.SEARCH_TEXT_CONFIG, REGCONFIG), query)
+    score = func.ts_rank_cd(Document.search_vector, ts_query).label("score")
+    stmt = (
+        select(Document, score)
+        .where(Document.search_vector.op("@@")(ts_query))
+        .order_by(score.desc(), Document.id)
+        .limit(limit)
+    )
+    return [(row[0], row[1]) for row in db.execute(stmt)]
+
+
+def iter_search_fields(db: Session, chunk_size: int = 2000):
+    """
+    Parcourt le catalogue par blocs pour construire l'index de recherche en mémoire :
+    (id, titre, résumé, libellé catégorie, libellé éditeur, noms des auteurs).
+    """
+    auteurs_by_document: dict[int, list[str]] = {}
+    auteur_rows = db.execute(
+        select(DocumentAuteur.document_id, Auteur.prenoms, Auteur.nom)
+        .join(Auteur, Auteur.id == DocumentAuteur.auteur_id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for document_id, prenoms, nom in auteur_rows:
+        auteurs_by_document.setdefault(document_id, []).append(" ".join(filter(None, [prenoms, nom])))
+
+    document_rows = db.execute(
+        select(Document.id, Document.titre, Document.resume, Categorie.libelle, Editeur.libelle)
+        .outerjoin(Categorie, Categorie.id == Document.categorie_id)
+        .outerjoin(Editeur, Editeur.id == Document.editeur_id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for document_id, titre, resume, categorie, editeur in document_rows:
+        yield document_id, titre, resume, categorie, editeur, " ".join(auteurs_by_document.get(document_id, []))
 
 
 def get_document_by_title(db: Session, title: str) -> Document | None:
@@ -28,12 +196,13 @@ def create_document(db: Session, document_data: DocumentCreate, utilisateur_crea
     - `auteur_ids` dans `document_data` peut être None ou une liste d'entiers.
     - `utilisateur_creation_id` doit provenir du contexte d'authentification (fourni par l'appelant).
     """
-    # Valider que tous les auteurs existent
-    auteur_ids: List[int] = document_data.auteur_ids or []
-    for aid in auteur_ids:
-        if not auteur_repo.get_auteur_by_id(db, aid):
-            raise ValueError(f"Auteur non trouvé avec l'ID {aid}.")
+    # Valider que tous les auteurs existent (une seule requête IN, doublons ignorés)
+    auteur_ids: List[int] = list(dict.fromkeys(document_data.auteur_ids or []))
+    missing = set(auteur_ids) - auteur_repo.get_existing_auteur_ids(db, set(auteur_ids))
+    if missing:
+        raise ValueError(f"Auteur(s) non trouvé(s) avec l'ID {sorted(missing)}.")
 
+    now = datetime.now()
     db_document = Document(
         titre=document_data.titre,
         editeur_id=document_data.editeur_id,
@@ -41,18 +210,21 @@ def create_document(db: Session, document_data: DocumentCreate, utilisateur_crea
         utilisateur_creation_id=utilisateur_creation_id,
         annee_publication=document_data.annee_publication,
         resume=document_data.resume,
+        date_modification=now,
+        # Les associations sont insérées dans le même flush que le document
+        document_auteur=[DocumentAuteur(auteur_id=aid, date_creation=now) for aid in auteur_ids],
     )
 
     db.add(db_document)
-    db.commit()
-    db.refresh(db_document)
 
-    # Créer les lignes d'association document_auteur si des auteurs sont fournis
-    for aid in auteur_ids:
-        new_assoc = DocumentAuteur(document_id=db_document.id, auteur_id=aid, date_creation=datetime.now())
-        db.add(new_assoc)
-    if auteur_ids:
+    # Un seul flush + commit : le document et ses auteurs sont créés atomiquement.
+    # Sans expiration au commit, l'objet reste chargé : pas de refresh (SELECT) avant la sérialisation.
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
         db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
 
     return db_document
 
@@ -72,6 +244,7 @@ def update_document(db: Session, document_id: int, update_data: DocumentUpdate)
 
     for key, value in update_data.model_dump(exclude_unset=True).items():
         setattr(document, key, value)
+    document.date_modification = datetime.now()
 
     db.commit()
     db.refresh(document)
@@ -83,4 +256,34 @@ def associate_auteur_to_document(db: Session, document_id: int, auteur_id: int):
 
     new_document_auteur = DocumentAuteur(document_id=document_id, auteur_id=auteur_id)
     db.add(new_document_auteur)
-    db.commit()
\ No newline at end of file
+    db.commit()
+
+
+# --- Import en masse (voir import_service) ---
+
+def get_existing_titles(db: Session, titres: set[str]) -> set[str]:
+    """ Renvoie, parmi `titres`, ceux déjà présents dans le catalogue (une seule requête IN). """
+    if not titres:
+        return set()
+    return set(db.scalars(select(Document.titre).where(Document.titre.in_(titres))))
+
+def get_existing_isbns(db: Session, isbns: set[str]) -> set[str]:
+    """ Renvoie, parmi `isbns`, ceux déjà présents dans le catalogue (une seule requête IN). """
+    if not isbns:
+        return set()
+    return set(db.scalars(select(Document.isbn).where(Document.isbn.in_(isbns))))
+
+def bulk_insert_documents(db: Session, rows: list[dict]) -> list[int]:
+    """
+    Insère plusieurs documents en INSERT multi-lignes (sans commit) et renvoie
+    leurs IDs dans l'ordre de `rows`.
+    """
+    if not rows:
+        return []
+    stmt = insert(Document).returning(Document.id, sort_by_parameter_order=True)
+    return list(db.scalars(stmt, rows))
+
+def bulk_insert_document_auteurs(db: Session, rows: list[dict]) -> None:
+    """ Insère plusieurs associations document_auteur en INSERT multi-lignes (sans commit). """
+    if rows:
+        db.execute(insert(DocumentAuteur), rows)
\ No newline at end of file
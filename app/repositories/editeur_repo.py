@@ -1,4 +1,6 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from ..core.pagination import keyset_query
 from ..models.document import Auteur, Editeur
 from ..schemas.editeur_schema import EditeurSchema, EditeurCreateSchema as EditeurCreate
 
@@ -25,9 +27,9 @@ def get_editeur_by_name(db: Session, nom: str) -> Auteur | None:
     return db.query(Auteur).filter(Auteur.nom == nom).first()  
 
 
-def get_all_editeurs(db: Session) -> list[Editeur]:
-    """ Récupère tous les éditeurs. """
-    return db.query(Editeur).all()
+def get_all_editeurs(db: Session, limit: int, after_id: int | None = None) -> list[Editeur]:
+    """ Récupère une page d'éditeurs (triés par ID) après le curseur `after_id`. """
+    return keyset_query(db.query(Editeur), Editeur.id, limit, after_id).all()
 
 
 def delete_editeur(db: Session, editeur_id: int) -> Editeur | None:
@@ -39,3 +41,13 @@ def delete_editeur(db: Session, editeur_id: int) -> Editeur | None:
     db.commit()
     return editeur_to_delete
 
+
+def get_editeur_version(db: Session, editeur_id: int) -> tuple | None:
+    """ Version d'un éditeur pour son ETag : (id, date_modification). """
+    row = db.execute(select(Editeur.id, Editeur.date_modification).where(Editeur.id == editeur_id)).first()
+    return tuple(row) if row else None
+
+def get_editeurs_page_versions(db: Session, limit: int, after_id: int | None = None) -> list[tuple]:
+    """ Versions (id, date_modification) d'une page d'éditeurs, même pagination que `get_all_editeurs`. """
+    stmt = keyset_query(select(Editeur.id, Editeur.date_modification), Editeur.id, limit, after_id)
+    return [tuple(row) for row in db.execute(stmt)]
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.document import Document, Exemplaire
+from app.models.emprunt import Emprunt
+from app.models.membre import Membre
+
+
+# Les fonctions de ce module ne valident pas la transaction : c'est emprunt_service
+# qui l'ouvre, pose les verrous et la valide (ou l'annule) en une seule fois.
+
+def lock_membre(db: Session, membre_id: int) -> Membre | None:
+    """ Charge un membre en verrouillant sa ligne (SELECT ... FOR UPDATE). """
+    return db.execute(select(Membre).where(Membre.id == membre_id).with_for_update()).scalar_one_or_none()
+
+def lock_exemplaire(db: Session, exemplaire_id: int) -> Exemplaire | None:
+    """ Charge un exemplaire en verrouillant sa ligne (SELECT ... FOR UPDATE). """
+    return db.execute(select(Exemplaire).where(Exemplaire.id == exemplaire_id).with_for_update()).scalar_one_or_none()
+
+def lock_document(db: Session, document_id: int) -> int | None:
+    """
+    Verrouille la ligne d'un document (SELECT ... FOR NO KEY UPDATE) et renvoie son ID, ou None.
+    Sérialise les réservations et les retours d'un même titre ; FOR NO KEY UPDATE laisse passer
+    les insertions qui le référencent (exemplaires, réservations d'autres transactions).
+    """
+    return db.scalar(select(Document.id).where(Document.id == document_id).with_for_update(key_share=True))
+
+def count_emprunts_en_cours(db: Session, membre_id: int) -> int:
+    """ Nombre d'emprunts non rendus d'un membre. """
+    return db.scalar(
+        select(func.count(Emprunt.id)).where(Emprunt.membre_id == membre_id, Emprunt.date_retour_reelle.is_(None))
+    )
+
+def get_emprunt_en_cours(db: Session, exemplaire_id: int) -> Emprunt | None:
+    """ Emprunt non rendu d'un exemplaire, verrouillé (SELECT ... FOR UPDATE). """
+    return db.execute(
+        select(Emprunt)
+        .where(Emprunt.exemplaire_id == exemplaire_id, Emprunt.date_retour_reelle.is_(None))
+        .with_for_update()
+    ).scalar_one_or_none()
+
+def add_emprunt(db: Session, membre_id: int, exemplaire_id: int, utilisateur_id: int, now: datetime, date_retour_prevue: datetime) -> Emprunt:
+    """ Ajoute un emprunt à la session (sans commit). """
+    emprunt = Emprunt(
+        membre_id=membre_id,
+        exemplaire_id=exemplaire_id,
+        utilisateur_emprunt_id=utilisateur_id,
+        date_emprunt=now,
+        date_retour_prevue=date_retour_prevue,
+        date_creation=now,
+    )
+    db.add(emprunt)
+    return emprunt
@@ -0,0 +1,56 @@
+from typing import Iterator
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.models.document import Categorie, Document, Editeur, Exemplaire
+from app.models.emprunt import Emprunt
+from app.models.membre import Membre, TypeMembre
+
+
+# Requêtes d'export : colonnes uniquement (pas d'objets ORM), triées par ID.
+
+def documents_export_stmt() -> Select:
+    """ Catalogue avec libellés de catégorie et d'éditeur. """
+    return (
+        select(
+            Document.id, Document.titre, Document.isbn, Document.annee_publication,
+            Categorie.libelle.label("categorie"), Editeur.libelle.label("editeur"), Document.date_modification,
+        )
+        .outerjoin(Categorie, Categorie.id == Document.categorie_id)
+        .outerjoin(Editeur, Editeur.id == Document.editeur_id)
+        .order_by(Document.id)
+    )
+
+def membres_export_stmt() -> Select:
+    """ Adhérents avec libellé de leur type. """
+    return (
+        select(
+            Membre.id, Membre.nom, Membre.prenoms, Membre.email, Membre.telephone,
+            TypeMembre.libelle.label("type_membre"), Membre.est_actif, Membre.date_adhesion,
+        )
+        .outerjoin(TypeMembre, TypeMembre.id == Membre.type_membre_id)
+        .order_by(Membre.id)
+    )
+
+def emprunts_export_stmt() -> Select:
+    """ Historique des emprunts avec exemplaire et titre du document. """
+    return (
+        select(
+            Emprunt.id, Emprunt.membre_id, Emprunt.exemplaire_id, Exemplaire.numero_inventaire,
+            Exemplaire.document_id, Document.titre, Emprunt.date_emprunt,
+            Emprunt.date_retour_prevue, Emprunt.date_retour_reelle,
+        )
+        .join(Exemplaire, Exemplaire.id == Emprunt.exemplaire_id)
+        .join(Document, Document.id == Exemplaire.document_id)
+        .order_by(Emprunt.id)
+    )
+
+
+def stream_rows(db: Session, stmt: Select, chunk_size: int) -> Iterator[tuple]:
+    """
+    Parcourt le résultat avec un curseur côté serveur (`yield_per` active `stream_results`) :
+    seules `chunk_size` lignes sont en mémoire à la fois.
+    """
+    for row in db.execute(stmt.execution_options(yield_per=chunk_size)):
+        yield tuple(row)
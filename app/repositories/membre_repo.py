@@ -1,7 +1,51 @@
-from sqlalchemy.orm import Session
+import decimal
+from datetime import datetime
+
+from sqlalchemy.orm import Session, aliased, joinedload
+from ..core import statuts
+from ..models.document import Document, Exemplaire
+from ..models.emprunt import Emprunt, Penalite, Reservation
 from ..models.membre import Membre, TypeMembre
 from ..schemas.membre_schema import MembreCreate, MembreUpdate
-from sqlalchemy import select
+from sqlalchemy import Select, case, func, select, tuple_
+from ..core.pagination import keyset_query
+
+
+def membre_select() -> Select:
+    """
+    Requête de base pour la lecture des membres : le type de membre est chargé
+    dans la même requête (LEFT OUTER JOIN) pour exposer `type_membre_libelle`
+    sans requête supplémentaire par membre. Partagée avec `async_membre_repo`.
+    """
+    return select(Membre).options(joinedload(Membre.type_membre))
+
+def membre_by_id_stmt(membre_id: int) -> Select:
+    """ SELECT d'un membre (et de son type) par son ID. """
+    return membre_select().where(Membre.id == membre_id)
+
+def members_page_stmt(limit: int, after_id: int | None = None) -> Select:
+    """ SELECT d'une page de membres (triés par ID) après le curseur `after_id`. """
+    return keyset_query(membre_select(), Membre.id, limit, after_id)
+
+
+def _membre_versions_select() -> Select:
+    # Le libellé du type de membre fait partie de la réponse : sa date de modification aussi
+    return select(Membre.id, Membre.date_modification, TypeMembre.date_modification).outerjoin(
+        TypeMembre, TypeMembre.id == Membre.type_membre_id
+    )
+
+def membre_version_stmt(membre_id: int) -> Select:
+    """ Version d'un membre pour son ETag. """
+    return _membre_versions_select().where(Membre.id == membre_id)
+
+def members_page_versions_stmt(limit: int, after_id: int | None = None) -> Select:
+    """ Versions d'une page de membres, même pagination que `members_page_stmt`. """
+    return keyset_query(_membre_versions_select(), Membre.id, limit, after_id)
+
+def get_versions(db: Session, stmt: Select) -> list[tuple]:
+    """ Exécute une requête de versions (ETag) et renvoie les lignes brutes. """
+    return [tuple(row) for row in db.execute(stmt)]
+
 
 def create_membre(db: Session, membre_data: MembreCreate) -> Membre:
     """ Insère un nouvel enregistrement membre dans la base de données. """
@@ -17,25 +61,17 @@ def create_membre(db: Session, membre_data: MembreCreate) -> Membre:
     )
     
     db.add(db_membre)
+    db.flush() # Récupère l'ID généré avant le commit
+    membre_id = db_membre.id
     db.commit()
-    db.refresh(db_membre) # Récupère l'objet mis à jour avec son ID
-    
-    # Ajouter dynamiquement l'attribut `type_membre_libelle` à l'instance
-    # (ne pas utiliser la syntaxe de dictionnaire qui échoue sur une instance SQLAlchemy)
-    type_obj = get_type_membre_by_id(db, membre_data.type_membre_id)
-    if type_obj:
-        setattr(db_membre, "type_membre_libelle", type_obj.libelle)
 
-    return db_membre
+    # Relecture unique (membre + type de membre) au lieu de refresh + requête sur type_membre
+    return get_membre_by_id(db, membre_id)
 
 # Le Repository utilise des fonctions synchrones (def) car nous sommes en mode synchrone
 def get_membre_by_id(db: Session, membre_id: int) -> Membre | None:
-    """ Récupère un membre par son ID. """
-    db_member = db.query(Membre).filter(Membre.id == membre_id).first()
-    type_obj = get_type_membre_by_id(db, db_member.type_membre_id) if db_member else None
-    if db_member and type_obj:
-        setattr(db_member, "type_membre_libelle", type_obj.libelle)
-    return db_member
+    """ Récupère un membre (et son type) par son ID. """
+    return db.execute(membre_by_id_stmt(membre_id)).scalar_one_or_none()
 
 def get_membre_by_email(db: Session, email: str) -> Membre | None:
     """ Récupère un membre par son email. """
@@ -46,26 +82,17 @@ def get_type_membre_by_id (db: Session, type_membre_id: int) -> TypeMembre | Non
     """Récupère un type membre par son id"""
     return db.query(TypeMembre).filter(TypeMembre.id == type_membre_id).first()
 
-def get_members(db: Session) -> Membre | None: 
-    """Fetch all the members of the database"""
-    db_members = db.query(Membre).all()
-    for member in db_members:
-        type_obj = get_type_membre_by_id(db, member.type_membre_id)
-        if type_obj:
-            setattr(member, "type_membre_libelle", type_obj.libelle)
-    return db_members
+def get_members(db: Session, limit: int, after_id: int | None = None) -> list[Membre]:
+    """Récupère une page de membres (triés par ID) après le curseur `after_id`, avec leur type"""
+    return list(db.execute(members_page_stmt(limit, after_id)).scalars())
 
 
 def delete_member(db: Session, member_id: int) -> Membre:
     """Supprime un membre par son ID et retourne l'objet supprimé"""
-    member = db.query(Membre).filter(Membre.id == member_id).first()
+    member = get_membre_by_id(db, member_id)
     if member:
         db.delete(member)
         db.commit()
-
-    type_obj = get_type_membre_by_id(db, member.type_membre_id) if member else None
-    if member and type_obj:
-        setattr(member, "type_membre_libelle", type_obj.libelle)
     return member
 
 
@@ -76,12 +103,72 @@ def update_member(db: Session, member_id: int, update_data: MembreUpdate) -> Mem
         return None
     for key, value in update_data.model_dump(exclude_unset=True).items():
         setattr(member, key, value)
+    member.date_modification = datetime.now()
 
     db.commit()
-    db.refresh(member)
 
-    type_obj = get_type_membre_by_id(db, member.type_membre_id)
-    if member and type_obj:
-        setattr(member, "type_membre_libelle", type_obj.libelle)
-        
-    return member
\ No newline at end of file
+    # Relecture unique (membre + type de membre, éventuellement modifié)
+    return get_membre_by_id(db, member_id)
+
+
+# --- Compte adhérent (GET /membres/{id}/compte) : trois requêtes au total ---
+
+def account_stmt(membre_id: int) -> Select:
+    """ Membre, type de membre (jointure) et solde des pénalités impayées (sous-requête agrégée). """
+    solde = (
+        select(func.coalesce(func.sum(Penalite.montant_du - Penalite.montant_paye), 0))
+        .where(Penalite.membre_id == Membre.id, Penalite.statut == statuts.PENALITE_IMPAYEE)
+        .correlate(Membre)
+        .scalar_subquery()
+    )
+    return membre_select().add_columns(solde.label("penalites_dues")).where(Membre.id == membre_id)
+
+def current_loans_stmt(membre_id: int) -> Select:
+    """ Emprunts en cours d'un membre avec l'exemplaire et le titre du document. """
+    return (
+        select(
+            Emprunt.id, Emprunt.exemplaire_id, Exemplaire.numero_inventaire, Exemplaire.document_id,
+            Document.titre, Emprunt.date_emprunt, Emprunt.date_retour_prevue,
+        )
+        .join(Exemplaire, Exemplaire.id == Emprunt.exemplaire_id)
+        .join(Document, Document.id == Exemplaire.document_id)
+        .where(Emprunt.membre_id == membre_id, Emprunt.date_retour_reelle.is_(None))
+        .order_by(Emprunt.date_retour_prevue)
+    )
+
+def active_reservations_stmt(membre_id: int) -> Select:
+    """
+    Réservations actives d'un membre avec le titre du document et, pour celles en attente,
+    leur rang dans la file (sous-requête corrélée servie par `reservation_file_attente_idx`,
+    coût proportionnel au rang : voir reservation_repo.queue_position).
+    """
+    devant = aliased(Reservation)
+    position = (
+        select(func.count(devant.id) + 1)
+        .where(
+            devant.document_id == Reservation.document_id,
+            devant.statut == statuts.RESERVATION_EN_ATTENTE,
+            tuple_(devant.date_reservation, devant.id) < tuple_(Reservation.date_reservation, Reservation.id),
+        )
+        .correlate(Reservation)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Reservation.id, Reservation.document_id, Document.titre, Reservation.statut,
+            Reservation.date_reservation, Reservation.date_expiration_mise_de_cote,
+            case((Reservation.statut == statuts.RESERVATION_EN_ATTENTE, position)).label("position"),
+        )
+        .join(Document, Document.id == Reservation.document_id)
+        .where(Reservation.membre_id == membre_id, Reservation.statut.in_(statuts.RESERVATIONS_ACTIVES))
+        .order_by(Reservation.date_reservation)
+    )
+
+def get_account(db: Session, membre_id: int) -> tuple[Membre, decimal.Decimal, list, list] | None:
+    """ Membre, solde dû, emprunts en cours et réservations actives (trois requêtes). """
+    row = db.execute(account_stmt(membre_id)).first()
+    if row is None:
+        return None
+    loans = db.execute(current_loans_stmt(membre_id)).all()
+    reservations = db.execute(active_reservations_stmt(membre_id)).all()
+    return row[0], row[1], loans, reservations
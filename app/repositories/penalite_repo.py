@@ -0,0 +1,107 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, Subquery, cast, exists, func, literal, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core import statuts
+from app.models.emprunt import Emprunt, Penalite
+from app.models.membre import Membre, TypeMembre
+
+
+# Requêtes ensemblistes du calcul des pénalités : aucune ligne n'est chargée en Python.
+# Les fonctions ne valident pas la transaction (voir penalite_service).
+
+# Plafond imposé par la colonne penalite.montant_du (Numeric(6, 2))
+MONTANT_MAX = Decimal("9999.99")
+
+def late_loans_id_range(db: Session, as_of: date) -> tuple[int | None, int | None]:
+    """ Bornes (id min, id max) des emprunts dont la date de retour prévue est dépassée. """
+    row = db.execute(
+        select(func.min(Emprunt.id), func.max(Emprunt.id)).where(Emprunt.date_retour_prevue < as_of)
+    ).one()
+    return row[0], row[1]
+
+
+def late_loans_subquery(as_of: date, id_min: int, id_max: int) -> Subquery:
+    """
+    Emprunts en retard dont l'ID est dans ]id_min, id_max] et montant absolu de leur pénalité :
+    jours de retard (jusqu'au retour, ou jusqu'à `as_of` si non rendu) x taux journalier du type de membre.
+    """
+    fin = func.coalesce(cast(Emprunt.date_retour_reelle, Date), literal(as_of, Date))
+    jours = fin - cast(Emprunt.date_retour_prevue, Date)
+    return (
+        select(
+            Emprunt.id.label("emprunt_id"),
+            Emprunt.membre_id,
+            func.least(jours * TypeMembre.taux_penalite_jour, MONTANT_MAX).label("montant"),
+        )
+        .join(Membre, Membre.id == Emprunt.membre_id)
+        .join(TypeMembre, TypeMembre.id == Membre.type_membre_id)
+        .where(
+            Emprunt.id > id_min,
+            Emprunt.id <= id_max,
+            Emprunt.date_retour_prevue < as_of,
+            jours > 0,
+        )
+        .subquery()
+    )
+
+
+def count_late_loans(db: Session, late: Subquery) -> int:
+    """ Nombre d'emprunts en retard dans le lot. """
+    return db.scalar(select(func.count()).select_from(late))
+
+
+def update_penalties(db: Session, late: Subquery, now: datetime) -> int:
+    """ Met à jour (UPDATE ... FROM) le montant des pénalités de retard impayées qui ont changé. """
+    result = db.execute(
+        update(Penalite)
+        .where(
+            Penalite.emprunt_id == late.c.emprunt_id,
+            Penalite.motif == statuts.PENALITE_MOTIF_RETARD,
+            Penalite.statut == statuts.PENALITE_IMPAYEE,
+            Penalite.montant_du != late.c.montant,
+        )
+        .values(montant_du=late.c.montant, date_modification_statut=now)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def insert_missing_penalties(db: Session, late: Subquery, now: datetime, utilisateur_id: int) -> int:
+    """
+    Crée (INSERT ... SELECT) les pénalités de retard des emprunts qui n'en ont pas encore.
+    NOT EXISTS écarte les emprunts déjà pénalisés (la majorité, d'un jour à l'autre) ;
+    ON CONFLICT DO NOTHING sur l'index unique partiel `penalite_retard_emprunt_idx` couvre
+    une exécution concurrente qui insérerait les mêmes pénalités.
+    """
+    existing = exists().where(
+        Penalite.emprunt_id == late.c.emprunt_id,
+        Penalite.motif == statuts.PENALITE_MOTIF_RETARD,
+    )
+    rows = select(
+        late.c.montant,
+        literal(now),
+        literal(statuts.PENALITE_MOTIF_RETARD),
+        literal(statuts.PENALITE_IMPAYEE),
+        literal(now),
+        late.c.membre_id,
+        literal(utilisateur_id),
+        late.c.emprunt_id,
+    ).where(~existing)
+    result = db.execute(
+        pg_insert(Penalite)
+        .from_select(
+            ["montant_du", "date_creation", "motif", "statut", "date_modification_statut",
+             "membre_id", "utilisateur_creation_id", "emprunt_id"],
+            rows,
+        )
+        .on_conflict_do_nothing(
+            index_elements=["emprunt_id"],
+            # Prédicat de l'index partiel, en littéral pour que PostgreSQL puisse l'inférer
+            index_where=text(f"motif = '{statuts.PENALITE_MOTIF_RETARD}'"),
+        )
+    )
+    return result.rowcount
@@ -0,0 +1,139 @@
+from datetime import datetime
+
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core import statuts
+from app.core.response_cache import DOCUMENTS_MARKED, mark_documents
+from app.models.document import Exemplaire
+from app.models.emprunt import Reservation
+
+
+# Les fonctions de ce module ne valident pas la transaction (voir reservation_service).
+# Les requêtes sur la file d'attente sont servies par l'index partiel
+# `reservation_file_attente_idx` (document_id, date_reservation, id) WHERE statut = 'En attente'.
+
+def get_reservation(db: Session, reservation_id: int) -> Reservation | None:
+    """ Récupère une réservation par son ID. """
+    return db.get(Reservation, reservation_id)
+
+def lock_reservation(db: Session, reservation_id: int) -> Reservation | None:
+    """ Charge une réservation en verrouillant sa ligne (SELECT ... FOR UPDATE). """
+    return db.execute(select(Reservation).where(Reservation.id == reservation_id).with_for_update()).scalar_one_or_none()
+
+def has_active_reservation(db: Session, membre_id: int, document_id: int) -> bool:
+    """ Indique si le membre a déjà une réservation en attente ou mise de côté sur le document. """
+    return db.scalar(
+        select(Reservation.id).where(
+            Reservation.membre_id == membre_id,
+            Reservation.document_id == document_id,
+            Reservation.statut.in_(statuts.RESERVATIONS_ACTIVES),
+        ).limit(1)
+    ) is not None
+
+def add_reservation(db: Session, membre_id: int, document_id: int, now: datetime) -> Reservation:
+    """ Ajoute une réservation en fin de file (sans commit). """
+    reservation = Reservation(
+        membre_id=membre_id,
+        document_id=document_id,
+        statut=statuts.RESERVATION_EN_ATTENTE,
+        date_reservation=now,
+        date_modification_statut=now,
+    )
+    db.add(reservation)
+    return reservation
+
+def queue_position(db: Session, reservation: Reservation) -> int:
+    """
+    Rang (1 = tête) d'une réservation en attente dans la file de son document.
+    Compte les réservations placées devant elle sur `reservation_file_attente_idx` : coût
+    proportionnel au rang (parcours d'index seul), pas logarithmique. Un numéro d'ordre par
+    document (rang = numéro - numéro de la tête) surestimerait le rang dès qu'une
+    réservation du milieu de la file est annulée ou expire.
+    """
+    ahead = db.scalar(
+        select(func.count()).where(
+            Reservation.document_id == reservation.document_id,
+            Reservation.statut == statuts.RESERVATION_EN_ATTENTE,
+            tuple_(Reservation.date_reservation, Reservation.id) < tuple_(reservation.date_reservation, reservation.id),
+        )
+    )
+    return ahead + 1
+
+def lock_queue_head(db: Session, document_id: int) -> Reservation | None:
+    """
+    Tête de la file d'attente d'un document, verrouillée. Les retours d'un même titre sont
+    déjà sérialisés par le verrou du document : un verrou tenu sur la tête (annulation en
+    cours) est attendu, pour ne jamais servir la réservation suivante avant elle (FIFO).
+    """
+    return db.execute(
+        select(Reservation)
+        .where(Reservation.document_id == document_id, Reservation.statut == statuts.RESERVATION_EN_ATTENTE)
+        .order_by(Reservation.date_reservation, Reservation.id)
+        .limit(1)
+        .with_for_update()
+    ).scalar_one_or_none()
+
+def lock_member_hold(db: Session, membre_id: int, document_id: int) -> Reservation | None:
+    """ Réservation mise de côté d'un membre pour un document, verrouillée. """
+    return db.execute(
+        select(Reservation)
+        .where(
+            Reservation.membre_id == membre_id,
+            Reservation.document_id == document_id,
+            Reservation.statut == statuts.RESERVATION_MISE_DE_COTE,
+        )
+        .with_for_update()
+    ).scalar_one_or_none()
+
+def expire_holds(db: Session, now: datetime) -> list[int]:
+    """ Passe en « Expirée » (un seul UPDATE) les mises de côté échues et renvoie les documents concernés. """
+    result = db.execute(
+        update(Reservation)
+        .where(
+            Reservation.statut == statuts.RESERVATION_MISE_DE_COTE,
+            Reservation.date_expiration_mise_de_cote < now,
+        )
+        .values(statut=statuts.RESERVATION_EXPIREE, date_modification_statut=now)
+        .returning(Reservation.document_id)
+        .execution_options(synchronize_session=False, **{DOCUMENTS_MARKED: True})
+    )
+    document_ids = list(result.scalars())
+    # Les réponses en cache de ces seuls documents sont invalidées au COMMIT
+    mark_documents(db, document_ids)
+    return document_ids
+
+def unassigned_held_copies(db: Session) -> dict[int, int]:
+    """
+    Documents ayant plus d'exemplaires « Mis de côté » que de réservations mises de côté
+    (après expiration ou annulation) : {document_id: nombre d'exemplaires à réattribuer}.
+    """
+    held_copies = (
+        select(Exemplaire.document_id, func.count(Exemplaire.id).label("copies"))
+        .where(Exemplaire.statut == statuts.EXEMPLAIRE_MIS_DE_COTE)
+        .group_by(Exemplaire.document_id)
+        .subquery()
+    )
+    holds = (
+        select(Reservation.document_id, func.count(Reservation.id).label("holds"))
+        .where(Reservation.statut == statuts.RESERVATION_MISE_DE_COTE)
+        .group_by(Reservation.document_id)
+        .subquery()
+    )
+    surplus = held_copies.c.copies - func.coalesce(holds.c.holds, 0)
+    rows = db.execute(
+        select(held_copies.c.document_id, surplus)
+        .outerjoin(holds, holds.c.document_id == held_copies.c.document_id)
+        .where(surplus > 0)
+    )
+    return {row[0]: row[1] for row in rows}
+
+def lock_held_copies(db: Session, document_id: int, limit: int) -> list[Exemplaire]:
+    """ Verrouille jusqu'à `limit` exemplaires mis de côté d'un document (ignore ceux en cours de prêt). """
+    return list(db.scalars(
+        select(Exemplaire)
+        .where(Exemplaire.document_id == document_id, Exemplaire.statut == statuts.EXEMPLAIRE_MIS_DE_COTE)
+        .order_by(Exemplaire.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ))
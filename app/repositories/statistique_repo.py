@@ -0,0 +1,171 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, cast, func, literal, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.document import Document, Exemplaire
+from app.models.emprunt import Emprunt
+from app.models.membre import Membre
+from app.models.statistique import StatCirculationJour, StatEmpruntCategorieJour, StatEmpruntDocument, StatWatermark
+
+
+# Agrégation incrémentale : chaque fenêtre [debut, fin[ de l'historique est ajoutée aux
+# agrégats par INSERT ... SELECT ... GROUP BY ... ON CONFLICT DO UPDATE (incrément).
+# Les fonctions ne valident pas la transaction (voir statistique_service).
+
+WATERMARK_CIRCULATION = "circulation"
+
+
+def lock_watermark(db: Session, default: datetime) -> datetime:
+    """
+    Verrouille (FOR UPDATE) la borne d'agrégation et la renvoie. Créée au premier appel au début
+    du jour du plus ancien emprunt (ou à `default` si aucun) : deux exécutions concurrentes
+    traitent ainsi leurs fenêtres l'une après l'autre, sans double comptage.
+    """
+    debut = select(
+        literal(WATERMARK_CIRCULATION),
+        func.coalesce(func.date_trunc("day", func.min(Emprunt.date_emprunt)), literal(default)),
+    )
+    db.execute(
+        pg_insert(StatWatermark)
+        .from_select(["nom", "valeur"], debut)
+        .on_conflict_do_nothing(index_elements=["nom"])
+    )
+    return db.scalar(
+        select(StatWatermark.valeur).where(StatWatermark.nom == WATERMARK_CIRCULATION).with_for_update()
+    )
+
+
+def set_watermark(db: Session, valeur: datetime) -> None:
+    db.execute(
+        update(StatWatermark)
+        .where(StatWatermark.nom == WATERMARK_CIRCULATION)
+        .values(valeur=valeur)
+    )
+
+
+def get_watermark(db: Session) -> datetime | None:
+    return db.scalar(select(StatWatermark.valeur).where(StatWatermark.nom == WATERMARK_CIRCULATION))
+
+
+def add_loans_by_member_type(db: Session, debut: datetime, fin: datetime) -> int:
+    """ Ajoute les emprunts de la fenêtre à stat_circulation_jour (par jour et type de membre). """
+    jour = cast(Emprunt.date_emprunt, Date)
+    rows = (
+        select(jour, Membre.type_membre_id, func.count(), literal(0))
+        .join(Membre, Membre.id == Emprunt.membre_id)
+        .where(Emprunt.date_emprunt >= debut, Emprunt.date_emprunt < fin)
+        .group_by(jour, Membre.type_membre_id)
+    )
+    stmt = pg_insert(StatCirculationJour).from_select(["jour", "type_membre_id", "emprunts", "retours"], rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["jour", "type_membre_id"],
+        set_={"emprunts": StatCirculationJour.emprunts + stmt.excluded.emprunts},
+    )
+    return db.execute(stmt).rowcount
+
+
+def add_returns_by_member_type(db: Session, debut: datetime, fin: datetime) -> int:
+    """ Ajoute les retours de la fenêtre à stat_circulation_jour (par jour et type de membre). """
+    jour = cast(Emprunt.date_retour_reelle, Date)
+    rows = (
+        select(jour, Membre.type_membre_id, literal(0), func.count())
+        .join(Membre, Membre.id == Emprunt.membre_id)
+        .where(Emprunt.date_retour_reelle >= debut, Emprunt.date_retour_reelle < fin)
+        .group_by(jour, Membre.type_membre_id)
+    )
+    stmt = pg_insert(StatCirculationJour).from_select(["jour", "type_membre_id", "emprunts", "retours"], rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["jour", "type_membre_id"],
+        set_={"retours": StatCirculationJour.retours + stmt.excluded.retours},
+    )
+    return db.execute(stmt).rowcount
+
+
+def add_loans_by_category(db: Session, debut: datetime, fin: datetime) -> int:
+    """ Ajoute les emprunts de la fenêtre à stat_emprunt_categorie_jour (par jour, catégorie et éditeur). """
+    jour = cast(Emprunt.date_emprunt, Date)
+    rows = (
+        select(jour, Document.categorie_id, Document.editeur_id, func.count())
+        .join(Exemplaire, Exemplaire.id == Emprunt.exemplaire_id)
+        .join(Document, Document.id == Exemplaire.document_id)
+        .where(Emprunt.date_emprunt >= debut, Emprunt.date_emprunt < fin)
+        .group_by(jour, Document.categorie_id, Document.editeur_id)
+    )
+    stmt = pg_insert(StatEmpruntCategorieJour).from_select(["jour", "categorie_id", "editeur_id", "emprunts"], rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["jour", "categorie_id", "editeur_id"],
+        set_={"emprunts": StatEmpruntCategorieJour.emprunts + stmt.excluded.emprunts},
+    )
+    return db.execute(stmt).rowcount
+
+
+def add_loans_by_document(db: Session, debut: datetime, fin: datetime) -> int:
+    """ Ajoute les emprunts de la fenêtre au cumul par document (stat_emprunt_document). """
+    rows = (
+        select(Exemplaire.document_id, func.count(), func.max(Emprunt.date_emprunt))
+        .join(Exemplaire, Exemplaire.id == Emprunt.exemplaire_id)
+        .where(Emprunt.date_emprunt >= debut, Emprunt.date_emprunt < fin)
+        .group_by(Exemplaire.document_id)
+    )
+    stmt = pg_insert(StatEmpruntDocument).from_select(["document_id", "emprunts", "dernier_emprunt"], rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["document_id"],
+        set_={
+            "emprunts": StatEmpruntDocument.emprunts + stmt.excluded.emprunts,
+            "dernier_emprunt": func.greatest(StatEmpruntDocument.dernier_emprunt, stmt.excluded.dernier_emprunt),
+        },
+    )
+    return db.execute(stmt).rowcount
+
+
+def truncate_rollups(db: Session) -> None:
+    """ Vide les agrégats et la borne d'agrégation (reconstruction complète). """
+    db.execute(text(
+        "TRUNCATE stat_circulation_jour, stat_emprunt_categorie_jour, stat_emprunt_document, stat_watermark"
+    ))
+
+
+# --- Lectures : uniquement les tables d'agrégats ---
+
+def top_documents(db: Session, limit: int) -> list:
+    """ Documents les plus empruntés (parcours de stat_emprunt_document_emprunts_idx), avec leur titre. """
+    top = (
+        select(StatEmpruntDocument)
+        .order_by(StatEmpruntDocument.emprunts.desc(), StatEmpruntDocument.document_id)
+        .limit(limit)
+        .subquery()
+    )
+    return db.execute(
+        select(top.c.document_id, Document.titre, top.c.emprunts, top.c.dernier_emprunt)
+        .outerjoin(Document, Document.id == top.c.document_id)
+        .order_by(top.c.emprunts.desc(), top.c.document_id)
+    ).all()
+
+
+def loans_by_category(db: Session, du: date, au: date) -> list:
+    return db.execute(
+        select(StatEmpruntCategorieJour.categorie_id, func.sum(StatEmpruntCategorieJour.emprunts).label("emprunts"))
+        .where(StatEmpruntCategorieJour.jour >= du, StatEmpruntCategorieJour.jour <= au)
+        .group_by(StatEmpruntCategorieJour.categorie_id)
+        .order_by(func.sum(StatEmpruntCategorieJour.emprunts).desc())
+    ).all()
+
+
+def loans_by_publisher(db: Session, du: date, au: date) -> list:
+    return db.execute(
+        select(StatEmpruntCategorieJour.editeur_id, func.sum(StatEmpruntCategorieJour.emprunts).label("emprunts"))
+        .where(StatEmpruntCategorieJour.jour >= du, StatEmpruntCategorieJour.jour <= au)
+        .group_by(StatEmpruntCategorieJour.editeur_id)
+        .order_by(func.sum(StatEmpruntCategorieJour.emprunts).desc())
+    ).all()
+
+
+def daily_circulation(db: Session, du: date, au: date) -> list:
+    return db.execute(
+        select(StatCirculationJour)
+        .where(StatCirculationJour.jour >= du, StatCirculationJour.jour <= au)
+        .order_by(StatCirculationJour.jour, StatCirculationJour.type_membre_id)
+    ).scalars().all()
+
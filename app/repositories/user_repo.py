@@ -1,6 +1,7 @@
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
-from app.models.utilisateur import UtilisateurSys
-from ..schemas.user_schema import UserCreate
+from app.models.utilisateur import Role, UtilisateurRole, UtilisateurSys
+from ..schemas.user_schema import CurrentUser, UserCreate
 
 def create_user(db: Session, user_data: UserCreate) -> UtilisateurSys:
     """ Crée un nouvel utilisateur dans la base de données. """
@@ -29,4 +30,32 @@ def get_user_by_email(db: Session, email: str) -> UtilisateurSys | None:
 
 def get_user_by_id(db: Session, user_id: int) -> UtilisateurSys | None:
     """ Récupère un utilisateur par son ID. """
-    return db.query(UtilisateurSys).filter(UtilisateurSys.id == user_id).first()
\ No newline at end of file
+    return db.query(UtilisateurSys).filter(UtilisateurSys.id == user_id).first()
+
+
+def user_snapshot_stmt(user_id: int) -> Select:
+    """ SELECT de l'utilisateur et de ses rôles (une ligne par rôle). Partagé avec `async_user_repo`. """
+    return (
+        select(UtilisateurSys.id, UtilisateurSys.username, UtilisateurSys.est_actif, Role.libelle)
+        .outerjoin(UtilisateurRole, UtilisateurRole.utilisateur_sys_id == UtilisateurSys.id)
+        .outerjoin(Role, Role.id == UtilisateurRole.role_id)
+        .where(UtilisateurSys.id == user_id)
+    )
+
+
+def get_user_snapshot(db: Session, user_id: int) -> CurrentUser | None:
+    """ Récupère l'instantané d'authentification d'un utilisateur (id, username, est_actif, rôles) en une requête. """
+    return snapshot_from_rows(db.execute(user_snapshot_stmt(user_id)).all())
+
+
+def snapshot_from_rows(rows) -> CurrentUser | None:
+    """ Construit l'instantané à partir des lignes de `user_snapshot_stmt`. """
+    if not rows:
+        return None
+    first = rows[0]
+    return CurrentUser(
+        id=first.id,
+        username=first.username,
+        est_actif=first.est_actif,
+        roles=sorted(row.libelle for row in rows if row.libelle is not None),
+    )
\ No newline at end of file
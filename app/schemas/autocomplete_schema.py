@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Literal
+
+
+# Schéma d'une suggestion d'autocomplétion
+class SuggestionRead(BaseModel):
+    type: Literal["document", "auteur", "editeur"]
+    id: int
+    libelle: str
@@ -33,4 +33,16 @@ class CategorieUpdateSchema(BaseModel):
     model_config = ConfigDict(
         from_attributes=True, 
         arbitrary_types_allowed=True
-    )
\ No newline at end of file
+    )
+
+# Schéma d'un nœud de l'arbre des catégories (GET /categories/arbre)
+class CategorieNoeud(BaseModel):
+    id: int
+    libelle: str
+    parent_categorie_id: Optional[int] = None
+    # IDs des ancêtres, de la racine au parent
+    chemin: list[int] = []
+    nombre_documents: int = 0
+    # Documents de la catégorie et de toutes ses sous-catégories
+    nombre_documents_sous_arbre: int = 0
+    enfants: list["CategorieNoeud"] = []
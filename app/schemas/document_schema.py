@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 from datetime import date
 
 # Schéma de base pour Document
@@ -25,11 +25,32 @@ class DocumentCreate(DocumentBase):
 # Schéma pour la lecture d'un document
 class DocumentRead(DocumentBase):
     id: int
+    # Calculés à partir des exemplaires, des emprunts en cours et des réservations
     disponible: bool = True
+    nombre_exemplaires: int = 0
+    exemplaires_disponibles: int = 0
+    reservations_actives: int = 0
 
     class Config:
         from_attributes = True
 
+# Tri de la liste des documents : colonne, préfixée de "-" pour un ordre décroissant
+DocumentSort = Literal["id", "titre", "annee_publication", "-id", "-titre", "-annee_publication"]
+
+# Filtres et tri de la liste des documents (GET /documents/)
+class DocumentFilters(BaseModel):
+    # Catégorie, sous-catégories incluses
+    categorie_id: Optional[int] = None
+    editeur_id: Optional[int] = None
+    auteur_id: Optional[int] = None
+    annee_min: Optional[int] = None
+    annee_max: Optional[int] = None
+    tri: DocumentSort = "id"
+
+# Schéma d'un résultat de recherche plein texte (document + pertinence)
+class DocumentSearchResult(DocumentRead):
+    score: float = 0.0
+
 # Schéma pour la modification d'un document
 class DocumentUpdate(BaseModel):
     titre: Optional[str] = None
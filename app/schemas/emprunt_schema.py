@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+# Schéma d'entrée d'un emprunt (exemplaire scanné au comptoir)
+class EmpruntCreate(BaseModel):
+    membre_id: int
+    exemplaire_id: int
+
+# Schéma d'entrée d'un retour
+class RetourCreate(BaseModel):
+    exemplaire_id: int
+
+# Schéma de lecture d'un emprunt
+class EmpruntRead(BaseModel):
+    id: int
+    membre_id: int
+    exemplaire_id: int
+    date_emprunt: datetime
+    date_retour_prevue: datetime
+    date_retour_reelle: Optional[datetime] = None
+    utilisateur_emprunt_id: int
+    utilisateur_retour_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
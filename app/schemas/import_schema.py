@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional
+
+
+# Schéma d'une ligne d'import de catalogue (CSV ou JSON-lines)
+class DocumentImportRow(BaseModel):
+    titre: str = Field(..., min_length=1, max_length=255)
+    editeur_id: int
+    categorie_id: int
+    annee_publication: Optional[int] = None
+    isbn: Optional[str] = Field(None, max_length=13)
+    resume: Optional[str] = None
+    # En CSV : identifiants séparés par ";" (ex: "12;15")
+    auteur_ids: list[int] = []
+
+    @field_validator("auteur_ids", mode="before")
+    @classmethod
+    def split_auteur_ids(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [part.strip() for part in value.replace("|", ";").split(";") if part.strip()]
+        return value
+
+
+# Erreur rencontrée sur une ligne du fichier importé
+class ImportRowError(BaseModel):
+    ligne: int
+    erreur: str
+
+
+# Rapport d'import renvoyé par l'endpoint et la commande CLI
+class ImportReport(BaseModel):
+    lignes_traitees: int = 0
+    documents_crees: int = 0
+    erreurs: list[ImportRowError] = []
+    duree_s: float = 0.0
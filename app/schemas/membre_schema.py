@@ -1,4 +1,6 @@
 from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
 from pydantic import BaseModel, EmailStr, Field
 
 # 1. Schéma d'entrée (Création) : Ce que le client envoie
@@ -35,4 +37,32 @@ class MembreUpdate(BaseModel):
     # Pydantic v2 config to forbid extra fields
     model_config = {
         "extra": "forbid"
-    }
\ No newline at end of file
+    }
+
+
+# 4. Compte d'un adhérent : emprunts en cours, réservations et pénalités dues
+class EmpruntEnCours(BaseModel):
+    id: int
+    exemplaire_id: int
+    numero_inventaire: str
+    document_id: int
+    titre: str
+    date_emprunt: datetime
+    date_retour_prevue: datetime
+    en_retard: bool = False
+
+class ReservationCompte(BaseModel):
+    id: int
+    document_id: int
+    titre: str
+    statut: str
+    date_reservation: datetime
+    date_expiration_mise_de_cote: Optional[datetime] = None
+    # Rang dans la file d'attente (réservations en attente uniquement)
+    position: Optional[int] = None
+
+class CompteMembre(BaseModel):
+    membre: MembreRead
+    emprunts: list[EmpruntEnCours]
+    reservations: list[ReservationCompte]
+    penalites_dues: Decimal
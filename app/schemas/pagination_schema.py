@@ -0,0 +1,13 @@
+from typing import Generic, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+# Schéma générique de sortie pour les listes paginées par curseur
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    # Curseur opaque à renvoyer dans `?after=` pour obtenir la page suivante (None = dernière page)
+    next_cursor: Optional[str] = None
+    limit: int
@@ -0,0 +1,13 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+# Rapport d'un calcul des pénalités de retard (commande CLI et tâche planifiée)
+class PenaltyRunReport(BaseModel):
+    date_calcul: date
+    emprunts_en_retard: int = 0
+    penalites_creees: int = 0
+    penalites_mises_a_jour: int = 0
+    duree_s: float = 0.0
+    lignes_par_seconde: float = 0.0
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+# Schéma d'entrée d'une réservation
+class ReservationCreate(BaseModel):
+    membre_id: int
+    document_id: int
+
+# Schéma de lecture d'une réservation
+class ReservationRead(BaseModel):
+    id: int
+    membre_id: int
+    document_id: int
+    statut: str
+    date_reservation: datetime
+    date_disponibilite: Optional[datetime] = None
+    date_expiration_mise_de_cote: Optional[datetime] = None
+    # Rang dans la file d'attente (1 = prochain servi), pour les réservations en attente
+    position: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+# Rapport d'un balayage des mises de côté expirées
+class HoldSweepReport(BaseModel):
+    reservations_expirees: int = 0
+    exemplaires_reattribues: int = 0
+    duree_s: float = 0.0
@@ -0,0 +1,37 @@
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+# Lectures des statistiques de circulation (tables d'agrégats uniquement)
+class DocumentPlusEmprunte(BaseModel):
+    document_id: int
+    titre: Optional[str] = None # None si le document a été supprimé depuis
+    emprunts: int
+    dernier_emprunt: datetime
+
+class EmpruntsParCategorie(BaseModel):
+    categorie_id: int
+    libelle: Optional[str] = None
+    emprunts: int
+
+class EmpruntsParEditeur(BaseModel):
+    editeur_id: int
+    libelle: Optional[str] = None
+    emprunts: int
+
+class CirculationJour(BaseModel):
+    jour: date
+    type_membre_id: int
+    type_membre: Optional[str] = None
+    emprunts: int
+    retours: int
+
+
+# Rapport d'une mise à jour des agrégats (tâche planifiée et commande de reconstruction)
+class RollupReport(BaseModel):
+    debut: Optional[datetime] = None
+    fin: Optional[datetime] = None
+    lots: int = 0
+    duree_s: float = 0.0
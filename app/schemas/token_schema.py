@@ -15,4 +15,5 @@ class Token(BaseModel):
 # Schéma pour le JWT décodé (utilisé en interne par le système)
 class TokenData(BaseModel):
     username: Optional[str] = None
+    user_id: Optional[int] = None
 
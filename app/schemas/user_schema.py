@@ -20,4 +20,14 @@ class UserRead(UserCreate):
     id: int
 
     class Config:
-        from_attributes = True    
\ No newline at end of file
+        from_attributes = True
+
+
+# Instantané de l'utilisateur authentifié (mis en cache entre les requêtes)
+class CurrentUser(BaseModel):
+    id: int
+    username: str
+    est_actif: bool
+    roles: list[str] = []
+
+    model_config = {"frozen": True}    
\ No newline at end of file
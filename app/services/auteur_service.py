@@ -1,6 +1,10 @@
 from sqlalchemy.orm import Session
+from ..core.etag import make_etag
+from ..core.json_response import validate_list
+from ..core.pagination import decode_id_cursor, split_page
 from ..repositories import auteur_repo
 from ..schemas.auteur_schema import AuteurSchema
+from ..schemas.pagination_schema import Page
 
 def get_auteur(db: Session, auteur_id: int) -> AuteurSchema | None:
     """ Logique métier pour récupérer et traiter les informations d'un auteur. """
@@ -12,10 +16,15 @@ def get_auteur(db: Session, auteur_id: int) -> AuteurSchema | None:
     return AuteurSchema.model_validate(db_auteur)
 
 
-def get_auteurs(db: Session) -> list[AuteurSchema]:
-    """ Logique métier pour récupérer et traiter les informations d'un auteur. """
-    db_auteurs = auteur_repo.get_all_auteurs(db)
-    return [AuteurSchema.model_validate(auteur) for auteur in db_auteurs]
+def get_auteurs(db: Session, limit: int, after: str | None = None) -> Page[AuteurSchema]:
+    """ Logique métier pour récupérer une page d'auteurs (pagination par curseur). """
+    db_items = auteur_repo.get_all_auteurs(db, limit=limit, after_id=decode_id_cursor(after))
+    items, next_cursor = split_page(db_items, limit)
+    return Page[AuteurSchema](
+        items=validate_list(AuteurSchema, items),
+        next_cursor=next_cursor,
+        limit=limit,
+    )
 
 
 def delete_auteur(db: Session, auteur_id: int) -> AuteurSchema | None:
@@ -39,4 +48,15 @@ def create_new_auteur(db: Session, auteur_data) -> AuteurSchema:
     db_auteur = auteur_repo.create_auteur(db, auteur_data)
 
     # 3. Conversion de l'objet DB en Schéma de Sortie (sérialisation)
-    return AuteurSchema.model_validate(db_auteur)
\ No newline at end of file
+    return AuteurSchema.model_validate(db_auteur)
+
+
+def get_auteur_etag(db: Session, auteur_id: int) -> str | None:
+    """ ETag d'un auteur (None s'il n'existe pas), sans charger l'objet. """
+    version = auteur_repo.get_auteur_version(db, auteur_id)
+    return make_etag("auteur", version) if version else None
+
+
+def get_auteurs_etag(db: Session, limit: int, after: str | None = None) -> str:
+    """ ETag d'une page d'auteurs : IDs et dates de modification de la page. """
+    return make_etag("auteurs", limit, auteur_repo.get_auteurs_page_versions(db, limit, decode_id_cursor(after)))
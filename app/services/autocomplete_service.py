@@ -0,0 +1,105 @@
+"""
+Autocomplétion des titres, auteurs et éditeurs.
+
+Les suggestions sont servies depuis un index de préfixes en mémoire
+(`app.core.autocomplete.PrefixIndex`), sans accès à la base. L'index est
+construit en arrière-plan au premier appel (ou au démarrage via `warm_up`)
+puis reconstruit, toujours en arrière-plan, après une écriture validée sur
+`document`, `auteur` ou `editeur` ; l'ancien index continue de répondre pendant
+la reconstruction. Deux reconstructions sont espacées d'au moins
+AUTOCOMPLETE_REBUILD_MIN_INTERVAL_SECONDS : pendant un import en masse, les
+écritures sont regroupées au lieu d'enchaîner les reconstructions. Un index plus
+vieux que AUTOCOMPLETE_MAX_AGE_SECONDS est reconstruit à la lecture suivante
+(écritures des autres workers), sans dépendre du planificateur.
+Tant qu'aucun index n'est prêt, la recherche passe par la base (ILIKE servi par
+les index pg_trgm).
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..core import invalidation
+from ..core.autocomplete import PrefixIndex, Suggestion
+from ..core.config import settings
+from ..core.search_index import normalize
+from ..core.database import SessionLocal
+from ..repositories import autocomplete_repo
+
+logger = logging.getLogger(__name__)
+
+_index: Optional[PrefixIndex] = None
+_built_at = 0.0
+_state_lock = threading.Lock()
+_rebuilding = False
+_rebuild_requested = False
+
+
+def _rebuild_loop() -> None:
+    global _index, _built_at, _rebuilding, _rebuild_requested
+    while True:
+        with _state_lock:
+            _rebuild_requested = False
+        started = time.perf_counter()
+        try:
+            with SessionLocal() as db:
+                index = PrefixIndex(autocomplete_repo.iter_suggestion_rows(db))
+            _index = index
+            _built_at = time.monotonic()
+            logger.info("Index d'autocomplétion reconstruit : %d libellés en %.2fs", len(index), time.perf_counter() - started)
+        except Exception:
+            logger.exception("Échec de la reconstruction de l'index d'autocomplétion")
+        with _state_lock:
+            # Une écriture survenue pendant la reconstruction impose un nouveau passage
+            if not _rebuild_requested:
+                _rebuilding = False
+                return
+        # Regroupe les écritures suivantes (import en masse) en une seule reconstruction
+        time.sleep(max(0.0, started + settings.AUTOCOMPLETE_REBUILD_MIN_INTERVAL_SECONDS - time.perf_counter()))
+
+
+def request_rebuild() -> None:
+    """ Demande une reconstruction en arrière-plan (les demandes concurrentes sont fusionnées). """
+    global _rebuilding, _rebuild_requested
+    with _state_lock:
+        _rebuild_requested = True
+        if _rebuilding:
+            return
+        _rebuilding = True
+    threading.Thread(target=_rebuild_loop, name="autocomplete-rebuild", daemon=True).start()
+
+
+def warm_up() -> None:
+    """ Lance la construction initiale de l'index (appelée au démarrage de l'application). """
+    if _index is None:
+        request_rebuild()
+
+
+def is_ready() -> bool:
+    """ Indique si l'index en mémoire est disponible. """
+    return _index is not None
+
+
+invalidation.on_commit(["document", "auteur", "editeur"], lambda tables: request_rebuild())
+
+
+def suggest_from_memory(query: str, limit: int, types: Optional[set[str]] = None) -> Optional[list[Suggestion]]:
+    """ Suggestions depuis l'index en mémoire, ou None s'il n'est pas encore construit. """
+    index = _index
+    if index is None:
+        warm_up()
+        return None
+    if time.monotonic() - _built_at > settings.AUTOCOMPLETE_MAX_AGE_SECONDS:
+        # L'index actuel répond pendant sa reconstruction
+        request_rebuild()
+    return index.search(query, limit, types)
+
+
+def suggest_from_database(db: Session, query: str, limit: int, types: Optional[set[str]] = None) -> list[Suggestion]:
+    """ Suggestions calculées en base (index encore froid). """
+    normalized = normalize(query.strip())
+    rows = [Suggestion(*row) for row in autocomplete_repo.search_suggestions(db, query.strip(), limit, types)]
+    rows.sort(key=lambda s: (0 if normalize(s.libelle).startswith(normalized) else 1, len(s.libelle), s.libelle))
+    return rows[:limit]
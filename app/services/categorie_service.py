@@ -1,6 +1,12 @@
 from sqlalchemy.orm import Session
+from ..core.etag import make_etag
+from ..core.json_response import validate_list
+from ..core.pagination import decode_id_cursor, split_page
+from ..core.category_tree import CategoryTree
 from ..repositories import categorie_repo
-from ..schemas.categorie_schema import CategorieSchema
+from ..schemas.categorie_schema import CategorieNoeud, CategorieSchema
+from . import categorie_tree_service
+from ..schemas.pagination_schema import Page
 
 def get_categorie(db: Session, categorie_id: int) -> CategorieSchema | None:
     """ Logique métier pour récupérer et traiter les informations d'une catégorie. """
@@ -12,10 +18,15 @@ def get_categorie(db: Session, categorie_id: int) -> CategorieSchema | None:
     return CategorieSchema.model_validate(db_categorie)
 
 
-def get_categories(db: Session) -> list[CategorieSchema]:
-    """ Logique métier pour récupérer et traiter les informations d'une catégorie. """
-    db_categories = categorie_repo.get_all_categories(db)
-    return [CategorieSchema.model_validate(categorie) for categorie in db_categories]
+def get_categories(db: Session, limit: int, after: str | None = None) -> Page[CategorieSchema]:
+    """ Logique métier pour récupérer une page de catégories (pagination par curseur). """
+    db_items = categorie_repo.get_all_categories(db, limit=limit, after_id=decode_id_cursor(after))
+    items, next_cursor = split_page(db_items, limit)
+    return Page[CategorieSchema](
+        items=validate_list(CategorieSchema, items),
+        next_cursor=next_cursor,
+        limit=limit,
+    )
 
 
 def delete_categorie(db: Session, categorie_id: int) -> CategorieSchema | None:
@@ -40,4 +51,42 @@ def create_new_categorie(db: Session, categorie_data) -> CategorieSchema:
     db_categorie = categorie_repo.create_categorie(db, categorie_data)
 
     # 3. Conversion de l'objet DB en Schéma de Sortie (sérialisation)
-    return CategorieSchema.model_validate(db_categorie)
\ No newline at end of file
+    return CategorieSchema.model_validate(db_categorie)
+
+
+def get_categorie_etag(db: Session, categorie_id: int) -> str | None:
+    """ ETag d'une catégorie (None s'il n'existe pas), sans charger l'objet. """
+    version = categorie_repo.get_categorie_version(db, categorie_id)
+    return make_etag("categorie", version) if version else None
+
+
+def get_categories_etag(db: Session, limit: int, after: str | None = None) -> str:
+    """ ETag d'une page de catégories : IDs et dates de modification de la page. """
+    return make_etag("categories", limit, categorie_repo.get_categories_page_versions(db, limit, decode_id_cursor(after)))
+
+
+def _to_noeud(tree: CategoryTree, categorie_id: int) -> CategorieNoeud:
+    node = tree.get(categorie_id)
+    return CategorieNoeud(
+        id=node.id,
+        libelle=node.libelle,
+        parent_categorie_id=node.parent_id,
+        chemin=list(node.path),
+        nombre_documents=node.document_count,
+        nombre_documents_sous_arbre=node.subtree_document_count,
+        enfants=[_to_noeud(tree, child) for child in node.children],
+    )
+
+
+def get_categorie_tree(db: Session) -> list[CategorieNoeud]:
+    """ Arbre complet des catégories (depuis le cache en mémoire). """
+    tree = categorie_tree_service.get_tree(db)
+    return [_to_noeud(tree, root) for root in tree.roots]
+
+
+def get_categorie_subtree(db: Session, categorie_id: int) -> CategorieNoeud | None:
+    """ Sous-arbre d'une catégorie avec son chemin depuis la racine (None si elle n'existe pas). """
+    tree = categorie_tree_service.get_tree(db)
+    if tree.get(categorie_id) is None:
+        return None
+    return _to_noeud(tree, categorie_id)
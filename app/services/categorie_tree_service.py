@@ -0,0 +1,134 @@
+"""
+Arbre des catégories en cache (`app.core.category_tree.CategoryTree`).
+
+L'arbre (chemins, sous-arbres, nombre de documents par nœud) est construit en
+arrière-plan au premier appel (ou au démarrage via `warm_up`). Une écriture
+validée sur `categorie` l'invalide immédiatement puis lance sa reconstruction :
+tant qu'il est froid, le filtre par sous-arbre passe par une CTE récursive en
+base. Les nombres de documents peuvent en revanche être servis avec un peu de
+retard : au-delà de REFERENCE_CACHE_TTL_SECONDS, l'ancien arbre continue de
+répondre pendant sa reconstruction.
+
+L'invalidation n'atteint que le worker qui a validé l'écriture : après un
+rattachement de catégorie, les autres workers gardent l'ancien arbre jusqu'à ce
+qu'il atteigne REFERENCE_CACHE_TTL_SECONDS. Le filtre par sous-arbre passe donc par
+`fresh_tree`, qui refuse un arbre plus vieux que ce TTL : son résultat n'est jamais
+en retard de plus de REFERENCE_CACHE_TTL_SECONDS, quel que soit le worker.
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..core import invalidation
+from ..core.category_tree import CategoryTree
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..repositories import categorie_repo
+
+logger = logging.getLogger(__name__)
+
+_tree: Optional[CategoryTree] = None
+_built_at = 0.0
+# Incrémentée à chaque invalidation : un arbre lu avant une écriture n'est jamais publié après elle
+_generation = 0
+_state_lock = threading.Lock()
+_rebuilding = False
+_rebuild_requested = False
+
+
+def _load(db: Session) -> CategoryTree:
+    return CategoryTree(categorie_repo.get_tree_rows(db), categorie_repo.count_documents_by_categorie(db))
+
+
+def _publish(tree: CategoryTree, generation: int) -> bool:
+    global _tree, _built_at
+    with _state_lock:
+        if generation != _generation:
+            return False
+        _tree = tree
+        _built_at = time.monotonic()
+        return True
+
+
+def _rebuild_loop() -> None:
+    global _rebuilding, _rebuild_requested
+    while True:
+        with _state_lock:
+            _rebuild_requested = False
+            generation = _generation
+        started = time.perf_counter()
+        try:
+            with SessionLocal() as db:
+                tree = _load(db)
+            if _publish(tree, generation):
+                logger.info("Arbre des catégories reconstruit : %d catégories en %.3fs", len(tree), time.perf_counter() - started)
+        except Exception:
+            logger.exception("Échec de la reconstruction de l'arbre des catégories")
+        with _state_lock:
+            # Une écriture survenue pendant la reconstruction impose un nouveau passage
+            if not _rebuild_requested:
+                _rebuilding = False
+                return
+
+
+def request_rebuild() -> None:
+    """ Demande une reconstruction en arrière-plan (les demandes concurrentes sont fusionnées). """
+    global _rebuilding, _rebuild_requested
+    with _state_lock:
+        _rebuild_requested = True
+        if _rebuilding:
+            return
+        _rebuilding = True
+    threading.Thread(target=_rebuild_loop, name="categorie-tree-rebuild", daemon=True).start()
+
+
+def invalidate() -> None:
+    """ Écarte l'arbre courant (les lectures passent par la base) et lance sa reconstruction. """
+    global _tree, _generation
+    with _state_lock:
+        _generation += 1
+        _tree = None
+    request_rebuild()
+
+
+def warm_up() -> None:
+    """ Lance la construction initiale de l'arbre (appelée au démarrage de l'application). """
+    if _tree is None:
+        request_rebuild()
+
+
+invalidation.on_commit(["categorie"], lambda tables: invalidate())
+
+
+def cached_tree() -> Optional[CategoryTree]:
+    """ Arbre en mémoire, ou None s'il est froid (une construction est alors lancée). """
+    tree = _tree
+    if tree is None:
+        warm_up()
+        return None
+    if time.monotonic() - _built_at > settings.REFERENCE_CACHE_TTL_SECONDS:
+        # Nombres de documents à rafraîchir : l'arbre actuel répond en attendant
+        request_rebuild()
+    return tree
+
+
+def fresh_tree() -> Optional[CategoryTree]:
+    """ Arbre en mémoire s'il a moins de REFERENCE_CACHE_TTL_SECONDS, sinon None (une reconstruction est lancée). """
+    tree = cached_tree()
+    if tree is None or time.monotonic() - _built_at > settings.REFERENCE_CACHE_TTL_SECONDS:
+        return None
+    return tree
+
+
+def get_tree(db: Session) -> CategoryTree:
+    """ Arbre en mémoire, construit sur place avec `db` s'il est froid. """
+    tree = cached_tree()
+    if tree is None:
+        with _state_lock:
+            generation = _generation
+        tree = _load(db)
+        _publish(tree, generation)
+    return tree
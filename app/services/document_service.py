@@ -1,11 +1,170 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..repositories import document_repo
-from ..schemas.document_schema import DocumentCreate, DocumentRead
+from ..core import reference_cache
+from ..core.etag import make_etag
+from ..core.json_response import validate_list
+from ..core.pagination import decode_cursor, split_page
+from ..models.document import Document
+from ..repositories import async_document_repo, document_repo
+from ..schemas.document_schema import DocumentCreate, DocumentFilters, DocumentRead
+from ..schemas.pagination_schema import Page
+from . import categorie_tree_service
+
+
+def with_availability(document: DocumentRead, availability: dict[int, tuple[int, int, int]]) -> DocumentRead:
+    """ Renseigne (sur place) les champs de disponibilité d'un document à partir du résultat de `get_availability`. """
+    total, disponibles, reservations = availability.get(document.id, (0, 0, 0))
+    # Affectations directes : les valeurs viennent de la base, pas de nouvelle validation
+    document.disponible = disponibles > 0
+    document.nombre_exemplaires = total
+    document.exemplaires_disponibles = disponibles
+    document.reservations_actives = reservations
+    return document
+
+
+def _to_page(items: list, next_cursor: str | None, limit: int, availability: dict) -> Page[DocumentRead]:
+    # Validation unique de toute la page (les éléments ne sont pas re-validés par Page)
+    documents = validate_list(DocumentRead, items)
+    for document in documents:
+        with_availability(document, availability)
+    return Page[DocumentRead](items=documents, next_cursor=next_cursor, limit=limit)
+
+
+# Clé keyset de chaque tri (valeurs encodées dans le curseur) et types attendus au décodage
+_CURSOR_KEYS = {
+    "id": lambda doc: (doc.id,),
+    "titre": lambda doc: (doc.titre, doc.id),
+    "annee_publication": lambda doc: (doc.annee_publication or 0, doc.id),
+}
+_CURSOR_TYPES = {
+    "id": (int,),
+    "titre": (str, int),
+    "annee_publication": (int, int),
+}
+
+
+def _decode_after(after: str | None, tri: str) -> tuple | None:
+    """ Décode le curseur d'une page de documents ; lève ValueError s'il ne correspond pas au tri. """
+    values = decode_cursor(after)
+    if values is None:
+        return None
+    types = _CURSOR_TYPES[tri.lstrip("-")]
+    if len(values) != len(types) or not all(
+        isinstance(value, kind) and not isinstance(value, bool) for value, kind in zip(values, types)
+    ):
+        raise ValueError("Curseur de pagination invalide.")
+    return tuple(values)
+
+
+def _criteria(filters: DocumentFilters) -> list:
+    """ Filtres SQL de la liste des documents. """
+    if filters.annee_min is not None and filters.annee_max is not None and filters.annee_min > filters.annee_max:
+        raise ValueError("annee_min doit être inférieure ou égale à annee_max.")
+    criteria = []
+    if filters.categorie_id is not None:
+        # Sous-arbre depuis l'arbre en mémoire (un seul IN), ou par CTE récursive s'il est froid,
+        # trop ancien ou s'il ne connaît pas encore la catégorie (créée dans un autre worker)
+        tree = categorie_tree_service.fresh_tree()
+        if tree is not None and tree.get(filters.categorie_id) is not None:
+            criteria.append(document_repo.in_categories(tree.subtree_ids(filters.categorie_id)))
+        else:
+            criteria.append(document_repo.in_categorie_subtree(filters.categorie_id))
+    if filters.editeur_id is not None:
+        criteria.append(Document.editeur_id == filters.editeur_id)
+    if filters.auteur_id is not None:
+        criteria.append(document_repo.has_auteur(filters.auteur_id))
+    if filters.annee_min is not None or filters.annee_max is not None:
+        criteria.append(document_repo.published_between(filters.annee_min, filters.annee_max))
+    return criteria
+
+
+def _documents_etag(versions: list[tuple], limit: int, availability: dict) -> tuple[str, dict]:
+    # Chaque document de la page a une entrée (même sans exemplaire) : `get_documents`
+    # sait ainsi si la disponibilité calculée ici couvre toute la page chargée ensuite
+    availability = {row[0]: availability.get(row[0], (0, 0, 0)) for row in versions[:limit]}
+    # La disponibilité (exemplaires, emprunts, réservations) fait partie de la réponse
+    return make_etag("documents", limit, versions, sorted(availability.items())), availability
+
+
+def _versions_stmt(limit: int, after: str | None, filters: DocumentFilters):
+    return document_repo.documents_page_versions_stmt(
+        limit, _decode_after(after, filters.tri), _criteria(filters), filters.tri,
+    )
+
+
+def get_documents_etag(db: Session, limit: int, after: str | None = None, filters: DocumentFilters | None = None) -> tuple[str, dict]:
+    """
+    ETag d'une page de documents, calculé sans charger les documents.
+    Renvoie aussi la disponibilité de la page, à transmettre à `get_documents`.
+    """
+    stmt = _versions_stmt(limit, after, filters or DocumentFilters())
+    versions = document_repo.get_versions(db, stmt)
+    availability = document_repo.get_availability(db, [row[0] for row in versions[:limit]])
+    return _documents_etag(versions, limit, availability)
+
+
+async def get_documents_etag_async(db: AsyncSession, limit: int, after: str | None = None, filters: DocumentFilters | None = None) -> tuple[str, dict]:
+    """ Variante asynchrone de `get_documents_etag` (DB_ASYNC_MODE). """
+    stmt = _versions_stmt(limit, after, filters or DocumentFilters())
+    versions = await async_document_repo.get_versions(db, stmt)
+    availability = await async_document_repo.get_availability(db, [row[0] for row in versions[:limit]])
+    return _documents_etag(versions, limit, availability)
+
+
+def get_document_etag(db: Session, document_id: int) -> str | None:
+    """ ETag d'un document (None s'il n'existe pas), calculé sans charger le document. """
+    versions = document_repo.get_versions(db, document_repo.document_version_stmt(document_id))
+    if not versions:
+        return None
+    return make_etag("document", versions, sorted(document_repo.get_availability(db, [document_id]).items()))
 
-def get_documents(db: Session) -> list[DocumentRead]:
-    """ Logique métier pour récupérer et traiter les informations d'un document. """
-    db_documents = document_repo.get_all_documents(db)
-    return [DocumentRead.model_validate(doc) for doc in db_documents]
+
+async def get_document_etag_async(db: AsyncSession, document_id: int) -> str | None:
+    """ Variante asynchrone de `get_document_etag` (DB_ASYNC_MODE). """
+    versions = await async_document_repo.get_versions(db, document_repo.document_version_stmt(document_id))
+    if not versions:
+        return None
+    availability = await async_document_repo.get_availability(db, [document_id])
+    return make_etag("document", versions, sorted(availability.items()))
+
+
+def _covers(availability: dict | None, items: list) -> bool:
+    # Faux si la page a changé entre le calcul de l'ETag et son chargement
+    return availability is not None and all(doc.id in availability for doc in items)
+
+
+def get_documents(
+    db: Session, limit: int, after: str | None = None, filters: DocumentFilters | None = None,
+    availability: dict | None = None,
+) -> Page[DocumentRead]:
+    """
+    Logique métier pour récupérer une page de documents filtrée et triée (pagination par curseur).
+    `availability` : disponibilité déjà calculée par `get_documents_etag`, réutilisée si elle couvre la page.
+    """
+    filters = filters or DocumentFilters()
+    db_documents = document_repo.get_all_documents(
+        db, limit=limit, after=_decode_after(after, filters.tri), criteria=_criteria(filters), tri=filters.tri,
+    )
+    items, next_cursor = split_page(db_documents, limit, _CURSOR_KEYS[filters.tri.lstrip("-")])
+    if not _covers(availability, items):
+        # Disponibilité de toute la page en une seule requête groupée
+        availability = document_repo.get_availability(db, [doc.id for doc in items])
+    return _to_page(items, next_cursor, limit, availability)
+
+
+async def get_documents_async(
+    db: AsyncSession, limit: int, after: str | None = None, filters: DocumentFilters | None = None,
+    availability: dict | None = None,
+) -> Page[DocumentRead]:
+    """ Variante asynchrone de `get_documents` (DB_ASYNC_MODE). """
+    filters = filters or DocumentFilters()
+    db_documents = await async_document_repo.get_all_documents(
+        db, limit=limit, after=_decode_after(after, filters.tri), criteria=_criteria(filters), tri=filters.tri,
+    )
+    items, next_cursor = split_page(db_documents, limit, _CURSOR_KEYS[filters.tri.lstrip("-")])
+    if not _covers(availability, items):
+        availability = await async_document_repo.get_availability(db, [doc.id for doc in items])
+    return _to_page(items, next_cursor, limit, availability)
 
 
 def get_document(db: Session, document_id: int) -> DocumentRead | None:
@@ -15,7 +174,18 @@ def get_document(db: Session, document_id: int) -> DocumentRead | None:
     if db_document is None:
         return None
 
-    return DocumentRead.model_validate(db_document)
+    return with_availability(DocumentRead.model_validate(db_document), document_repo.get_availability(db, [document_id]))
+
+
+async def get_document_async(db: AsyncSession, document_id: int) -> DocumentRead | None:
+    """ Variante asynchrone de `get_document` (DB_ASYNC_MODE). """
+    db_document = await async_document_repo.get_document_by_id(db, document_id)
+
+    if db_document is None:
+        return None
+
+    availability = await async_document_repo.get_availability(db, [document_id])
+    return with_availability(DocumentRead.model_validate(db_document), availability)
 
 
 def create_new_document(db: Session, document_data: DocumentCreate, utilisateur_creation_id: int) -> DocumentRead:
@@ -26,11 +196,18 @@ def create_new_document(db: Session, document_data: DocumentCreate, utilisateur_
     if existing_doc:
         raise ValueError("Un document avec ce titre existe déjà.")
 
+    # Vérification des références depuis le cache (pas d'aller-retour DB)
+    if reference_cache.get_categorie(db, document_data.categorie_id) is None:
+        raise ValueError(f"Catégorie non trouvée avec l'ID {document_data.categorie_id}.")
+    if reference_cache.get_editeur(db, document_data.editeur_id) is None:
+        raise ValueError(f"Éditeur non trouvé avec l'ID {document_data.editeur_id}.")
+
     # 2. Appel du Repository pour l'insertion DB
     db_document = document_repo.create_document(db, document_data, utilisateur_creation_id)
 
     # 3. Conversion de l'objet DB en Schéma de Sortie (sérialisation)
-    return DocumentRead.model_validate(db_document)
+    # Un document qui vient d'être créé n'a encore aucun exemplaire
+    return with_availability(DocumentRead.model_validate(db_document), {})
 
 
 def delete_document(db: Session, document_id: int) -> DocumentRead | None:
@@ -51,4 +228,4 @@ def update_document(db: Session, document_id: int, update_data) -> DocumentRead
     if updated_document is None:
         return None
 
-    return DocumentRead.model_validate(updated_document)
\ No newline at end of file
+    return with_availability(DocumentRead.model_validate(updated_document), document_repo.get_availability(db, [document_id]))
\ No newline at end of file
@@ -1,6 +1,10 @@
 from sqlalchemy.orm import Session
+from ..core.etag import make_etag
+from ..core.json_response import validate_list
+from ..core.pagination import decode_id_cursor, split_page
 from ..repositories import editeur_repo
 from ..schemas.editeur_schema import EditeurSchema
+from ..schemas.pagination_schema import Page
 
 def get_editeur(db: Session, editeur_id: int) -> EditeurSchema | None:
     """ Logique métier pour récupérer et traiter les informations d'un éditeur. """
@@ -11,10 +15,15 @@ def get_editeur(db: Session, editeur_id: int) -> EditeurSchema | None:
 
     return EditeurSchema.model_validate(db_editeur)
 
-def get_editeurs(db: Session) -> list[EditeurSchema]:
-    """ Logique métier pour récupérer et traiter les informations d'un éditeur. """
-    db_editeurs = editeur_repo.get_all_editeurs(db)
-    return [EditeurSchema.model_validate(editeur) for editeur in db_editeurs]
+def get_editeurs(db: Session, limit: int, after: str | None = None) -> Page[EditeurSchema]:
+    """ Logique métier pour récupérer une page d'éditeurs (pagination par curseur). """
+    db_items = editeur_repo.get_all_editeurs(db, limit=limit, after_id=decode_id_cursor(after))
+    items, next_cursor = split_page(db_items, limit)
+    return Page[EditeurSchema](
+        items=validate_list(EditeurSchema, items),
+        next_cursor=next_cursor,
+        limit=limit,
+    )
 
 
 def delete_editeur(db: Session, editeur_id: int) -> EditeurSchema | None:
@@ -38,4 +47,15 @@ def create_new_editeur(db: Session, editeur_data) -> EditeurSchema:
     db_editeur = editeur_repo.create_editeur(db, editeur_data)
 
     # 3. Conversion de l'objet DB en Schéma de Sortie (sérialisation)
-    return EditeurSchema.model_validate(db_editeur)
\ No newline at end of file
+    return EditeurSchema.model_validate(db_editeur)
+
+
+def get_editeur_etag(db: Session, editeur_id: int) -> str | None:
+    """ ETag d'un éditeur (None s'il n'existe pas), sans charger l'objet. """
+    version = editeur_repo.get_editeur_version(db, editeur_id)
+    return make_etag("editeur", version) if version else None
+
+
+def get_editeurs_etag(db: Session, limit: int, after: str | None = None) -> str:
+    """ ETag d'une page d'éditeurs : IDs et dates de modification de la page. """
+    return make_etag("editeurs", limit, editeur_repo.get_editeurs_page_versions(db, limit, decode_id_cursor(after)))
@@ -0,0 +1,99 @@
+"""
+Circulation : emprunt et retour d'exemplaires.
+
+Chaque opération est une transaction courte :
+- emprunt : verrou sur le membre (sérialise ses emprunts simultanés, donc le
+  contrôle de `max_emprunt`), puis sur l'exemplaire (un seul comptoir peut le
+  prêter), insertion de l'emprunt et passage de l'exemplaire à « Emprunté » ;
+- retour : verrou sur l'exemplaire puis sur son emprunt en cours ; l'exemplaire
+  est mis de côté pour la tête de la file de réservations (reservation_service,
+  qui verrouille le document pour se sérialiser avec les nouvelles réservations).
+Les verrous sont toujours pris dans l'ordre membre -> exemplaire -> emprunt / document -> réservation,
+ce qui exclut les interblocages entre comptoirs. L'index unique partiel
+`emprunt_en_cours_exemplaire_idx` garantit en dernier recours qu'un exemplaire
+n'a jamais deux emprunts en cours.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core import reference_cache, statuts
+from ..repositories import emprunt_repo, reservation_repo
+from ..schemas.emprunt_schema import EmpruntCreate, EmpruntRead, RetourCreate
+from . import reservation_service
+
+
+def checkout(db: Session, data: EmpruntCreate, utilisateur_id: int) -> EmpruntRead:
+    """ Prête un exemplaire à un membre. """
+    try:
+        membre = emprunt_repo.lock_membre(db, data.membre_id)
+        if membre is None:
+            raise ValueError(f"Membre non trouvé avec l'ID {data.membre_id}.")
+        if not membre.est_actif:
+            raise ValueError("Ce membre n'est pas actif.")
+
+        exemplaire = emprunt_repo.lock_exemplaire(db, data.exemplaire_id)
+        if exemplaire is None:
+            raise ValueError(f"Exemplaire non trouvé avec l'ID {data.exemplaire_id}.")
+
+        now = datetime.now()
+        if exemplaire.statut == statuts.EXEMPLAIRE_MIS_DE_COTE:
+            # Exemplaire réservé : seul le membre dont la réservation est mise de côté peut l'emprunter
+            reservation = reservation_repo.lock_member_hold(db, membre.id, exemplaire.document_id)
+            if reservation is None:
+                raise ValueError("Exemplaire mis de côté pour un autre membre.")
+            reservation.statut = statuts.RESERVATION_HONOREE
+            reservation.date_modification_statut = now
+        elif exemplaire.statut != statuts.EXEMPLAIRE_DISPONIBLE:
+            raise ValueError(f"Exemplaire non disponible (statut : {exemplaire.statut}).")
+
+        type_membre = reference_cache.get_type_membre(db, membre.type_membre_id)
+        if type_membre is None:
+            # Le cache recharge la table sur un ID inconnu : le type n'existe vraiment pas
+            raise ValueError(f"Type de membre non trouvé avec l'ID {membre.type_membre_id}.")
+        if emprunt_repo.count_emprunts_en_cours(db, membre.id) >= type_membre.max_emprunt:
+            raise ValueError(f"Nombre maximal d'emprunts atteint ({type_membre.max_emprunt}).")
+
+        emprunt = emprunt_repo.add_emprunt(
+            db, membre.id, exemplaire.id, utilisateur_id, now,
+            date_retour_prevue=now + timedelta(days=type_membre.duree_emprunt),
+        )
+        exemplaire.statut = statuts.EXEMPLAIRE_EMPRUNTE
+        exemplaire.date_modification = now
+        db.flush()
+        result = EmpruntRead.model_validate(emprunt)
+        db.commit()
+    except IntegrityError:
+        # Emprunt en cours concurrent sur le même exemplaire (index unique partiel)
+        db.rollback()
+        raise ValueError("Exemplaire déjà emprunté.")
+    except Exception:
+        db.rollback()
+        raise
+    return result
+
+
+def checkin(db: Session, data: RetourCreate, utilisateur_id: int) -> EmpruntRead:
+    """ Enregistre le retour d'un exemplaire. """
+    try:
+        exemplaire = emprunt_repo.lock_exemplaire(db, data.exemplaire_id)
+        if exemplaire is None:
+            raise ValueError(f"Exemplaire non trouvé avec l'ID {data.exemplaire_id}.")
+
+        emprunt = emprunt_repo.get_emprunt_en_cours(db, exemplaire.id)
+        if emprunt is None:
+            raise ValueError("Aucun emprunt en cours pour cet exemplaire.")
+
+        now = datetime.now()
+        emprunt.date_retour_reelle = now
+        emprunt.utilisateur_retour_id = utilisateur_id
+        # Promotion de la tête de file d'attente dans la même transaction
+        reservation_service.hand_over_returned_copy(db, exemplaire, now)
+        db.flush()
+        result = EmpruntRead.model_validate(emprunt)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result
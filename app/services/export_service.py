@@ -0,0 +1,85 @@
+"""
+Exports en flux (NDJSON ou CSV) du catalogue, des adhérents et des emprunts.
+
+Les lignes sont lues par blocs avec un curseur côté serveur et encodées au fil
+de l'eau : la mémoire utilisée ne dépend pas de la taille de la table. Le
+générateur ouvre sa propre Session (la réponse est envoyée après la fin de la
+route) et la ferme à la fin du flux ou à la déconnexion du client.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Callable, Iterator
+
+from sqlalchemy import Select
+
+from ..core.database import SessionLocal
+from ..repositories import export_repo
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Lignes lues par aller-retour sur le curseur serveur
+CHUNK_SIZE = 2000
+# Taille (octets) au-delà de laquelle le tampon encodé est envoyé au client
+FLUSH_BYTES = 64 * 1024
+
+EXPORTS: dict[str, Callable[[], Select]] = {
+    "documents": export_repo.documents_export_stmt,
+    "membres": export_repo.membres_export_stmt,
+    "emprunts": export_repo.emprunts_export_stmt,
+}
+
+
+def _json_default(value):
+    # Dates au format ISO 8601 (« 2024-05-01T10:00:00 », pas la forme str() avec une espace)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode_ndjson(columns: list[str], rows: Iterator[tuple]) -> Iterator[str]:
+    # Pas d'en-tête en NDJSON : le premier fragment attend la première ligne de la requête
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False) + "\n"
+
+
+def _encode_csv(columns: list[str], rows: Iterator[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    # L'en-tête part avant l'exécution de la requête
+    writer.writerow(columns)
+    yield flush()
+    for row in rows:
+        writer.writerow(row)
+        yield flush()
+
+
+def stream_export(name: str, fmt: str) -> Iterator[bytes]:
+    """ Générateur des octets de l'export `name` au format `fmt`. """
+    stmt = EXPORTS[name]()
+    columns = [column.name for column in stmt.selected_columns]
+    encode = _encode_csv if fmt == "csv" else _encode_ndjson
+
+    with SessionLocal() as db:
+        pending: list[str] = []
+        size = 0
+        first = True
+        for chunk in encode(columns, export_repo.stream_rows(db, stmt, CHUNK_SIZE)):
+            pending.append(chunk)
+            size += len(chunk)
+            # Le premier fragment (en-tête CSV, première ligne NDJSON) part dès qu'il est
+            # encodé, les suivants par blocs de FLUSH_BYTES
+            if first or size >= FLUSH_BYTES:
+                yield "".join(pending).encode()
+                pending, size, first = [], 0, False
+        if pending:
+            yield "".join(pending).encode()
@@ -0,0 +1,168 @@
+"""
+Import en masse du catalogue (documents + auteurs associés).
+
+Le fichier (CSV ou JSON-lines) est lu en flux et traité par blocs de
+`chunk_size` lignes. Pour chaque bloc :
+  1. validation des lignes (schéma `DocumentImportRow`) ;
+  2. vérification ensembliste des références : auteurs, titres et ISBN déjà
+     présents en une requête IN chacun, catégories et éditeurs depuis le cache
+     des données de référence ;
+  3. INSERT multi-lignes des documents puis des associations document_auteur ;
+  4. un COMMIT par bloc.
+Les lignes invalides sont rapportées (numéro de ligne + message) sans bloquer
+l'import des autres lignes. Un fichier illisible (CSV mal formé, encodage autre
+que UTF-8) arrête la lecture : l'erreur est rapportée à la ligne concernée et
+les lignes lues jusque-là sont importées.
+"""
+import csv
+import json
+import time
+from datetime import datetime
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..core import reference_cache
+from ..repositories import auteur_repo, document_repo
+from ..schemas.import_schema import DocumentImportRow, ImportReport, ImportRowError
+
+DEFAULT_CHUNK_SIZE = 1000
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+
+def iter_csv_rows(stream: IO[str]) -> Iterator[tuple[int, dict]]:
+    """ Lit un CSV avec en-tête ; renvoie (numéro de ligne, valeurs) avec "" converti en None. """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {key: (value if value != "" else None) for key, value in row.items() if key}
+
+
+def iter_ndjson_rows(stream: IO[str]) -> Iterator[tuple[int, dict | str]]:
+    """ Lit un fichier JSON-lines ; une ligne illisible est renvoyée telle quelle (chaîne). """
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except json.JSONDecodeError:
+            yield line_no, line
+
+
+def _read_until_error(rows: Iterator[tuple[int, dict | str]], report: ImportReport) -> Iterator[tuple[int, dict | str]]:
+    """ Relaie les lignes lues ; une erreur de lecture est ajoutée au rapport et termine la lecture. """
+    line_no = 0
+    try:
+        for line_no, raw in rows:
+            yield line_no, raw
+    except UnicodeDecodeError:
+        report.erreurs.append(ImportRowError(ligne=line_no + 1, erreur="Encodage invalide (UTF-8 attendu) : lecture interrompue."))
+    except csv.Error as e:
+        report.erreurs.append(ImportRowError(ligne=line_no + 1, erreur=f"CSV mal formé ({e}) : lecture interrompue."))
+
+
+def _validate_chunk(db: Session, chunk: list[tuple[int, dict | str]], report: ImportReport) -> list[tuple[int, DocumentImportRow]]:
+    """ Valide un bloc de lignes et renvoie celles qui peuvent être insérées. """
+    parsed: list[tuple[int, DocumentImportRow]] = []
+    for line_no, raw in chunk:
+        if not isinstance(raw, dict):
+            report.erreurs.append(ImportRowError(ligne=line_no, erreur="Ligne JSON invalide."))
+            continue
+        try:
+            parsed.append((line_no, DocumentImportRow.model_validate(raw)))
+        except ValidationError as e:
+            message = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            report.erreurs.append(ImportRowError(ligne=line_no, erreur=message))
+
+    # Vérifications ensemblistes : une requête IN par type de référence pour tout le bloc
+    existing_auteurs = auteur_repo.get_existing_auteur_ids(db, {aid for _, row in parsed for aid in row.auteur_ids})
+    existing_titles = document_repo.get_existing_titles(db, {row.titre for _, row in parsed})
+    existing_isbns = document_repo.get_existing_isbns(db, {row.isbn for _, row in parsed if row.isbn})
+
+    valid: list[tuple[int, DocumentImportRow]] = []
+    seen_titles: set[str] = set()
+    seen_isbns: set[str] = set()
+    for line_no, row in parsed:
+        missing_auteurs = sorted(set(row.auteur_ids) - existing_auteurs)
+        if missing_auteurs:
+            erreur = f"Auteur(s) non trouvé(s) : {missing_auteurs}."
+        elif reference_cache.get_categorie(db, row.categorie_id) is None:
+            erreur = f"Catégorie non trouvée avec l'ID {row.categorie_id}."
+        elif reference_cache.get_editeur(db, row.editeur_id) is None:
+            erreur = f"Éditeur non trouvé avec l'ID {row.editeur_id}."
+        elif row.titre in existing_titles or row.titre in seen_titles:
+            erreur = "Un document avec ce titre existe déjà."
+        elif row.isbn and (row.isbn in existing_isbns or row.isbn in seen_isbns):
+            erreur = "Un document avec cet ISBN existe déjà."
+        else:
+            erreur = None
+
+        if erreur:
+            report.erreurs.append(ImportRowError(ligne=line_no, erreur=erreur))
+            continue
+        seen_titles.add(row.titre)
+        if row.isbn:
+            seen_isbns.add(row.isbn)
+        valid.append((line_no, row))
+    return valid
+
+
+def import_chunk(db: Session, chunk: list[tuple[int, dict | str]], utilisateur_creation_id: int, report: ImportReport) -> None:
+    """ Valide et insère un bloc de lignes dans une transaction dédiée. """
+    report.lignes_traitees += len(chunk)
+    valid = _validate_chunk(db, chunk, report)
+    if not valid:
+        db.rollback()
+        return
+
+    now = datetime.now()
+    try:
+        document_ids = document_repo.bulk_insert_documents(db, [
+            {
+                "titre": row.titre,
+                "editeur_id": row.editeur_id,
+                "categorie_id": row.categorie_id,
+                "utilisateur_creation_id": utilisateur_creation_id,
+                "annee_publication": row.annee_publication,
+                "isbn": row.isbn,
+                "resume": row.resume,
+                "date_modification": now,
+            }
+            for _, row in valid
+        ])
+        document_repo.bulk_insert_document_auteurs(db, [
+            {"document_id": document_id, "auteur_id": auteur_id, "date_creation": now}
+            for document_id, (_, row) in zip(document_ids, valid)
+            for auteur_id in dict.fromkeys(row.auteur_ids)
+        ])
+        db.commit()
+    except SQLAlchemyError as e:
+        # Conflit concurrent (ex: titre/ISBN inséré entre-temps) : le bloc entier est rejeté
+        db.rollback()
+        message = f"Bloc rejeté par la base de données : {e.__class__.__name__}."
+        report.erreurs.extend(ImportRowError(ligne=line_no, erreur=message) for line_no, _ in valid)
+        return
+    report.documents_crees += len(document_ids)
+
+
+def import_documents(
+    db: Session,
+    stream: IO[str],
+    fmt: str,
+    utilisateur_creation_id: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ImportReport:
+    """ Importe un fichier de catalogue (CSV ou JSON-lines) par blocs transactionnels. """
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Format d'import non supporté : {fmt} (attendu : {', '.join(SUPPORTED_FORMATS)}).")
+
+    started = time.perf_counter()
+    report = ImportReport()
+    rows: Iterable = _read_until_error(iter_csv_rows(stream) if fmt == "csv" else iter_ndjson_rows(stream), report)
+    while chunk := list(islice(rows, chunk_size)):
+        import_chunk(db, chunk, utilisateur_creation_id, report)
+    report.duree_s = round(time.perf_counter() - started, 3)
+    return report
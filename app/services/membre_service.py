@@ -1,22 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from app.models.utilisateur import UtilisateurSys
-from ..repositories import membre_repo
-from ..schemas.membre_schema import MembreCreate, MembreRead, MembreUpdate
+from ..core import reference_cache
+from ..core.etag import make_etag
+from ..core.json_response import validate_list
+from ..core.pagination import decode_id_cursor, split_page
+from ..repositories import async_membre_repo, membre_repo
+from ..schemas.membre_schema import CompteMembre, EmpruntEnCours, MembreCreate, MembreRead, MembreUpdate, ReservationCompte
+from ..schemas.pagination_schema import Page
 
 def create_new_member(db: Session, member_data: MembreCreate, current_user_id: int) -> MembreRead:
     """
     Logique métier pour la création d'un membre (y compris les vérifications).
     """
     # 1. LOGIQUE MÉTIER : Vérification de l'unicité de l'email
-    existing_member = membre_repo.get_member_by_email(db, member_data.email)
+    existing_member = membre_repo.get_membre_by_email(db, member_data.email)
     if existing_member:
         # Remonter une erreur personnalisée pour que le Routeur la gère en HTTP 400
         raise ValueError("Cet email est déjà utilisé par un autre adhérent.")
 
-    # 2. LOGIQUE MÉTIER : Validation simple du type (devrait être fait par un autre service, mais simple ici)
-    type_obj = membre_repo.get_type_membre_by_id(db, member_data.type_membre_id)
+    # 2. LOGIQUE MÉTIER : Validation simple du type (lu depuis le cache des données de référence)
+    type_obj = reference_cache.get_type_membre(db, member_data.type_membre_id)
     # Vérifier que le type existe
     if not type_obj:
         raise ValueError("Type de membre ID invalide.")
@@ -46,31 +54,76 @@ def get_member(db: Session, membre_id: int) -> MembreRead | None:
 
     return MembreRead.model_validate(db_membre)
 
-def get_members(db: Session) -> list[MembreRead]:
+def _to_page(db_members: list, limit: int) -> Page[MembreRead]:
+    items, next_cursor = split_page(db_members, limit)
+
+    # Convertir chaque objet DB en schéma de sortie
+    return Page[MembreRead](
+        items=validate_list(MembreRead, items),
+        next_cursor=next_cursor,
+        limit=limit,
+    )
+
+def get_members(db: Session, limit: int, after: str | None = None) -> Page[MembreRead]:
     """
-    Logique métier pour récupérer et formater les informations des membres.
-    Retourne une liste (vide si aucun membre).
+    Logique métier pour récupérer et formater une page de membres.
+    Retourne une page (éventuellement vide) et le curseur de la page suivante.
     """
-    db_members = membre_repo.get_members(db)
+    db_members = membre_repo.get_members(db, limit=limit, after_id=decode_id_cursor(after))
+    return _to_page(db_members, limit)
 
-    # Si la requête retourne une liste vide, renvoyer une liste vide (ne pas renvoyer None)
-    if not db_members:
-        return []
 
-    # Convertir chaque objet DB en schéma de sortie
-    return [MembreRead.model_validate(m) for m in db_members]
+def get_member_etag(db: Session, membre_id: int) -> str | None:
+    """ ETag d'un membre (None s'il n'existe pas), sans charger le membre. """
+    versions = membre_repo.get_versions(db, membre_repo.membre_version_stmt(membre_id))
+    return make_etag("membre", versions) if versions else None
+
+
+def get_members_etag(db: Session, limit: int, after: str | None = None) -> str:
+    """ ETag d'une page de membres. """
+    versions = membre_repo.get_versions(db, membre_repo.members_page_versions_stmt(limit, decode_id_cursor(after)))
+    return make_etag("membres", limit, versions)
+
+
+async def get_member_etag_async(db: AsyncSession, membre_id: int) -> str | None:
+    """ Variante asynchrone de `get_member_etag` (DB_ASYNC_MODE). """
+    versions = await async_membre_repo.get_versions(db, membre_repo.membre_version_stmt(membre_id))
+    return make_etag("membre", versions) if versions else None
+
+
+async def get_members_etag_async(db: AsyncSession, limit: int, after: str | None = None) -> str:
+    """ Variante asynchrone de `get_members_etag` (DB_ASYNC_MODE). """
+    versions = await async_membre_repo.get_versions(db, membre_repo.members_page_versions_stmt(limit, decode_id_cursor(after)))
+    return make_etag("membres", limit, versions)
+
+
+async def get_member_async(db: AsyncSession, membre_id: int) -> MembreRead | None:
+    """
+    Variante asynchrone de `get_member` (DB_ASYNC_MODE).
+    """
+    db_membre = await async_membre_repo.get_membre_by_id(db, membre_id)
+    if not db_membre:
+        return None
+    return MembreRead.model_validate(db_membre)
+
+
+async def get_members_async(db: AsyncSession, limit: int, after: str | None = None) -> Page[MembreRead]:
+    """
+    Variante asynchrone de `get_members` (DB_ASYNC_MODE).
+    """
+    db_members = await async_membre_repo.get_members(db, limit=limit, after_id=decode_id_cursor(after))
+    return _to_page(db_members, limit)
 
 
 def delete_member(db: Session, member_id: int) -> MembreRead:
     """
     Logique métier pour supprimer un membre.
     """
-    db_member = membre_repo.get_member_by_id(db, member_id)
+    # Appel du Repository pour la suppression (renvoie None si le membre n'existe pas)
+    db_member = membre_repo.delete_member(db, member_id)
     if not db_member:
         raise HTTPException(status_code=404, detail="Membre non trouvé")
 
-    # Appel du Repository pour la suppression
-    membre_repo.delete_member(db, member_id)
     return MembreRead.model_validate(db_member)
 
 def update_member(db: Session, member_id: int, update_data: MembreUpdate) -> MembreRead:
@@ -81,4 +134,33 @@ def update_member(db: Session, member_id: int, update_data: MembreUpdate) -> Mem
     if not db_member:
         raise HTTPException(status_code=404, detail="Membre non trouvé")
 
-    return MembreRead.model_validate(db_member)
\ No newline at end of file
+    return MembreRead.model_validate(db_member)
+
+
+def _to_account(account: tuple) -> CompteMembre:
+    db_membre, penalites_dues, loans, reservations = account
+    now = datetime.now()
+    return CompteMembre(
+        membre=MembreRead.model_validate(db_membre),
+        emprunts=[
+            EmpruntEnCours(**row._mapping, en_retard=row.date_retour_prevue < now)
+            for row in loans
+        ],
+        reservations=[ReservationCompte(**row._mapping) for row in reservations],
+        penalites_dues=penalites_dues,
+    )
+
+def get_member_account(db: Session, membre_id: int) -> CompteMembre | None:
+    """
+    Compte d'un adhérent en trois requêtes : membre + type + solde des pénalités,
+    emprunts en cours (avec titres), réservations actives (avec rang dans la file).
+    """
+    account = membre_repo.get_account(db, membre_id)
+    return _to_account(account) if account else None
+
+async def get_member_account_async(db: AsyncSession, membre_id: int) -> CompteMembre | None:
+    """
+    Variante asynchrone de `get_member_account` (DB_ASYNC_MODE).
+    """
+    account = await async_membre_repo.get_account(db, membre_id)
+    return _to_account(account) if account else None
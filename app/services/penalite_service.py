@@ -0,0 +1,62 @@
+"""
+Calcul des pénalités de retard.
+
+Le montant de la pénalité d'un emprunt est recalculé en valeur absolue
+(jours de retard x taux du type de membre) à la date de calcul : relancer
+le calcul le même jour ne change rien, et un calcul manqué est rattrapé
+au suivant. Les emprunts sont traités par lots d'IDs, chaque lot en deux
+requêtes ensemblistes (UPDATE ... FROM puis INSERT ... SELECT) et une
+transaction. Seules les pénalités impayées sont recalculées.
+"""
+import logging
+import time
+from datetime import date, datetime
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..repositories import penalite_repo
+from ..schemas.penalite_schema import PenaltyRunReport
+
+logger = logging.getLogger(__name__)
+
+
+def compute_overdue_penalties(
+    db: Session,
+    as_of: date | None = None,
+    utilisateur_id: int | None = None,
+    batch_size: int | None = None,
+) -> PenaltyRunReport:
+    """ Crée ou met à jour les pénalités de tous les emprunts en retard à la date `as_of` (aujourd'hui par défaut). """
+    as_of = as_of or date.today()
+    utilisateur_id = utilisateur_id or settings.PENALTY_JOB_USER_ID
+    batch_size = batch_size or settings.PENALTY_JOB_BATCH_SIZE
+
+    report = PenaltyRunReport(date_calcul=as_of)
+    started = time.perf_counter()
+    now = datetime.now()
+
+    id_min, id_max = penalite_repo.late_loans_id_range(db, as_of)
+    if id_min is not None:
+        lower = id_min - 1
+        while lower < id_max:
+            upper = min(lower + batch_size, id_max)
+            late = penalite_repo.late_loans_subquery(as_of, lower, upper)
+            try:
+                report.emprunts_en_retard += penalite_repo.count_late_loans(db, late)
+                report.penalites_mises_a_jour += penalite_repo.update_penalties(db, late, now)
+                report.penalites_creees += penalite_repo.insert_missing_penalties(db, late, now, utilisateur_id)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            lower = upper
+
+    report.duree_s = round(time.perf_counter() - started, 3)
+    report.lignes_par_seconde = round(report.emprunts_en_retard / report.duree_s, 1) if report.duree_s else 0.0
+    logger.info(
+        "Pénalités au %s : %d emprunts en retard, %d créées, %d mises à jour en %.3fs (%.0f lignes/s)",
+        as_of, report.emprunts_en_retard, report.penalites_creees, report.penalites_mises_a_jour,
+        report.duree_s, report.lignes_par_seconde,
+    )
+    return report
@@ -0,0 +1,167 @@
+"""
+Réservations : file d'attente FIFO par document.
+
+- Une réservation n'est acceptée que si aucun exemplaire n'est disponible.
+- Au retour d'un exemplaire, la tête de file est promue (« Mise de côté ») dans
+  la même transaction que le retour, et l'exemplaire passe à « Mis de côté ».
+- Le balayage périodique expire en un seul UPDATE les mises de côté échues,
+  puis réattribue les exemplaires libérés au suivant de chaque file.
+
+Une réservation et l'attribution d'un exemplaire rendu verrouillent toutes deux
+la ligne du document : sans cela, un retour concurrent d'une réservation pourrait
+remettre l'exemplaire en rayon (file vide à ses yeux) pendant que la réservation
+est acceptée (aucun exemplaire disponible à ses yeux), laissant le membre en file
+devant un exemplaire « Disponible ». Les verrous sont pris dans l'ordre
+membre -> exemplaire -> document -> réservation, comme pour les retours (voir
+emprunt_service). Les lectures de file passent par des index
+partiels (migrations/0006_reservation_queue.sql) : aucun parcours complet de
+`reservation`, même pour les titres très demandés.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core import statuts
+from ..core.config import settings
+from ..models.document import Exemplaire
+from ..repositories import document_repo, emprunt_repo, reservation_repo
+from ..schemas.reservation_schema import HoldSweepReport, ReservationCreate, ReservationRead
+
+logger = logging.getLogger(__name__)
+
+
+def _to_read(db: Session, reservation) -> ReservationRead:
+    result = ReservationRead.model_validate(reservation)
+    if reservation.statut == statuts.RESERVATION_EN_ATTENTE:
+        result = result.model_copy(update={"position": reservation_repo.queue_position(db, reservation)})
+    return result
+
+
+def create_reservation(db: Session, data: ReservationCreate) -> ReservationRead:
+    """ Place un membre en fin de file d'attente d'un document. """
+    try:
+        membre = emprunt_repo.lock_membre(db, data.membre_id)
+        if membre is None:
+            raise ValueError(f"Membre non trouvé avec l'ID {data.membre_id}.")
+        if not membre.est_actif:
+            raise ValueError("Ce membre n'est pas actif.")
+        # Verrou partagé avec hand_over_returned_copy : la disponibilité lue ci-dessous ne peut
+        # plus changer avant la validation
+        if emprunt_repo.lock_document(db, data.document_id) is None:
+            raise ValueError(f"Document non trouvé avec l'ID {data.document_id}.")
+        if reservation_repo.has_active_reservation(db, data.membre_id, data.document_id):
+            raise ValueError("Ce membre a déjà une réservation active pour ce document.")
+
+        _, disponibles, _ = document_repo.get_availability(db, [data.document_id]).get(data.document_id, (0, 0, 0))
+        if disponibles > 0:
+            raise ValueError("Un exemplaire de ce document est disponible : il peut être emprunté directement.")
+
+        reservation = reservation_repo.add_reservation(db, data.membre_id, data.document_id, datetime.now())
+        db.flush()
+        result = _to_read(db, reservation)
+        db.commit()
+    except IntegrityError:
+        # Réservation concurrente du même membre (index unique partiel)
+        db.rollback()
+        raise ValueError("Ce membre a déjà une réservation active pour ce document.")
+    except Exception:
+        db.rollback()
+        raise
+    return result
+
+
+def get_reservation(db: Session, reservation_id: int) -> ReservationRead | None:
+    """ Récupère une réservation et, si elle est en attente, son rang dans la file. """
+    reservation = reservation_repo.get_reservation(db, reservation_id)
+    if reservation is None:
+        return None
+    return _to_read(db, reservation)
+
+
+def cancel_reservation(db: Session, reservation_id: int) -> ReservationRead | None:
+    """ Annule une réservation ; un exemplaire qui lui était mis de côté passe au suivant. """
+    try:
+        reservation = reservation_repo.lock_reservation(db, reservation_id)
+        if reservation is None:
+            db.rollback()
+            return None
+        if reservation.statut not in statuts.RESERVATIONS_ACTIVES:
+            raise ValueError(f"Réservation non active (statut : {reservation.statut}).")
+
+        etait_mise_de_cote = reservation.statut == statuts.RESERVATION_MISE_DE_COTE
+        document_id = reservation.document_id
+        reservation.statut = statuts.RESERVATION_ANNULEE
+        reservation.date_modification_statut = datetime.now()
+        result = ReservationRead.model_validate(reservation)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if etait_mise_de_cote:
+        # Nouvelle transaction : verrous pris dans l'ordre exemplaire -> réservation
+        reassign_held_copies(db, {document_id: 1})
+    return result
+
+
+def hand_over_returned_copy(db: Session, exemplaire: Exemplaire, now: datetime) -> bool:
+    """
+    Attribue un exemplaire rendu (verrouillé par l'appelant, transaction non validée) :
+    mis de côté pour la tête de file s'il y en a une, sinon remis en rayon.
+    Renvoie True si une réservation a été promue.
+    """
+    # Sérialisé avec create_reservation : une réservation en cours de création est validée
+    # (et donc vue par lock_queue_head) avant que l'exemplaire ne soit remis en rayon
+    emprunt_repo.lock_document(db, exemplaire.document_id)
+    reservation = reservation_repo.lock_queue_head(db, exemplaire.document_id)
+    exemplaire.date_modification = now
+    if reservation is None:
+        exemplaire.statut = statuts.EXEMPLAIRE_DISPONIBLE
+        return False
+
+    reservation.statut = statuts.RESERVATION_MISE_DE_COTE
+    reservation.date_disponibilite = now
+    reservation.date_expiration_mise_de_cote = now + timedelta(days=settings.RESERVATION_HOLD_DAYS)
+    reservation.date_modification_statut = now
+    exemplaire.statut = statuts.EXEMPLAIRE_MIS_DE_COTE
+    return True
+
+
+def reassign_held_copies(db: Session, surplus: dict[int, int]) -> int:
+    """ Réattribue les exemplaires mis de côté sans réservation correspondante ({document_id: nombre}). """
+    reattribues = 0
+    for document_id, count in surplus.items():
+        try:
+            now = datetime.now()
+            for exemplaire in reservation_repo.lock_held_copies(db, document_id, count):
+                hand_over_returned_copy(db, exemplaire, now)
+                reattribues += 1
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    return reattribues
+
+
+def sweep_expired_holds(db: Session) -> HoldSweepReport:
+    """ Expire les mises de côté échues et passe les exemplaires libérés au suivant de chaque file. """
+    started = time.perf_counter()
+    report = HoldSweepReport()
+    try:
+        report.reservations_expirees = len(reservation_repo.expire_holds(db, datetime.now()))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    # Couvre aussi les exemplaires restés sans réservation après une annulation ou un échec précédent
+    report.exemplaires_reattribues = reassign_held_copies(db, reservation_repo.unassigned_held_copies(db))
+    report.duree_s = round(time.perf_counter() - started, 3)
+    logger.info(
+        "Réservations : %d mise(s) de côté expirée(s), %d exemplaire(s) réattribué(s) en %.3fs",
+        report.reservations_expirees, report.exemplaires_reattribues, report.duree_s,
+    )
+    return report
@@ -0,0 +1,39 @@
+"""
+Tâches de maintenance exécutées par le planificateur (`app.core.scheduler`).
+"""
+from sqlalchemy.orm import Session
+
+from ..core import reference_cache
+from ..core.config import settings
+from ..core.scheduler import Scheduler
+from . import autocomplete_service, categorie_tree_service, penalite_service, reservation_service, statistique_service
+
+
+def _compute_penalties(db: Session) -> None:
+    penalite_service.compute_overdue_penalties(db)
+
+
+def _sweep_holds(db: Session) -> None:
+    reservation_service.sweep_expired_holds(db)
+
+
+def _refresh_statistics(db: Session) -> None:
+    statistique_service.refresh_rollups(db)
+
+
+def _refresh_caches(db: Session) -> None:
+    # Recharge les tables de référence avant l'expiration du TTL : aucune requête n'attend le rechargement
+    reference_cache.refresh(db)
+    autocomplete_service.request_rebuild()
+    categorie_tree_service.request_rebuild()
+
+
+def register_jobs(scheduler: Scheduler) -> None:
+    """ Enregistre les tâches périodiques de l'application. """
+    jitter = settings.SCHEDULER_JITTER_SECONDS
+    scheduler.add_job("penalites", _compute_penalties, settings.PENALTY_JOB_INTERVAL_SECONDS, jitter, initial_delay=60)
+    scheduler.add_job("reservations_expirees", _sweep_holds, settings.HOLD_SWEEP_INTERVAL_SECONDS, jitter, initial_delay=30)
+    scheduler.add_job("statistiques", _refresh_statistics, settings.STATS_ROLLUP_INTERVAL_SECONDS, jitter, initial_delay=90)
+    # Caches en mémoire : propres à chaque worker, donc sans verrou consultatif
+    scheduler.add_job("caches", _refresh_caches, settings.CACHE_REFRESH_INTERVAL_SECONDS, jitter,
+                      initial_delay=settings.CACHE_REFRESH_INTERVAL_SECONDS, exclusive=False)
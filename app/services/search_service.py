@@ -0,0 +1,80 @@
+"""
+Recherche plein texte dans le catalogue.
+
+Sur PostgreSQL, la recherche s'appuie sur la colonne `document.search_vector`
+(tsvector maintenu par triggers, index GIN, voir migrations/0001_document_search.sql).
+Sur les autres bases (tests, SQLite), un index inversé en mémoire est construit
+au premier appel et reconstruit après toute écriture validée sur le catalogue.
+"""
+import threading
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..core import invalidation
+from ..core.search_index import InvertedIndex
+from ..core.json_response import validate_list
+from ..repositories import document_repo
+from ..schemas.document_schema import DocumentSearchResult
+from .document_service import with_availability
+
+# Poids des champs, alignés sur les poids A/B/C/D de ts_rank
+_FIELD_WEIGHTS = {"titre": 1.0, "auteurs": 0.4, "classement": 0.2, "resume": 0.1}
+
+# Tables dont dépend le contenu indexé
+_INDEXED_TABLES = ("document", "document_auteur", "auteur", "categorie", "editeur")
+
+_fallback_index: Optional[InvertedIndex] = None
+_fallback_lock = threading.Lock()
+
+
+def _invalidate_fallback_index(tables: set[str]) -> None:
+    global _fallback_index
+    _fallback_index = None
+
+
+invalidation.on_commit(_INDEXED_TABLES, _invalidate_fallback_index)
+
+
+def build_fallback_index(db: Session) -> InvertedIndex:
+    """ Construit l'index inversé en mémoire à partir du catalogue. """
+    index = InvertedIndex()
+    for document_id, titre, resume, categorie, editeur, auteurs in document_repo.iter_search_fields(db):
+        index.add(document_id, [
+            (titre, _FIELD_WEIGHTS["titre"]),
+            (auteurs, _FIELD_WEIGHTS["auteurs"]),
+            (f"{categorie or ''} {editeur or ''}", _FIELD_WEIGHTS["classement"]),
+            (resume, _FIELD_WEIGHTS["resume"]),
+        ])
+    return index
+
+
+def _get_fallback_index(db: Session) -> InvertedIndex:
+    global _fallback_index
+    index = _fallback_index
+    if index is None:
+        with _fallback_lock:
+            if _fallback_index is None:
+                _fallback_index = build_fallback_index(db)
+            index = _fallback_index
+    return index
+
+
+def search_documents(db: Session, query: str, limit: int = 20) -> list[DocumentSearchResult]:
+    """ Logique métier de la recherche : documents classés par pertinence décroissante. """
+    if not query.strip():
+        return []
+
+    if db.get_bind().dialect.name == "postgresql":
+        results = document_repo.search_documents(db, query, limit)
+    else:
+        ranked = _get_fallback_index(db).search(query, limit)
+        documents = {doc.id: doc for doc in document_repo.get_documents_by_ids(db, [doc_id for doc_id, _ in ranked])}
+        results = [(documents[doc_id], score) for doc_id, score in ranked if doc_id in documents]
+
+    availability = document_repo.get_availability(db, [doc.id for doc, _ in results])
+    documents = validate_list(DocumentSearchResult, [doc for doc, _ in results])
+    for document, (_, score) in zip(documents, results):
+        with_availability(document, availability)
+        document.score = round(float(score), 6)
+    return documents
@@ -0,0 +1,128 @@
+"""
+Statistiques de circulation.
+
+Les tableaux de bord ne lisent que des tables d'agrégats (`app.models.statistique`),
+jamais l'historique `emprunt`. Les agrégats sont tenus à jour de façon incrémentale
+par une tâche planifiée : chaque exécution ajoute les emprunts et retours de la
+fenêtre [borne, maintenant - STATS_ROLLUP_LAG_SECONDS[ puis avance la borne, par
+lots de STATS_ROLLUP_CHUNK_DAYS jours (une transaction par lot). Le délai de
+garde laisse aux transactions de prêt en cours le temps de valider : une ligne
+n'est agrégée qu'une fois sa date largement passée.
+
+Le moteur de prêt n'écrit pas dans les agrégats : un UPSERT par prêt sur la même
+ligne (jour, type de membre) sérialiserait tous les comptoirs.
+"""
+import logging
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from ..core import reference_cache
+from ..core.config import settings
+from ..repositories import statistique_repo
+from ..schemas.statistique_schema import (
+    CirculationJour, DocumentPlusEmprunte, EmpruntsParCategorie, EmpruntsParEditeur, RollupReport,
+)
+
+logger = logging.getLogger(__name__)
+
+# Fenêtre par défaut des statistiques journalières
+DEFAULT_PERIOD_DAYS = 30
+# Fenêtre maximale acceptée par les routes
+MAX_PERIOD_DAYS = 366
+
+
+def refresh_rollups(db: Session, now: datetime | None = None, chunk_days: int | None = None) -> RollupReport:
+    """ Agrège l'historique depuis la dernière borne, par lots de `chunk_days` jours. """
+    now = now or datetime.now()
+    chunk = timedelta(days=chunk_days or settings.STATS_ROLLUP_CHUNK_DAYS)
+    cutoff = now - timedelta(seconds=settings.STATS_ROLLUP_LAG_SECONDS)
+
+    report = RollupReport()
+    started = time.perf_counter()
+    while True:
+        try:
+            # Borne relue sous verrou à chaque lot : deux exécutions concurrentes ne comptent rien deux fois
+            debut = statistique_repo.lock_watermark(db, default=cutoff)
+            if debut >= cutoff:
+                db.rollback()
+                break
+            fin = min(debut + chunk, cutoff)
+            statistique_repo.add_loans_by_member_type(db, debut, fin)
+            statistique_repo.add_returns_by_member_type(db, debut, fin)
+            statistique_repo.add_loans_by_category(db, debut, fin)
+            statistique_repo.add_loans_by_document(db, debut, fin)
+            statistique_repo.set_watermark(db, fin)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        report.debut = report.debut or debut
+        report.fin = fin
+        report.lots += 1
+
+    report.duree_s = round(time.perf_counter() - started, 3)
+    if report.lots:
+        logger.info("Statistiques agrégées du %s au %s en %d lot(s), %.3fs", report.debut, report.fin, report.lots, report.duree_s)
+    return report
+
+
+def rebuild_rollups(db: Session, chunk_days: int | None = None) -> RollupReport:
+    """ Vide les agrégats puis les reconstruit depuis le début de l'historique. """
+    try:
+        statistique_repo.truncate_rollups(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return refresh_rollups(db, chunk_days=chunk_days)
+
+
+def _period(du: date | None, au: date | None) -> tuple[date, date]:
+    au = au or date.today()
+    du = du or au - timedelta(days=DEFAULT_PERIOD_DAYS - 1)
+    if du > au:
+        raise ValueError("La date de début doit précéder la date de fin")
+    if (au - du).days >= MAX_PERIOD_DAYS:
+        raise ValueError(f"La période ne peut pas dépasser {MAX_PERIOD_DAYS} jours")
+    return du, au
+
+
+def get_top_documents(db: Session, limit: int) -> list[DocumentPlusEmprunte]:
+    """ Documents les plus empruntés depuis le début de l'historique. """
+    return [DocumentPlusEmprunte(**row._mapping) for row in statistique_repo.top_documents(db, limit)]
+
+
+def get_loans_by_category(db: Session, du: date | None = None, au: date | None = None) -> list[EmpruntsParCategorie]:
+    """ Emprunts par catégorie sur la période (30 derniers jours par défaut). """
+    du, au = _period(du, au)
+    result = []
+    for categorie_id, emprunts in statistique_repo.loans_by_category(db, du, au):
+        categorie = reference_cache.get_categorie(db, categorie_id)
+        result.append(EmpruntsParCategorie(categorie_id=categorie_id, libelle=categorie.libelle if categorie else None, emprunts=emprunts))
+    return result
+
+
+def get_loans_by_publisher(db: Session, du: date | None = None, au: date | None = None) -> list[EmpruntsParEditeur]:
+    """ Emprunts par éditeur sur la période (30 derniers jours par défaut). """
+    du, au = _period(du, au)
+    result = []
+    for editeur_id, emprunts in statistique_repo.loans_by_publisher(db, du, au):
+        editeur = reference_cache.get_editeur(db, editeur_id)
+        result.append(EmpruntsParEditeur(editeur_id=editeur_id, libelle=editeur.libelle if editeur else None, emprunts=emprunts))
+    return result
+
+
+def get_daily_circulation(db: Session, du: date | None = None, au: date | None = None) -> list[CirculationJour]:
+    """ Emprunts et retours par jour et type de membre sur la période (30 derniers jours par défaut). """
+    du, au = _period(du, au)
+    result = []
+    for row in statistique_repo.daily_circulation(db, du, au):
+        type_membre = reference_cache.get_type_membre(db, row.type_membre_id)
+        result.append(CirculationJour(
+            jour=row.jour, type_membre_id=row.type_membre_id,
+            type_membre=type_membre.libelle if type_membre else None,
+            emprunts=row.emprunts, retours=row.retours,
+        ))
+    return result
@@ -1,9 +1,11 @@
 # Fichier: app/services/user_service.py (Extrait)
 
-from app.core.security import get_password_hash, verify_password
-from app.repositories import user_repo # A créer
+from app.core.security import get_password_hash, verify_password, verify_password_async
+from app.core.database import AsyncSessionLocal
+from app.repositories import async_user_repo, user_repo # A créer
 from app.schemas.user_schema import UserCreate, UserRead
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 def create_new_user(db: Session, user_data: UserCreate) -> UserRead:
     # 1. Vérification métier (email unique, etc.)
@@ -34,4 +36,25 @@ def authenticate_user(db: Session, username: str, password: str):
     if not verify_password(password, user.password):
         return None
         
+    return user
+
+
+async def authenticate_user_async(db: Session, username: str, password: str):
+    """
+    Variante non bloquante de `authenticate_user` pour les routes async :
+    la requête SQL s'exécute dans le threadpool (ou via AsyncSession si DB_ASYNC_MODE est
+    activé) et bcrypt dans le pool de hachage dédié.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as async_db:
+            user = await async_user_repo.get_user_by_username(async_db, username)
+    else:
+        user = await run_in_threadpool(user_repo.get_user_by_username, db, username)
+    if not user:
+        return None
+
+    # Vérification du mot de passe haché
+    if not await verify_password_async(password, user.password):
+        return None
+
     return user
\ No newline at end of file
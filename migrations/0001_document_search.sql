@@ -0,0 +1,112 @@
+-- 0001 : recherche plein texte sur le catalogue (PostgreSQL)
+--
+-- Ajoute la colonne `document.search_vector`, maintenue par triggers à partir du
+-- titre (poids A), des noms d'auteurs (B), des libellés de catégorie et d'éditeur (C)
+-- et du résumé (D), ainsi qu'un index GIN utilisé par GET /api/v1/documents/search.
+-- La configuration de recherche ('french') doit correspondre à SEARCH_TEXT_CONFIG.
+--
+-- Application : psql "$DATABASE_URL" -f migrations/0001_document_search.sql
+
+BEGIN;
+
+ALTER TABLE document ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+CREATE OR REPLACE FUNCTION document_search_vector(
+    p_document_id integer, p_titre text, p_resume text, p_categorie_id integer, p_editeur_id integer
+) RETURNS tsvector LANGUAGE sql STABLE AS $$
+    SELECT setweight(to_tsvector('french', coalesce(p_titre, '')), 'A')
+        || setweight(to_tsvector('french', coalesce((
+               SELECT string_agg(concat_ws(' ', a.prenoms, a.nom), ' ')
+               FROM document_auteur da JOIN auteur a ON a.id = da.auteur_id
+               WHERE da.document_id = p_document_id), '')), 'B')
+        || setweight(to_tsvector('french', concat_ws(' ',
+               (SELECT libelle FROM categorie WHERE id = p_categorie_id),
+               (SELECT libelle FROM editeur WHERE id = p_editeur_id))), 'C')
+        || setweight(to_tsvector('french', coalesce(p_resume, '')), 'D')
+$$;
+
+CREATE OR REPLACE FUNCTION document_search_vector_refresh(p_document_ids integer[]) RETURNS void LANGUAGE sql AS $$
+    UPDATE document d
+    SET search_vector = document_search_vector(d.id, d.titre, d.resume, d.categorie_id, d.editeur_id)
+    WHERE d.id = ANY(p_document_ids)
+$$;
+
+-- Document : calcul à l'insertion et lors de la modification des champs indexés
+CREATE OR REPLACE FUNCTION document_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := document_search_vector(NEW.id, NEW.titre, NEW.resume, NEW.categorie_id, NEW.editeur_id);
+    RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS document_search_vector_update ON document;
+CREATE TRIGGER document_search_vector_update
+    BEFORE INSERT OR UPDATE OF titre, resume, categorie_id, editeur_id ON document
+    FOR EACH ROW EXECUTE FUNCTION document_search_vector_trigger();
+
+-- Associations document/auteur : un rafraîchissement par instruction (imports en masse)
+CREATE OR REPLACE FUNCTION document_auteur_search_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM document_search_vector_refresh(ARRAY(SELECT DISTINCT document_id FROM changed));
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS document_auteur_search_insert ON document_auteur;
+CREATE TRIGGER document_auteur_search_insert
+    AFTER INSERT ON document_auteur REFERENCING NEW TABLE AS changed
+    FOR EACH STATEMENT EXECUTE FUNCTION document_auteur_search_trigger();
+
+DROP TRIGGER IF EXISTS document_auteur_search_delete ON document_auteur;
+CREATE TRIGGER document_auteur_search_delete
+    AFTER DELETE ON document_auteur REFERENCING OLD TABLE AS changed
+    FOR EACH STATEMENT EXECUTE FUNCTION document_auteur_search_trigger();
+
+-- Renommage d'un auteur, d'une catégorie ou d'un éditeur
+CREATE OR REPLACE FUNCTION auteur_search_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM document_search_vector_refresh(ARRAY(
+        SELECT document_id FROM document_auteur WHERE auteur_id = NEW.id));
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS auteur_search_update ON auteur;
+CREATE TRIGGER auteur_search_update
+    AFTER UPDATE OF nom, prenoms ON auteur
+    FOR EACH ROW EXECUTE FUNCTION auteur_search_trigger();
+
+CREATE OR REPLACE FUNCTION categorie_search_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM document_search_vector_refresh(ARRAY(
+        SELECT id FROM document WHERE categorie_id = NEW.id));
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS categorie_search_update ON categorie;
+CREATE TRIGGER categorie_search_update
+    AFTER UPDATE OF libelle ON categorie
+    FOR EACH ROW EXECUTE FUNCTION categorie_search_trigger();
+
+CREATE OR REPLACE FUNCTION editeur_search_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM document_search_vector_refresh(ARRAY(
+        SELECT id FROM document WHERE editeur_id = NEW.id));
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS editeur_search_update ON editeur;
+CREATE TRIGGER editeur_search_update
+    AFTER UPDATE OF libelle ON editeur
+    FOR EACH ROW EXECUTE FUNCTION editeur_search_trigger();
+
+-- Remplissage initial puis index GIN
+UPDATE document
+SET search_vector = document_search_vector(id, titre, resume, categorie_id, editeur_id)
+WHERE search_vector IS NULL;
+
+CREATE INDEX IF NOT EXISTS document_search_vector_idx ON document USING gin (search_vector);
+
+COMMIT;
@@ -0,0 +1,17 @@
+-- 0002 : index trigrammes pour l'autocomplétion (PostgreSQL, extension pg_trgm)
+--
+-- Servent la recherche ILIKE '%saisie%' de GET /api/v1/autocomplete/ tant que
+-- l'index de préfixes en mémoire n'est pas construit.
+--
+-- Application : psql "$DATABASE_URL" -f migrations/0002_autocomplete_trigram.sql
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS document_titre_trgm_idx ON document USING gin (titre gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS auteur_nom_trgm_idx ON auteur USING gin (nom gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS auteur_prenoms_trgm_idx ON auteur USING gin (prenoms gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS editeur_libelle_trgm_idx ON editeur USING gin (libelle gin_trgm_ops);
+
+COMMIT;
@@ -0,0 +1,11 @@
+-- 0003 : index de la disponibilité des documents (PostgreSQL)
+--
+-- Servent la requête groupée `document_repo.availability_stmt` qui calcule,
+-- pour une page de documents, le nombre d'exemplaires, d'exemplaires
+-- disponibles et de réservations actives.
+--
+-- Application : psql "$DATABASE_URL" -f migrations/0003_document_availability.sql
+
+CREATE INDEX IF NOT EXISTS exemplaire_document_id_idx ON exemplaire (document_id, statut);
+CREATE INDEX IF NOT EXISTS reservation_document_id_statut_idx ON reservation (document_id, statut);
+CREATE INDEX IF NOT EXISTS emprunt_en_cours_exemplaire_idx ON emprunt (exemplaire_id) WHERE date_retour_reelle IS NULL;
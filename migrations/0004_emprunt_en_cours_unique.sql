@@ -0,0 +1,14 @@
+-- 0004 : un seul emprunt en cours par exemplaire (PostgreSQL)
+--
+-- Remplace l'index partiel de 0003 par un index unique : en plus de servir le
+-- calcul de disponibilité, il interdit au niveau de la base qu'un exemplaire
+-- soit prêté deux fois (voir emprunt_service).
+--
+-- Application : psql "$DATABASE_URL" -f migrations/0004_emprunt_en_cours_unique.sql
+
+BEGIN;
+
+DROP INDEX IF EXISTS emprunt_en_cours_exemplaire_idx;
+CREATE UNIQUE INDEX emprunt_en_cours_exemplaire_idx ON emprunt (exemplaire_id) WHERE date_retour_reelle IS NULL;
+
+COMMIT;
@@ -0,0 +1,10 @@
+-- 0005 : calcul ensembliste des pénalités de retard (PostgreSQL)
+--
+-- - une seule pénalité « Retard » par emprunt : garantit l'idempotence du calcul
+--   (app.services.penalite_service), même si deux exécutions se chevauchent ;
+-- - index sur la date de retour prévue pour borner le lot des emprunts en retard.
+--
+-- Application : psql "$DATABASE_URL" -f migrations/0005_penalites_retard.sql
+
+CREATE UNIQUE INDEX IF NOT EXISTS penalite_retard_emprunt_idx ON penalite (emprunt_id) WHERE motif = 'Retard';
+CREATE INDEX IF NOT EXISTS emprunt_date_retour_prevue_idx ON emprunt (date_retour_prevue);
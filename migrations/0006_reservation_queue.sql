@@ -0,0 +1,19 @@
+-- 0006 : file d'attente des réservations (PostgreSQL)
+--
+-- - reservation_file_attente_idx : tête de file et rang d'une réservation en
+--   parcours d'index, sans lire les réservations closes ;
+-- - reservation_mise_de_cote_expiration_idx : balayage des mises de côté échues ;
+-- - reservation_active_membre_document_idx : une seule réservation active par
+--   membre et par document ;
+-- - exemplaire_mis_de_cote_idx : exemplaires mis de côté à réattribuer.
+--
+-- Application : psql "$DATABASE_URL" -f migrations/0006_reservation_queue.sql
+
+CREATE INDEX IF NOT EXISTS reservation_file_attente_idx
+    ON reservation (document_id, date_reservation, id) WHERE statut = 'En attente';
+CREATE INDEX IF NOT EXISTS reservation_mise_de_cote_expiration_idx
+    ON reservation (date_expiration_mise_de_cote) WHERE statut = 'Mise de côté';
+CREATE UNIQUE INDEX IF NOT EXISTS reservation_active_membre_document_idx
+    ON reservation (membre_id, document_id) WHERE statut IN ('En attente', 'Mise de côté');
+CREATE INDEX IF NOT EXISTS exemplaire_mis_de_cote_idx
+    ON exemplaire (document_id) WHERE statut = 'Mis de côté';
@@ -0,0 +1,12 @@
+-- 0007 : compte adhérent (PostgreSQL)
+--
+-- - emprunt_en_cours_membre_idx : emprunts en cours d'un membre (quota au
+--   prêt, liste du compte) sans parcourir l'historique ;
+-- - penalite_impayee_membre_idx : solde des pénalités impayées d'un membre.
+--
+-- Application : psql "$DATABASE_URL" -f migrations/0007_compte_membre.sql
+
+CREATE INDEX IF NOT EXISTS emprunt_en_cours_membre_idx
+    ON emprunt (membre_id) WHERE date_retour_reelle IS NULL;
+CREATE INDEX IF NOT EXISTS penalite_impayee_membre_idx
+    ON penalite (membre_id) WHERE statut = 'Impayée';
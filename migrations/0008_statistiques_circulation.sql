@@ -0,0 +1,45 @@
+-- 0008 : agrégats des statistiques de circulation (PostgreSQL)
+--
+-- - stat_circulation_jour : emprunts et retours par jour et type de membre ;
+-- - stat_emprunt_categorie_jour : emprunts par jour, catégorie et éditeur ;
+-- - stat_emprunt_document : cumul des emprunts par document (classement) ;
+-- - stat_watermark : borne jusqu'à laquelle l'historique a été agrégé ;
+-- - index sur emprunt(date_emprunt) et emprunt(date_retour_reelle) pour lire
+--   chaque fenêtre d'agrégation en parcours d'index.
+--
+-- Application : psql "$DATABASE_URL" -f migrations/0008_statistiques_circulation.sql
+-- puis remplissage initial : python -m app.cli.backfill_statistics
+
+CREATE TABLE IF NOT EXISTS stat_circulation_jour (
+    jour date NOT NULL,
+    type_membre_id integer NOT NULL,
+    emprunts integer NOT NULL DEFAULT 0,
+    retours integer NOT NULL DEFAULT 0,
+    CONSTRAINT stat_circulation_jour_pkey PRIMARY KEY (jour, type_membre_id)
+);
+
+CREATE TABLE IF NOT EXISTS stat_emprunt_categorie_jour (
+    jour date NOT NULL,
+    categorie_id integer NOT NULL,
+    editeur_id integer NOT NULL,
+    emprunts integer NOT NULL DEFAULT 0,
+    CONSTRAINT stat_emprunt_categorie_jour_pkey PRIMARY KEY (jour, categorie_id, editeur_id)
+);
+
+CREATE TABLE IF NOT EXISTS stat_emprunt_document (
+    document_id integer NOT NULL,
+    emprunts integer NOT NULL DEFAULT 0,
+    dernier_emprunt timestamp without time zone NOT NULL,
+    CONSTRAINT stat_emprunt_document_pkey PRIMARY KEY (document_id)
+);
+CREATE INDEX IF NOT EXISTS stat_emprunt_document_emprunts_idx
+    ON stat_emprunt_document (emprunts DESC, document_id);
+
+CREATE TABLE IF NOT EXISTS stat_watermark (
+    nom varchar(50) NOT NULL,
+    valeur timestamp without time zone NOT NULL,
+    CONSTRAINT stat_watermark_pkey PRIMARY KEY (nom)
+);
+
+CREATE INDEX IF NOT EXISTS emprunt_date_emprunt_idx ON emprunt (date_emprunt);
+CREATE INDEX IF NOT EXISTS emprunt_date_retour_reelle_idx ON emprunt (date_retour_reelle);
@@ -0,0 +1,11 @@
+-- 0009 : arbre des catégories (PostgreSQL)
+--
+-- - categorie_parent_categorie_id_idx : descente récursive dans les
+--   sous-catégories (CTE utilisée tant que l'arbre en mémoire est froid) ;
+-- - document_categorie_id_idx : filtre `categorie_id IN (...)` de la liste des
+--   documents (paginée par id) et nombre de documents par catégorie.
+--
+-- Application : psql "$DATABASE_URL" -f migrations/0009_categorie_arbre.sql
+
+CREATE INDEX IF NOT EXISTS categorie_parent_categorie_id_idx ON categorie (parent_categorie_id);
+CREATE INDEX IF NOT EXISTS document_categorie_id_idx ON document (categorie_id, id);
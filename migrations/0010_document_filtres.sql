@@ -0,0 +1,26 @@
+-- 0010 : filtres et tris de la liste des documents, index des clés étrangères (PostgreSQL)
+--
+-- - document_editeur_id_idx : filtre par éditeur, pagination par id ;
+-- - document_titre_idx / document_annee_tri_idx : tris keyset (titre, id) et
+--   (année, id), parcourus à l'envers pour un tri décroissant ; l'expression
+--   doit être identique à document_repo.ANNEE_TRI ;
+-- - document_auteur_auteur_id_idx : documents d'un auteur ;
+-- - emprunt_membre_id_idx / emprunt_exemplaire_id_idx : historique par membre et
+--   par exemplaire, et suppression des lignes référencées sans parcours complet.
+--
+-- document(categorie_id), exemplaire(document_id) et reservation(document_id) sont
+-- déjà indexés (0003, 0009).
+--
+-- Application : psql "$DATABASE_URL" -f migrations/0010_document_filtres.sql
+-- Sur une base en production, préférer CREATE INDEX CONCURRENTLY (hors transaction).
+
+CREATE INDEX IF NOT EXISTS document_editeur_id_idx ON document (editeur_id, id);
+CREATE INDEX IF NOT EXISTS document_titre_idx ON document (titre, id);
+CREATE INDEX IF NOT EXISTS document_annee_tri_idx ON document ((coalesce(annee_publication, 0)), id);
+CREATE INDEX IF NOT EXISTS document_auteur_auteur_id_idx ON document_auteur (auteur_id, document_id);
+CREATE INDEX IF NOT EXISTS emprunt_membre_id_idx ON emprunt (membre_id, date_emprunt);
+CREATE INDEX IF NOT EXISTS emprunt_exemplaire_id_idx ON emprunt (exemplaire_id, date_emprunt);
+
+ANALYZE document;
+ANALYZE document_auteur;
+ANALYZE emprunt;
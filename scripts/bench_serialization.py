@@ -0,0 +1,79 @@
+"""
+Coût par ligne de la sérialisation d'une page de documents.
+
+Compare, sur une liste de N objets (10 000 par défaut) imitant des lignes ORM :
+- « response_model » : le chemin précédent, `model_validate` par ligne dans le
+  service puis, dans FastAPI, `model_dump` -> re-validation par le TypeAdapter
+  du `response_model` -> `serialize(mode="json")` -> `json.dumps` ;
+- « direct » : validation unique (`TypeAdapter.validate_python`, from_attributes)
+  puis `dump_json` (app.core.json_response).
+
+Usage :
+    python -m scripts.bench_serialization --rows 10000 --repeat 5
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.core.json_response import PydanticJSONResponse, validate_list
+from app.schemas.document_schema import DocumentRead
+from app.schemas.pagination_schema import Page
+
+
+def _rows(n: int) -> list[SimpleNamespace]:
+    now = datetime.now()
+    return [
+        SimpleNamespace(
+            id=i, titre=f"Titre du document {i}", editeur_id=i % 50, annee_publication=1950 + i % 70,
+            categorie_id=i % 20, auteur_ids=None, resume="Résumé " * 20, date_modification=now,
+        )
+        for i in range(n)
+    ]
+
+
+def response_model_path(rows: list, adapter: TypeAdapter) -> bytes:
+    page = Page[DocumentRead](items=[DocumentRead.model_validate(row) for row in rows], next_cursor=None, limit=len(rows))
+    # Équivalent de fastapi.routing.serialize_response + JSONResponse.render
+    value = adapter.validate_python(page.model_dump())
+    return json.dumps(adapter.dump_python(value, mode="json"), ensure_ascii=False).encode()
+
+
+def direct_path(rows: list) -> bytes:
+    page = Page[DocumentRead](items=validate_list(DocumentRead, rows), next_cursor=None, limit=len(rows))
+    return PydanticJSONResponse(page).body
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare les chemins de sérialisation d'une page de documents.")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rows = _rows(args.rows)
+    adapter = TypeAdapter(Page[DocumentRead])
+    assert json.loads(response_model_path(rows, adapter)) == json.loads(direct_path(rows))
+
+    before = _best(lambda: response_model_path(rows, adapter), args.repeat)
+    after = _best(lambda: direct_path(rows), args.repeat)
+    print(f"{args.rows} lignes (meilleur de {args.repeat})")
+    print(f"  response_model : {before * 1000:8.1f} ms  ({before / args.rows * 1e6:6.2f} µs/ligne)")
+    print(f"  direct         : {after * 1000:8.1f} ms  ({after / args.rows * 1e6:6.2f} µs/ligne)")
+    print(f"  gain           : x{before / after:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+"""
+Fixtures communes : base PostgreSQL de test et comptage des instructions SQL.
+
+Les tests s'exécutent contre la base désignée par les variables POSTGRES_*
+(une base dédiée : le schéma y est créé par `Base.metadata.create_all`).
+Chaque test travaille dans une transaction annulée à la fin, les `commit()`
+des services devenant des SAVEPOINT : rien n'est conservé entre deux tests.
+Sans base joignable, les tests qui en dépendent sont ignorés.
+"""
+import datetime
+import os
+from contextlib import contextmanager
+
+# Valeurs par défaut avant l'import de l'application (Settings est instancié à l'import)
+for _name, _value in {
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "bibliotheque_test",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.database import Base, engine
+from app.models import document, emprunt, membre, statistique, utilisateur  # noqa: F401  (enregistre les tables)
+from app.models.document import Categorie, Editeur, Emplacement
+from app.models.membre import TypeMembre
+from app.models.utilisateur import UtilisateurSys
+
+
+@pytest.fixture(scope="session")
+def connection():
+    try:
+        conn = engine.connect()
+    except OperationalError as exc:
+        pytest.skip(f"Base PostgreSQL de test injoignable : {exc}")
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.create_all(conn)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def db(connection):
+    """ Session dans une transaction annulée à la fin du test. """
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+
+
+@pytest.fixture
+def count_statements():
+    """ Contexte qui collecte les instructions SQL envoyées au moteur (écouteur before_cursor_execute). """
+    @contextmanager
+    def counting():
+        statements: list[str] = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+    return counting
+
+
+@pytest.fixture
+def now():
+    return datetime.datetime.now().replace(microsecond=0)
+
+
+@pytest.fixture
+def reference_data(db, now):
+    """ Lignes de référence minimales : type de membre, utilisateur, catégorie, éditeur, emplacement. """
+    data = {
+        "type_membre": TypeMembre(libelle="Standard", max_emprunt=5, duree_emprunt=21, taux_penalite_jour=0.5, date_creation=now),
+        "utilisateur": UtilisateurSys(username="bibliothecaire", password="x", email="biblio@bibliotheque.fr", nom="Biblio", prenoms="Thécaire"),
+        "categorie": Categorie(libelle="Romans", date_creation=now),
+        "editeur": Editeur(libelle="Gallimard", date_creation=now),
+        "emplacement": Emplacement(code_rayon="A1", date_creation=now),
+    }
+    db.add_all(data.values())
+    db.flush()
+    return data
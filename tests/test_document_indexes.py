@@ -0,0 +1,83 @@
+"""
+Les requêtes fréquentes sont servies par des index (plans EXPLAIN).
+
+`enable_seqscan` est désactivé pour la transaction du test : sur une petite base
+le planificateur préfère légitimement un parcours séquentiel, mais il ne le
+choisit malgré ce réglage que si aucun index ne peut servir la requête. Un plan
+échoue s'il contient un Seq Scan sur une table surveillée, ou un tri explicite
+(Sort) là où l'ordre doit venir d'un index.
+"""
+import json
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.models.document import Document, DocumentAuteur
+from app.models.emprunt import Emprunt
+from app.repositories import document_repo, membre_repo
+
+WATCHED_TABLES = {"document", "document_auteur", "exemplaire", "emprunt", "reservation", "penalite"}
+PAGE = 50
+
+
+def _sample(db, column, default=1):
+    return db.scalar(select(column).where(column.is_not(None)).limit(1)) or default
+
+
+def _hot_queries(db) -> dict[str, tuple[Select, bool]]:
+    """ {nom: (requête, tri attendu depuis un index)} """
+    categorie_id = _sample(db, Document.categorie_id)
+    editeur_id = _sample(db, Document.editeur_id)
+    auteur_id = _sample(db, DocumentAuteur.auteur_id)
+    membre_id = _sample(db, Emprunt.membre_id)
+    titre = _sample(db, Document.titre, "M")
+    page_ids = list(db.scalars(select(Document.id).order_by(Document.id).limit(PAGE))) or [1]
+    return {
+        "documents par id": (document_repo.documents_page_stmt(PAGE, (page_ids[-1],)), True),
+        "documents par titre": (document_repo.documents_page_stmt(PAGE, (titre, 0), tri="titre"), True),
+        "documents par titre décroissant": (document_repo.documents_page_stmt(PAGE, (titre, 0), tri="-titre"), True),
+        "documents par année": (document_repo.documents_page_stmt(PAGE, (2000, 0), tri="annee_publication"), True),
+        "documents d'un éditeur": (document_repo.documents_page_stmt(PAGE, criteria=[Document.editeur_id == editeur_id]), False),
+        "documents d'une catégorie (IN)": (document_repo.documents_page_stmt(PAGE, criteria=[document_repo.in_categories({categorie_id})]), False),
+        "documents d'une catégorie (CTE)": (document_repo.documents_page_stmt(PAGE, criteria=[document_repo.in_categorie_subtree(categorie_id)]), False),
+        "documents d'un auteur": (document_repo.documents_page_stmt(PAGE, criteria=[document_repo.has_auteur(auteur_id)]), False),
+        "documents par période": (document_repo.documents_page_stmt(PAGE, criteria=[document_repo.published_between(1990, 2000)], tri="annee_publication"), False),
+        "disponibilité d'une page": (document_repo.availability_stmt(page_ids), False),
+        "compte adhérent : membre": (membre_repo.account_stmt(membre_id), False),
+        "compte adhérent : emprunts": (membre_repo.current_loans_stmt(membre_id), False),
+        "compte adhérent : réservations": (membre_repo.active_reservations_stmt(membre_id), False),
+        "historique d'un membre": (select(func.count()).where(Emprunt.membre_id == membre_id), False),
+    }
+
+
+def _walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+def _problems(plan: dict, ordered: bool) -> list[str]:
+    problems = []
+    for node in _walk(plan):
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in WATCHED_TABLES:
+            problems.append(f"Seq Scan sur {node['Relation Name']}")
+        if ordered and node["Node Type"] in ("Sort", "Incremental Sort"):
+            problems.append(f"{node['Node Type']} ({', '.join(node.get('Sort Key', []))})")
+    return problems
+
+
+def _plan(db, stmt: Select) -> dict:
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+
+def test_hot_queries_use_indexes(db):
+    queries = _hot_queries(db)
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    failures = {}
+    for name, (stmt, ordered) in queries.items():
+        problems = _problems(_plan(db, stmt), ordered)
+        if problems:
+            failures[name] = problems
+    assert failures == {}
@@ -0,0 +1,131 @@
+"""
+Circulation sous forte concurrence : aucun double prêt, aucun dépassement de quota.
+
+Les comptoirs concurrents ont chacun leur session (`SessionLocal`) et valident
+réellement leurs transactions : la fixture `db`, annulée à la fin du test, ne
+peut pas servir ici. Les lignes créées sont donc supprimées explicitement.
+"""
+import datetime
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import delete
+
+from app.core import statuts
+from app.core.database import SessionLocal
+from app.models.document import Categorie, Document, Editeur, Emplacement, Exemplaire
+from app.models.emprunt import Emprunt
+from app.models.membre import Membre, TypeMembre
+from app.models.utilisateur import UtilisateurSys
+from app.schemas.emprunt_schema import EmpruntCreate
+from app.services import emprunt_service
+
+THREADS = 16
+ROUNDS = 5
+MAX_EMPRUNT = 3
+
+
+@pytest.fixture
+def circulation(connection):
+    """ Membres et exemplaires disponibles validés en base, supprimés à la fin du test. """
+    suffix = uuid.uuid4().hex[:8]
+    now = datetime.datetime.now().replace(microsecond=0)
+    with SessionLocal() as db:
+        type_membre = TypeMembre(libelle=f"Stress {suffix}", max_emprunt=MAX_EMPRUNT, duree_emprunt=21, taux_penalite_jour=0.5, date_creation=now)
+        utilisateur = UtilisateurSys(username=f"stress-{suffix}", password="x", email=f"stress-{suffix}@bibliotheque.fr", nom="Stress", prenoms="Test")
+        categorie = Categorie(libelle=f"Stress {suffix}", date_creation=now)
+        editeur = Editeur(libelle=f"Stress {suffix}", date_creation=now)
+        emplacement = Emplacement(code_rayon=f"S-{suffix}", date_creation=now)
+        db.add_all([type_membre, utilisateur, categorie, editeur, emplacement])
+        db.flush()
+        document = Document(
+            titre=f"Stress {suffix}", categorie_id=categorie.id, editeur_id=editeur.id,
+            utilisateur_creation_id=utilisateur.id, date_modification=now,
+        )
+        membres = [
+            Membre(
+                nom=f"Nom{i}", prenoms=f"Prénom{i}", email=f"stress-{suffix}-{i}@bibliotheque.fr",
+                adresse="1 rue des Livres", telephone="0102030405", type_membre_id=type_membre.id,
+            )
+            for i in range(THREADS)
+        ]
+        db.add_all([document, *membres])
+        db.flush()
+        exemplaires = [
+            Exemplaire(
+                numero_inventaire=f"S-{suffix}-{i}", etat="Bon", statut=statuts.EXEMPLAIRE_DISPONIBLE,
+                date_mise_en_service=now.date(), date_creation=now, emplacement_id=emplacement.id,
+                document_id=document.id, utilisateur_ajout_id=utilisateur.id,
+            )
+            for i in range(MAX_EMPRUNT * 2)
+        ]
+        db.add_all(exemplaires)
+        db.commit()
+        seeded = {
+            "utilisateur_id": utilisateur.id,
+            "membre_ids": [m.id for m in membres],
+            "exemplaire_ids": [e.id for e in exemplaires],
+        }
+        # Ordre de suppression compatible avec les clés étrangères
+        rows = [
+            (Exemplaire, seeded["exemplaire_ids"]), (Membre, seeded["membre_ids"]), (Document, [document.id]),
+            (TypeMembre, [type_membre.id]), (Emplacement, [emplacement.id]), (Editeur, [editeur.id]),
+            (Categorie, [categorie.id]), (UtilisateurSys, [utilisateur.id]),
+        ]
+    try:
+        yield seeded
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(Emprunt).where(Emprunt.exemplaire_id.in_(seeded["exemplaire_ids"])))
+            for model, ids in rows:
+                db.execute(delete(model).where(model.id.in_(ids)))
+            db.commit()
+
+
+def _attempt(barrier: threading.Barrier, membre_id: int, exemplaire_id: int, utilisateur_id: int):
+    barrier.wait()
+    with SessionLocal() as db:
+        try:
+            return emprunt_service.checkout(db, EmpruntCreate(membre_id=membre_id, exemplaire_id=exemplaire_id), utilisateur_id)
+        except ValueError:
+            return None
+
+
+def _run_concurrently(attempts: list[tuple[int, int]], utilisateur_id: int) -> list:
+    barrier = threading.Barrier(len(attempts))
+    with ThreadPoolExecutor(max_workers=len(attempts)) as pool:
+        futures = [pool.submit(_attempt, barrier, m, e, utilisateur_id) for m, e in attempts]
+        return [r for r in (f.result() for f in futures) if r is not None]
+
+
+def _reset(exemplaire_ids: list[int]) -> None:
+    """ Supprime les emprunts du tour et remet les exemplaires en rayon. """
+    with SessionLocal() as db:
+        db.execute(delete(Emprunt).where(Emprunt.exemplaire_id.in_(exemplaire_ids)))
+        for exemplaire in db.query(Exemplaire).filter(Exemplaire.id.in_(exemplaire_ids)):
+            exemplaire.statut = statuts.EXEMPLAIRE_DISPONIBLE
+        db.commit()
+
+
+def test_same_copy_checked_out_once(circulation):
+    for round_no in range(ROUNDS):
+        exemplaire_id = circulation["exemplaire_ids"][round_no % len(circulation["exemplaire_ids"])]
+        attempts = [(membre_id, exemplaire_id) for membre_id in circulation["membre_ids"]]
+
+        succeeded = _run_concurrently(attempts, circulation["utilisateur_id"])
+
+        assert len(succeeded) == 1, f"tour {round_no} : exemplaire {exemplaire_id} prêté {len(succeeded)} fois"
+        _reset(circulation["exemplaire_ids"])
+
+
+def test_member_never_exceeds_max_emprunt(circulation):
+    for round_no in range(ROUNDS):
+        membre_id = circulation["membre_ids"][round_no % len(circulation["membre_ids"])]
+        attempts = [(membre_id, exemplaire_id) for exemplaire_id in circulation["exemplaire_ids"]]
+
+        succeeded = _run_concurrently(attempts, circulation["utilisateur_id"])
+
+        assert len(succeeded) == MAX_EMPRUNT, f"tour {round_no} : membre {membre_id} a {len(succeeded)} emprunts (max {MAX_EMPRUNT})"
+        _reset(circulation["exemplaire_ids"])
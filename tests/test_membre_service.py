@@ -0,0 +1,128 @@
+"""
+Nombre d'instructions SQL des lectures de membres : le type de membre est chargé
+par jointure, sans requête supplémentaire par membre (N+1), et le compte d'un
+adhérent tient en trois requêtes quel que soit le nombre d'emprunts ou de réservations.
+"""
+import datetime
+from decimal import Decimal
+
+from app.core import statuts
+from app.models.document import Document, Exemplaire
+from app.models.emprunt import Emprunt, Penalite, Reservation
+from app.models.membre import Membre
+from app.services import membre_service
+
+
+def _add_members(db, type_membre, count):
+    members = [
+        Membre(
+            nom=f"Nom{i}", prenoms=f"Prénom{i}", email=f"membre{i}@bibliotheque.fr",
+            adresse="1 rue des Livres", telephone="0102030405", type_membre_id=type_membre.id,
+        )
+        for i in range(count)
+    ]
+    db.add_all(members)
+    db.flush()
+    # Objets détachés de l'identity map : les lectures repartent de la base
+    db.expunge_all()
+    return members
+
+
+def test_get_members_single_statement(db, reference_data, count_statements):
+    _add_members(db, reference_data["type_membre"], 5)
+
+    with count_statements() as statements:
+        page = membre_service.get_members(db, limit=10)
+
+    assert len(page.items) == 5
+    assert all(item.type_membre_libelle == "Standard" for item in page.items)
+    assert len(statements) == 1, statements
+
+
+def test_get_member_single_statement(db, reference_data, count_statements):
+    membre_id = _add_members(db, reference_data["type_membre"], 1)[0].id
+
+    with count_statements() as statements:
+        member = membre_service.get_member(db, membre_id)
+
+    assert member.type_membre_libelle == "Standard"
+    assert len(statements) == 1, statements
+
+
+def test_get_member_account_three_statements(db, reference_data, now, count_statements):
+    membre, autre = _add_members(db, reference_data["type_membre"], 2)
+    utilisateur_id = reference_data["utilisateur"].id
+
+    documents = [
+        Document(
+            titre=f"Titre {i}", categorie_id=reference_data["categorie"].id, editeur_id=reference_data["editeur"].id,
+            utilisateur_creation_id=utilisateur_id, date_modification=now,
+        )
+        for i in range(5)
+    ]
+    db.add_all(documents)
+    db.flush()
+    exemplaires = [
+        Exemplaire(
+            numero_inventaire=f"INV-{i}", etat="Bon", statut=statuts.EXEMPLAIRE_EMPRUNTE,
+            date_mise_en_service=now.date(), date_creation=now, emplacement_id=reference_data["emplacement"].id,
+            document_id=document.id, utilisateur_ajout_id=utilisateur_id,
+        )
+        for i, document in enumerate(documents)
+    ]
+    db.add_all(exemplaires)
+    db.flush()
+
+    # Trois emprunts en cours (dont un en retard) et un emprunt rendu
+    emprunts = [
+        Emprunt(
+            membre_id=membre.id, exemplaire_id=exemplaire.id, utilisateur_emprunt_id=utilisateur_id,
+            date_emprunt=now - datetime.timedelta(days=30), date_creation=now,
+            date_retour_prevue=now + datetime.timedelta(days=7 - 10 * i),
+        )
+        for i, exemplaire in enumerate(exemplaires[:3])
+    ]
+    emprunts.append(Emprunt(
+        membre_id=membre.id, exemplaire_id=exemplaires[3].id, utilisateur_emprunt_id=utilisateur_id,
+        date_emprunt=now - datetime.timedelta(days=60), date_retour_prevue=now - datetime.timedelta(days=40),
+        date_retour_reelle=now - datetime.timedelta(days=35), date_creation=now,
+    ))
+    db.add_all(emprunts)
+    db.flush()
+
+    # Une réservation en 2e position derrière un autre membre, une mise de côté
+    db.add_all([
+        Reservation(
+            membre_id=autre.id, document_id=documents[3].id, statut=statuts.RESERVATION_EN_ATTENTE,
+            date_reservation=now - datetime.timedelta(days=2), date_modification_statut=now,
+        ),
+        Reservation(
+            membre_id=membre.id, document_id=documents[3].id, statut=statuts.RESERVATION_EN_ATTENTE,
+            date_reservation=now - datetime.timedelta(days=1), date_modification_statut=now,
+        ),
+        Reservation(
+            membre_id=membre.id, document_id=documents[4].id, statut=statuts.RESERVATION_MISE_DE_COTE,
+            date_reservation=now - datetime.timedelta(days=5), date_modification_statut=now,
+            date_disponibilite=now, date_expiration_mise_de_cote=now + datetime.timedelta(days=3),
+        ),
+    ])
+    db.add_all([
+        Penalite(
+            montant_du=Decimal(montant), montant_paye=Decimal("0.00"), date_creation=now, motif=statuts.PENALITE_MOTIF_RETARD,
+            statut=statuts.PENALITE_IMPAYEE, date_modification_statut=now, membre_id=membre.id,
+            utilisateur_creation_id=utilisateur_id, emprunt_id=emprunt.id,
+        )
+        for montant, emprunt in (("1.50", emprunts[2]), ("2.00", emprunts[3]))
+    ])
+    db.flush()
+    db.expunge_all()
+
+    with count_statements() as statements:
+        account = membre_service.get_member_account(db, membre.id)
+
+    assert len(statements) == 3, statements
+    assert len(account.emprunts) == 3
+    assert sum(emprunt.en_retard for emprunt in account.emprunts) == 2
+    assert account.penalites_dues == Decimal("3.50")
+    positions = {reservation.statut: reservation.position for reservation in account.reservations}
+    assert positions == {statuts.RESERVATION_EN_ATTENTE: 2, statuts.RESERVATION_MISE_DE_COTE: None}